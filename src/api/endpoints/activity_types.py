@@ -4,10 +4,10 @@ from flask import request
 from flask_restful import Resource
 
 from api.models import ActivityType
+from api.utils.activity_catalog import activity_type_catalog
 from api.utils.auth import roles_required, token_required
 from api.utils.helpers import find_item, response_builder
-from api.utils.marshmallow_schemas import (activity_types_schema,
-                                           new_activity_type_schema)
+from api.utils.marshmallow_schemas import new_activity_type_schema
 
 
 class ActivityTypesAPI(Resource):
@@ -53,22 +53,19 @@ class ActivityTypesAPI(Resource):
     def get(cls, act_types_id=None):
         """Get information on activity types."""
         search_term = request.args.get('q')
+        activity_types = activity_type_catalog.current()
         if not search_term:
             if not act_types_id:
-                activity_types = ActivityType.query.all()
+                validators = activity_types.validators
+                if validators.is_fresh():
+                    return validators.not_modified()
 
-                activity_types_list = activity_types_schema.dump(
-                    activity_types).data
+                return validators.apply(response_builder(
+                    dict(data=activity_types.listing), 200))
 
-                return response_builder(dict(data=activity_types_list), 200)
+            return find_item(activity_types.get(act_types_id))
 
-            activity_type = ActivityType.query.get(act_types_id)
-            return find_item(activity_type)
-
-        activity_type = ActivityType.query.filter(
-            ActivityType.name.ilike(f'%{search_term}%')
-        ).first()
-        return find_item(activity_type)
+        return find_item(activity_types.search(search_term))
 
     @classmethod
     @roles_required(["success ops"])
@@ -1,19 +1,37 @@
 """Module for Logged Activities in Andela."""
 
+from datetime import datetime
+
 from flask import g, request, current_app
 from flask_restful import Resource
-from sqlalchemy import func
-
-from api.models import LoggedActivity, User, db
+from sqlalchemy.orm import aliased
+
+from api.models import (Activity, ActivityType, LoggedActivity, Society, User,
+                        UserStats, db, generate_uuid, update_stats)
+from api.utils.approvals import (BACKGROUND_APPROVALS,
+                                 approve_in_background,
+                                 approve_logged_activities,
+                                 read_logged_activities_ids,
+                                 review_logged_activities)
 from api.utils.auth import token_required, roles_required
-from api.utils.helpers import (ParsedResult, parse_log_activity_fields,
-                               response_builder, paginate_items)
+from api.utils.conditional import Validators, logged_activity_rows
+from api.utils.counts import mark_written
+from api.utils.eager_loading import eager_loads
+from api.utils.fieldsets import requested_fields, schema_fieldset
+from api.utils.helpers import (PaginatedResult, ParsedResult,
+                               check_log_activity_fields,
+                               parse_log_activity_fields, response_builder,
+                               paginate_items, stream_csv, stream_ndjson,
+                               wants_ndjson)
 from api.utils.marshmallow_schemas import (
     log_edit_activity_schema, single_logged_activity_schema,
     logged_activities_schema, user_logged_activities_schema
 )
 from api.utils.notifications.email_notices import send_email
 
+# how many activities one bulk request may log
+MAX_BULK_LOGGED_ACTIVITIES = 500
+
 
 class UserLoggedActivitiesAPI(Resource):
     """User Logged Activities Resources."""
@@ -28,27 +46,49 @@ class UserLoggedActivitiesAPI(Resource):
             return response_builder(dict(message="User not found"), 404)
 
         message = "Logged activities fetched successfully"
-        user_logged_activities = user.logged_activities.all()
+        stats = UserStats.of(user_id)
+        activities_logged = sum(activities for activities, _ in stats.values())
+        points_earned = stats.get('approved', (0, 0))[1]
+
+        query = user.logged_activities.options(
+            *eager_loads(user_logged_activities_schema, LoggedActivity))
+        if request.args.get("paginate", "true").lower() == "false":
+            user_logged_activities = query.all()
+            data = {}
+        else:
+            pagination_result = paginate_items(query, serialize=False,
+                                               total=activities_logged)
+            if not isinstance(pagination_result, PaginatedResult):
+                return pagination_result
+
+            user_logged_activities = pagination_result.data
+            data = dict(count=pagination_result.count,
+                        page=pagination_result.page,
+                        pages=pagination_result.pages,
+                        previousUrl=pagination_result.previous_url,
+                        nextUrl=pagination_result.next_url)
+            if 'cursor' in request.args:
+                data['nextCursor'] = pagination_result.next_cursor
+
+        validators = Validators.of_rows(
+            user, user.society, *stats.items(),
+            *logged_activity_rows(user_logged_activities))
+        if validators.is_fresh():
+            return validators.not_modified()
 
         if not user_logged_activities:
             message = "There are no logged activities for that user."
 
-        points_earned = db.session.query(
-            func.sum(LoggedActivity.value)
-        ).filter(
-            LoggedActivity.user_id == user_id,
-            LoggedActivity.status == 'approved'
-        ).scalar()
-
-        return response_builder(dict(
+        data.update(
             data=user_logged_activities_schema.dump(
                 user_logged_activities).data,
             society=user.society.name if user.society else None,
             societyId=user.society.uuid if user.society else None,
-            activitiesLogged=len(user_logged_activities),
-            pointsEarned=points_earned if points_earned else 0,
+            activitiesLogged=activities_logged,
+            pointsEarned=points_earned,
             message=message
-        ), 200)
+        )
+        return validators.apply(response_builder(data, 200))
 
 
 class LoggedActivitiesAPI(Resource):
@@ -86,11 +126,11 @@ class LoggedActivitiesAPI(Resource):
                 activity=parsed_result.activity,
                 photo=result.get('photo'),
                 value=parsed_result.activity_value,
-                activity_type=parsed_result.activity_type,
+                activity_type_id=parsed_result.activity_type.uuid,
                 activity_date=parsed_result.activity_date
             )
 
-            if logged_activity.activity_type.name == 'Bootcamp Interviews':
+            if parsed_result.activity_type.name == 'Bootcamp Interviews':
                 if not result['no_of_participants']:
                     return response_builder(dict(
                                             message="Data for creation must be"
@@ -119,14 +159,31 @@ class LoggedActivitiesAPI(Resource):
         paginate = request.args.get("paginate", "true")
         message = "all Logged activities fetched successfully"
 
+        try:
+            options, schema = schema_fieldset(
+                logged_activities_schema, LoggedActivity, requested_fields())
+        except ValueError as error:
+            return response_builder(dict(status="fail",
+                                         message=str(error)), 400)
+        query = LoggedActivity.query.options(
+            *options, *eager_loads(schema, LoggedActivity))
+
+        if paginate.lower() == "false" and wants_ndjson():
+            return stream_ndjson(
+                query.order_by(LoggedActivity.created_at, LoggedActivity.uuid),
+                schema)
+
         if paginate.lower() == "false":
-            logged_activities = LoggedActivity.query.all()
+            logged_activities = query.all()
             count = LoggedActivity.query.count()
             data = {"count": count}
         else:
-            logged_activities = LoggedActivity.query
+            logged_activities = query
             pagination_result = paginate_items(logged_activities,
                                                serialize=False)
+            if not isinstance(pagination_result, PaginatedResult):
+                return pagination_result
+
             logged_activities = pagination_result.data
             data = {
                 "count": pagination_result.count,
@@ -135,16 +192,170 @@ class LoggedActivitiesAPI(Resource):
                 "previous_url": pagination_result.previous_url,
                 "next_url": pagination_result.next_url
             }
+            if 'cursor' in request.args:
+                data["nextCursor"] = pagination_result.next_cursor
 
         data.update(dict(
-            loggedActivities=logged_activities_schema.dump(
-                logged_activities
-            ).data))
+            loggedActivities=schema.dump(logged_activities).data))
 
         return response_builder(dict(data=data, message=message,
                                      status="success"), 200)
 
 
+class LoggedActivitiesBulkAPI(Resource):
+    """Log many activities in one request."""
+
+    decorators = [token_required]
+
+    @classmethod
+    def post(cls):
+        """Log a list of activities at once.
+
+        Every activity is validated like one logged on its own, against
+        activities loaded once for the whole list and the activity type
+        catalog. Nothing is logged unless all of them are valid, and the
+        errors are returned per item; otherwise they are inserted with a
+        single multi-row INSERT.
+        """
+        payload = request.get_json(silent=True)
+        items = payload.get('loggedActivities') \
+            if isinstance(payload, dict) else None
+
+        if not isinstance(items, list) or not items:
+            return response_builder(dict(
+                message='A List/Array with at least one activity to log'
+                        ' is needed!'), 400)
+
+        if len(items) > MAX_BULK_LOGGED_ACTIVITIES:
+            return response_builder(dict(
+                message='Sorry, you can not log more than'
+                        f' {MAX_BULK_LOGGED_ACTIVITIES} activities at a go'
+            ), 403)
+
+        society = g.current_user.society
+        if not society:
+            return response_builder(dict(
+                message='You are not a member of any society yet'
+            ), 422)
+
+        loaded = [log_edit_activity_schema.load(item) for item in items]
+        activity_ids = {result.get('activity_id') for result, _ in loaded
+                        if isinstance(result, dict)}
+        activity_ids.discard(None)
+        activities = {activity.uuid: activity for activity in
+                      Activity.query.filter(Activity.uuid.in_(activity_ids))
+                      } if activity_ids else {}
+
+        now = datetime.utcnow()
+        rows = []
+        errors = []
+        for index, (result, validation_errors) in enumerate(loaded):
+            if validation_errors:
+                errors.append(dict(index=index,
+                                   validationErrors=validation_errors))
+                continue
+
+            parsed_result, error = check_log_activity_fields(result,
+                                                             activities)
+            if error:
+                errors.append(dict(index=index, **error[0]))
+                continue
+
+            activity_type = parsed_result.activity_type
+            no_of_participants = None
+            if activity_type.name == 'Bootcamp Interviews':
+                if not result.get('no_of_participants'):
+                    errors.append(dict(
+                        index=index,
+                        message="Data for creation must be provided."
+                                " (no_of_participants)"))
+                    continue
+                no_of_participants = result['no_of_participants']
+
+            rows.append(dict(
+                uuid=generate_uuid(),
+                name=result.get('name'),
+                description=result.get('description'),
+                photo=result.get('photo'),
+                created_at=now,
+                status='in review',
+                redeemed=False,
+                value=parsed_result.activity_value,
+                activity_date=parsed_result.activity_date,
+                no_of_participants=no_of_participants,
+                activity_type_id=activity_type.uuid,
+                activity_id=parsed_result.activity.uuid
+                if parsed_result.activity else None,
+                user_id=g.current_user.uuid,
+                society_id=society.uuid
+            ))
+
+        if errors:
+            return response_builder(dict(
+                message='No activities were logged, please correct the'
+                        ' errors and try again',
+                errors=errors
+            ), 400)
+
+        db.session.execute(LoggedActivity.__table__.insert().values(rows))
+        update_stats(db.session.connection(), [(None, row) for row in rows])
+        mark_written(LoggedActivity.__tablename__)
+        db.session.commit()
+
+        position = {row['uuid']: index for index, row in enumerate(rows)}
+        logged_activities = LoggedActivity.query.filter(
+            LoggedActivity.uuid.in_(list(position))
+        ).options(
+            *eager_loads(single_logged_activity_schema, LoggedActivity)
+        ).all()
+        logged_activities.sort(key=lambda logged_activity:
+                               position[logged_activity.uuid])
+
+        return response_builder(dict(
+            data=single_logged_activity_schema.dump(
+                logged_activities, many=True).data,
+            message=f'{len(rows)} activities logged successfully'
+        ), 201)
+
+
+class LoggedActivitiesExportAPI(Resource):
+    """Export all logged activities as CSV."""
+
+    decorators = [token_required]
+
+    header = ['id', 'name', 'description', 'owner', 'society', 'category',
+              'activity', 'points', 'status', 'redeemed', 'activityDate',
+              'createdAt', 'approvedBy', 'reviewedBy']
+
+    @classmethod
+    def get(cls):
+        """Stream every logged activity with its related names."""
+        approver = aliased(User)
+        reviewer = aliased(User)
+        rows = db.session.query(
+            LoggedActivity.uuid, LoggedActivity.name,
+            LoggedActivity.description, User.name, Society.name,
+            ActivityType.name, Activity.name, LoggedActivity.value,
+            LoggedActivity.status, LoggedActivity.redeemed,
+            LoggedActivity.activity_date, LoggedActivity.created_at,
+            approver.name, reviewer.name
+        ).join(
+            User, LoggedActivity.user_id == User.uuid
+        ).join(
+            Society, LoggedActivity.society_id == Society.uuid
+        ).join(
+            ActivityType, LoggedActivity.activity_type_id == ActivityType.uuid
+        ).outerjoin(
+            Activity, LoggedActivity.activity_id == Activity.uuid
+        ).outerjoin(
+            approver, LoggedActivity.approver_id == approver.uuid
+        ).outerjoin(
+            reviewer, LoggedActivity.reviewer_id == reviewer.uuid
+        ).order_by(LoggedActivity.created_at, LoggedActivity.uuid)
+
+        return stream_csv(rows, cls.header, 'logged-activities.csv')
+
+
 class LoggedActivityAPI(Resource):
     """Single Logged Activity Resources."""
 
@@ -189,7 +400,7 @@ class LoggedActivityAPI(Resource):
             logged_activity.activity = parsed_result.activity
             logged_activity.photo = result.get('photo')
             logged_activity.value = parsed_result.activity_value
-            logged_activity.activity_type = parsed_result.activity_type
+            logged_activity.activity_type_id = parsed_result.activity_type.uuid
             logged_activity.activity_date = parsed_result.activity_date
 
             logged_activity.save()
@@ -231,7 +442,7 @@ class SecretaryReviewLoggedActivityAPI(Resource):
 
     @classmethod
     @roles_required(['society secretary'])
-    def put(cls, logged_activity_id):
+    def put(cls, logged_activity_id=None):
         """Put method on logged Activity resource."""
         payload = request.get_json(silent=True)
 
@@ -239,6 +450,9 @@ class SecretaryReviewLoggedActivityAPI(Resource):
             return response_builder(dict(message='status is required.'),
                                     400)
 
+        if logged_activity_id is None:
+            return cls.review_many(payload)
+
         logged_activity = LoggedActivity.query.filter_by(
             uuid=logged_activity_id).first()
         if not logged_activity:
@@ -248,14 +462,47 @@ class SecretaryReviewLoggedActivityAPI(Resource):
         if not (payload.get('status') in ['pending', 'rejected']):
             return response_builder(dict(message='Invalid status value.'),
                                     400)
-        logged_activity.status = payload.get('status')
-        logged_activity.save()
+
+        reviewed, _ = review_logged_activities(
+            [logged_activity.uuid], 'in review', status=payload['status'],
+            reviewer_id=g.current_user.uuid)
+        if not reviewed:
+            return response_builder(dict(
+                status='failed',
+                message='Logged activity is not in review'), 409)
+        db.session.commit()
 
         return response_builder(
             dict(data=single_logged_activity_schema.dump(logged_activity).data,
                  message="successfully changed status"),
             200)
 
+    @staticmethod
+    def review_many(payload):
+        """Move a list of logged activities in review at once."""
+        if not (payload.get('status') in ['pending', 'rejected']):
+            return response_builder(dict(message='Invalid status value.'),
+                                    400)
+
+        ids, error = read_logged_activities_ids(payload, 'review')
+        if error:
+            return response_builder(*error)
+
+        reviewed, results = review_logged_activities(
+            ids, 'in review', status=payload['status'],
+            reviewer_id=g.current_user.uuid)
+        if not reviewed:
+            return response_builder(dict(
+                status='failed', data=results,
+                message='No logged activities in review in request'), 400)
+        db.session.commit()
+
+        return response_builder(dict(
+            data=results,
+            message=f'successfully changed the status of {reviewed}'
+                    ' logged activities'),
+            200)
+
 
 class LoggedActivityApprovalAPI(Resource):
     """Allows success-ops to approve at least one Logged Activities."""
@@ -270,63 +517,51 @@ class LoggedActivityApprovalAPI(Resource):
         payload = request.get_json(silent=True)
 
         if payload:
-            logged_activities_ids = payload.get('loggedActivitiesIds', None)
-
-            if logged_activities_ids is None:
-                return response_builder(dict(
-                    message='loggedActivitiesIds is required'), 400)
+            ids, error = read_logged_activities_ids(payload, 'approve')
+            if error:
+                return response_builder(*error)
 
-            if len(logged_activities_ids) > 20:
+            if len(ids) > BACKGROUND_APPROVALS:
+                approve_in_background.delay(ids)
                 return response_builder(dict(
-                    message='Sorry, you can not approve more than 20'
-                            ' logged_activities at a go'), 403)
-
-            if not isinstance(logged_activities_ids, list) or \
-                    not logged_activities_ids:
-                return response_builder(dict(
-                    message='A List/Array with at least one logged activity'
-                            ' id is needed!'), 400)
-
-            unique_activities_ids = set([])
-            for logged_activities_id in logged_activities_ids:
-                logged_activities = LoggedActivity.query.get(
-                    logged_activities_id
-                )
-                if logged_activities is None or logged_activities.redeemed \
-                    or logged_activities.status in ['rejected', 'in review',
-                                                    'approved']:
-                    continue
-                unique_activities_ids.add(logged_activities)
-
-            if not unique_activities_ids:
+                    message=f'{len(ids)} logged activities will be approved'
+                            ' in the background'),
+                    202)
+
+            # a single statement approves whichever activities are still
+            # pending, so a concurrent request can not approve the same
+            # activity and award its points twice
+            approved = approve_logged_activities(ids) if ids else []
+            if not approved:
                 return response_builder(dict(
                     status='failed',
                     message='Invalid logged activities or no pending logged'
                             ' activities in request'),
                     400)
-            else:
-                for unique_activities_id in list(unique_activities_ids):
-                    unique_activities_id.status = 'approved'
-                    unique_activities_id.society.total_points = \
-                        unique_activities_id
-
-                user_logged_activities = logged_activities_schema.dump(
-                    unique_activities_ids).data
-
-                # NOTE: this code works as expected, shipping it out for the
-                # MVP further optimization will be done from line 319 - 325
-                # using marshmallow
-                for user_logged_activity in user_logged_activities:
-                    user_logged_activity['society'] = {
-                        'id': user_logged_activity['societyId'],
-                        'name': user_logged_activity['society']
-                    }
-                    del user_logged_activity['society']['id']
-                    del user_logged_activity['societyId']
-                return response_builder(dict(
-                    data=user_logged_activities,
-                    message='Activity edited successfully'),
-                    200)
+            db.session.commit()
+
+            approved_activities = LoggedActivity.query.filter(
+                LoggedActivity.uuid.in_([row.uuid for row in approved])
+            ).options(
+                *eager_loads(logged_activities_schema, LoggedActivity)
+            ).order_by(LoggedActivity.uuid).all()
+            user_logged_activities = logged_activities_schema.dump(
+                approved_activities).data
+
+            # NOTE: this code works as expected, shipping it out for the
+            # MVP further optimization will be done from line 319 - 325
+            # using marshmallow
+            for user_logged_activity in user_logged_activities:
+                user_logged_activity['society'] = {
+                    'id': user_logged_activity['societyId'],
+                    'name': user_logged_activity['society']
+                }
+                del user_logged_activity['society']['id']
+                del user_logged_activity['societyId']
+            return response_builder(dict(
+                data=user_logged_activities,
+                message='Activity edited successfully'),
+                200)
         else:
             return response_builder(dict(
                 message='Data for creation must be provided.'),
@@ -343,8 +578,7 @@ class LoggedActivityRejectionAPI(Resource):
     def put(cls, logged_activity_id=None):
         """Put method for rejecting logged activity resource."""
         if logged_activity_id is None:
-            return response_builder(dict(
-                message='loggedActivitiesIds is required'), 400)
+            return cls.reject_many(request.get_json(silent=True) or {})
 
         logged_activity = LoggedActivity.query.filter_by(
             uuid=logged_activity_id).first()
@@ -374,6 +608,27 @@ class LoggedActivityRejectionAPI(Resource):
                 message='This logged activity is either in-review,'
                 ' approved or already rejected'), 403)
 
+    @staticmethod
+    def reject_many(payload):
+        """Reject a list of pending logged activities at once."""
+        ids, error = read_logged_activities_ids(payload, 'reject')
+        if error:
+            return response_builder(*error)
+
+        rejected, results = review_logged_activities(ids, 'pending',
+                                                     status='rejected')
+        if not rejected:
+            return response_builder(dict(
+                status='failed', data=results,
+                message='Invalid logged activities or no pending logged'
+                        ' activities in request'), 400)
+        db.session.commit()
+
+        return response_builder(dict(
+            data=results,
+            message=f'{rejected} logged activities successfully rejected'),
+            200)
+
 
 class LoggedActivityInfoAPI(Resource):
     """Allows success-ops to request more info on a Logged Activity."""
@@ -6,14 +6,54 @@ from flask_restplus import Resource
 from api.utils.notifications.email_notices import send_email
 from api.utils.auth import token_required, roles_required
 from api.utils.helpers import (
-    find_item, paginate_items, response_builder, get_redemption_request
+    find_item, paginate_items, response_builder, get_redemption_request,
+    stream_csv
 )
 from api.utils.helpers import serialize_redmp
 from api.utils.marshmallow_schemas import (
     redemption_request_schema, edit_redemption_request_schema
 )
 from api.utils.marshmallow_schemas import basic_info_schema, redemption_schema
-from ..models import Society, RedemptionRequest, Center
+from ..models import Society, RedemptionRequest, Center, User, db
+
+
+def filter_redemption_requests(query):
+    """Apply the society, status, name or center filter of a request.
+
+    Return:
+        tuple: the filtered query and None, or None and an error response
+    """
+    search_term_name = request.args.get('society')
+    if search_term_name:
+        society = Society.query.filter_by(
+            name=search_term_name).first()
+        if not society:
+            mes = f"Society with name:{search_term_name} not found"
+            return None, ({"message": mes}, 400)
+        return query.filter(
+            RedemptionRequest.society_id == society.uuid), None
+
+    search_term_status = request.args.get('status')
+    if search_term_status:
+        return query.filter(
+            RedemptionRequest.status == search_term_status), None
+
+    search_term_name = request.args.get('name')
+    if search_term_name:
+        return query.filter(
+            RedemptionRequest.name == search_term_name), None
+
+    search_term_center = request.args.get("center")
+    if search_term_center:
+        center_query = Center.query.filter_by(
+            name=search_term_center).first()
+        if not center_query:
+            mes = f"country with name:{search_term_center} not found"
+            return None, ({"message": mes}, 400)
+        return query.filter(
+            RedemptionRequest.center_id == center_query.uuid), None
+
+    return query, None
 
 
 class PointRedemptionAPI(Resource):
@@ -139,43 +179,11 @@ class PointRedemptionAPI(Resource):
         if redeem_id:
             redemp_request = RedemptionRequest.query.get(redeem_id)
             return find_item(redemp_request)
-        else:
-            search_term_name = request.args.get('society')
-            if search_term_name:
-                society = Society.query.filter_by(
-                    name=search_term_name).first()
-                if not society:
-                    mes = f"Society with name:{search_term_name} not found"
-                    return {"message": mes}, 400
-                redemp_request = RedemptionRequest.query.filter_by(
-                    society_id=society.uuid)
-                return paginate_items(redemp_request)
-
-            search_term_status = request.args.get('status')
-            if search_term_status:
-                redemp_request = RedemptionRequest.query.filter_by(
-                    status=search_term_status)
-                return paginate_items(redemp_request)
-
-            search_term_name = request.args.get('name')
-            if search_term_name:
-                redemp_request = RedemptionRequest.query.filter_by(
-                    name=search_term_name)
-                return paginate_items(redemp_request)
-
-            search_term_center = request.args.get("center")
-            if search_term_center:
-                center_query = Center.query.filter_by(
-                    name=search_term_center).first()
-                if not center_query:
-                    mes = f"country with name:{search_term_center} not found"
-                    return {"message": mes}, 400
-
-                redemp_request = RedemptionRequest.query.filter_by(
-                    center=center_query)
-                return paginate_items(redemp_request)
-
-        redemption_requests = RedemptionRequest.query
+
+        redemption_requests, error = filter_redemption_requests(
+            RedemptionRequest.query)
+        if error:
+            return error
         return paginate_items(redemption_requests)
 
     @classmethod
@@ -198,6 +206,37 @@ class PointRedemptionAPI(Resource):
             message="RedemptionRequest deleted successfully."), 200)
 
 
+class RedemptionRequestExportAPI(Resource):
+    """Export redemption requests as CSV."""
+
+    header = ['id', 'reason', 'points', 'status', 'society', 'center',
+              'requestedBy', 'createdAt', 'comment', 'rejection']
+
+    @classmethod
+    @token_required
+    @roles_required(["finance", "cio", "society president", "vice president",
+                     "secretary, success ops"])
+    def get(cls):
+        """Stream the redemption requests matching the list filters."""
+        rows = db.session.query(
+            RedemptionRequest.uuid, RedemptionRequest.name,
+            RedemptionRequest.value, RedemptionRequest.status, Society.name,
+            Center.name, User.name, RedemptionRequest.created_at,
+            RedemptionRequest.comment, RedemptionRequest.rejection
+        ).join(
+            Society, RedemptionRequest.society_id == Society.uuid
+        ).join(
+            Center, RedemptionRequest.center_id == Center.uuid
+        ).join(
+            User, RedemptionRequest.user_id == User.uuid
+        ).order_by(RedemptionRequest.created_at, RedemptionRequest.uuid)
+
+        rows, error = filter_redemption_requests(rows)
+        if error:
+            return error
+        return stream_csv(rows, cls.header, 'redemption-requests.csv')
+
+
 class RedemptionRequestNumeration(Resource):
     """
     Approve or reject Redemption Requests.
@@ -243,9 +282,20 @@ class RedemptionRequestNumeration(Resource):
 
         if status == "approved":
             user = redemp_request.user
+            # only the request that moves a pending redemption to approved
+            # uses up the society's points
+            approved = RedemptionRequest.query.filter(
+                RedemptionRequest.uuid == redemp_request.uuid,
+                RedemptionRequest.status == 'pending'
+            ).update({'status': status}, synchronize_session='evaluate')
+            if not approved:
+                return response_builder(dict(
+                    status="fail",
+                    message="Only pending redemption requests can be"
+                            " approved."
+                ), 409)
             society = Society.query.get(user.society_id)
             society.used_points = redemp_request
-            redemp_request.status = status
 
             # Get the relevant Finance Center to respond on RedemptionRequest
             if str(redemp_request.center.name.lower()) == 'kampala':
@@ -1,15 +1,23 @@
 """Society Module."""
+from collections import defaultdict
 
-from flask import request
+from flask import request, url_for
 from flask_restful import Resource
 
+from api.utils.activity_catalog import CATALOG, activity_type_catalog
 from api.utils.auth import roles_required, token_required
-from api.utils.helpers import paginate_items, response_builder
+from api.utils.conditional import Validators, logged_activity_rows
+from api.utils.eager_loading import eager_loads
+from api.utils.helpers import (PaginatedResult, paginate_items,
+                               response_builder)
 from api.utils.marshmallow_schemas import (base_schema, cohort_schema,
                                            society_schema,
                                            user_logged_activities_schema)
 
-from ..models import Cohort, LoggedActivity, Society
+from ..models import Cohort, LoggedActivity, Society, SocietyStats
+
+# how many of its latest logged activities a society's details show
+RECENT_ACTIVITIES = 10
 
 
 class SocietyResource(Resource):
@@ -64,17 +72,50 @@ class SocietyResource(Resource):
             return paginate_items(societies)
 
         if society:
-            society_logged_activities = LoggedActivity.query.filter_by(
-                society_id=society.uuid).all()
+            stats = SocietyStats.of(society.uuid)
+            recent_activities = LoggedActivity.query.filter_by(
+                society_id=society.uuid
+            ).order_by(
+                LoggedActivity.created_at.desc(), LoggedActivity.uuid.desc()
+            ).limit(RECENT_ACTIVITIES).options(
+                *eager_loads(user_logged_activities_schema, LoggedActivity)
+            ).all()
+            activity_types = activity_type_catalog.current()
+
+            validators = Validators.of_rows(
+                society, (CATALOG, activity_types.validators.etag), *stats,
+                *logged_activity_rows(recent_activities))
+            if validators.is_fresh():
+                return validators.not_modified()
+
+            activities_by_status = defaultdict(int)
+            points_by_type = []
+            for status, activity_type_id, activities, points in stats:
+                activities_by_status[status] += activities
+                if status == 'approved' and points:
+                    activity_type = activity_types.get(activity_type_id)
+                    points_by_type.append(dict(
+                        activityTypeId=activity_type_id,
+                        name=activity_type.name if activity_type else None,
+                        points=points))
 
             data, _ = society_schema.dump(society)
-            data['loggedActivities'], _ = user_logged_activities_schema.dump(
-                society_logged_activities)
-
-            return response_builder(dict(
+            data['activitiesByStatus'] = {
+                status: activities
+                for status, activities in activities_by_status.items()
+                if activities}
+            data['pointsByActivityType'] = sorted(
+                points_by_type, key=lambda item: item['activityTypeId'])
+            data['recentActivities'], _ = user_logged_activities_schema.dump(
+                recent_activities)
+            data['loggedActivitiesUrl'] = url_for(
+                'society_logged_activities', society_id=society.uuid,
+                _external=True)
+
+            return validators.apply(response_builder(dict(
                 societyDetails=data,
                 message="{} fetched successfully.".format(society.name)
-            ), 200)
+            ), 200))
         else:
             return response_builder(dict(
                 data=None,
@@ -151,6 +192,58 @@ class SocietyResource(Resource):
                 message="Society deleted successfully."), 200)
 
 
+class SocietyLoggedActivitiesAPI(Resource):
+    """A society's logged activities, a page at a time."""
+
+    decorators = [token_required]
+
+    @classmethod
+    def get(cls, society_id):
+        """Get a page of a society's logged activities, latest first.
+
+        Pages are numbered, or follow each other by `cursor`; the total
+        comes from the society's stats instead of a count.
+        """
+        society = Society.query.get(society_id)
+        if not society:
+            return response_builder(dict(
+                data=None,
+                message="Resource does not exist."
+            ), 404)
+
+        stats = SocietyStats.of(society_id)
+        pagination_result = paginate_items(
+            LoggedActivity.query.filter_by(society_id=society_id).order_by(
+                LoggedActivity.created_at.desc(), LoggedActivity.uuid.desc()
+            ).options(
+                *eager_loads(user_logged_activities_schema, LoggedActivity)),
+            serialize=False,
+            total=sum(activities for _, _, activities, _ in stats))
+        if not isinstance(pagination_result, PaginatedResult):
+            return pagination_result
+
+        validators = Validators.of_rows(
+            society, *stats, *logged_activity_rows(pagination_result.data))
+        if validators.is_fresh():
+            return validators.not_modified()
+
+        data = dict(count=pagination_result.count,
+                    page=pagination_result.page,
+                    pages=pagination_result.pages,
+                    previousUrl=pagination_result.previous_url,
+                    nextUrl=pagination_result.next_url)
+        if 'cursor' in request.args:
+            data['nextCursor'] = pagination_result.next_cursor
+        data.update(
+            data=user_logged_activities_schema.dump(
+                pagination_result.data).data,
+            message="{} logged activities fetched successfully.".format(
+                society.name) if pagination_result.data else
+            "There are no logged activities for that society."
+        )
+        return validators.apply(response_builder(data, 200))
+
+
 class AddCohort(Resource):
     """Resource for adding cohorts to societies."""
 
@@ -43,13 +43,14 @@ class UserAPI(Resource):
                 'roles': []
             }
 
-            data['id'] = user_info.json().get('id')
-            data['email'] = user_info.json().get('email')
-            data['name'] = (f"{user_info.json().get('first_name')} "
-                            f"{user_info.json().get('last_name')}")
-            data['photo'] = user_info.json().get('picture')
-            data['centerId'] = user_info.json().get('location').get('id')
-            data['cohortId'] = user_info.json().get('cohort').get('id')
+            api_user = user_info.json()
+            data['id'] = api_user.get('id')
+            data['email'] = api_user.get('email')
+            data['name'] = (f"{api_user.get('first_name')} "
+                            f"{api_user.get('last_name')}")
+            data['photo'] = api_user.get('picture')
+            data['centerId'] = api_user.get('location').get('id')
+            data['cohortId'] = api_user.get('cohort').get('id')
             user_information = data
             status_code = user_info.status_code
 
@@ -1,8 +1,13 @@
 """Contain All App Models."""
 import uuid
-from datetime import datetime
-
-from flask_sqlalchemy import SQLAlchemy
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+
+from flask_sqlalchemy import SignallingSession, SQLAlchemy
+from sqlalchemy import and_, event, func, inspect, select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 
 db = SQLAlchemy()
@@ -20,6 +25,35 @@ def camel_case(snake_str):
     return title_str[0].lower() + title_str[1:]
 
 
+@lru_cache(maxsize=256)
+def build_serializer(model, only=None):
+    """Build, once, the serialize function of a model class.
+
+    Column names are camel cased once per model instead of on every call,
+    and a row's values are read with a single attrgetter. Integers (and
+    booleans) are kept as they are, everything else is stringified. When
+    `only` is given, only the columns with those camel cased names are
+    read, so deferred columns stay unloaded. `only` comes from the client,
+    so the number of functions kept is bounded.
+    """
+    names = tuple(column.name for column in model.__table__.columns
+                  if only is None or camel_case(column.name) in only)
+    keys = tuple(camel_case(name) for name in names)
+    get_values = attrgetter(*names)
+    if len(names) == 1:
+        get_single_value = get_values
+
+        def get_values(instance):
+            return (get_single_value(instance),)
+
+    def serialize(instance):
+        return {
+            key: value if isinstance(value, int) else str(value)
+            for key, value in zip(keys, get_values(instance))
+        }
+    return serialize
+
+
 # many to many relationship between users and activities
 user_activity = db.Table('user_activity',
                          db.Column('user_uuid', db.String,
@@ -27,14 +61,21 @@ user_activity = db.Table('user_activity',
                                    ),
                          db.Column('activity_uuid', db.String,
                                    db.ForeignKey('activities.uuid'),
-                                   nullable=False))
+                                   nullable=False),
+                         db.Index('ix_user_activity_user_uuid_activity_uuid',
+                                  'user_uuid', 'activity_uuid'),
+                         db.Index('ix_user_activity_activity_uuid',
+                                  'activity_uuid'))
 user_role = db.Table('user_role',
                      db.Column('user_uuid', db.String,
                                db.ForeignKey('users.uuid'), nullable=False
                                ),
                      db.Column('role_uuid', db.String,
                                db.ForeignKey('roles.uuid'),
-                               nullable=False))
+                               nullable=False),
+                     db.Index('ix_user_role_user_uuid_role_uuid',
+                              'user_uuid', 'role_uuid'),
+                     db.Index('ix_user_role_role_uuid', 'role_uuid'))
 
 
 class Base(db.Model):
@@ -86,19 +127,16 @@ class Base(db.Model):
             db.session.rollback()
         return deleted
 
-    def serialize(self):
+    def serialize(self, only=None):
         """Map model to a dictionary representation.
 
+        Args:
+            only (frozenset): camel cased keys to keep, defaults to all
+
         Return:
             A dict object
         """
-        dictionary_mapping = {
-            camel_case(attribute.name): str(getattr(self, attribute.name))
-            if not isinstance(getattr(self, attribute.name), int)
-            else getattr(self, attribute.name)
-            for attribute in self.__table__.columns
-        }
-        return dictionary_mapping
+        return build_serializer(type(self), only)(self)
 
 
 class Center(Base):
@@ -123,6 +161,9 @@ class Cohort(Base):
     """Models cohorts available in Andela."""
 
     __tablename__ = 'cohorts'
+    __table_args__ = (
+        db.Index('ix_cohorts_society_id', 'society_id'),
+    )
     center_id = db.Column(db.String, db.ForeignKey('centers.uuid'),
                           nullable=False)
     society_id = db.Column(db.String, db.ForeignKey('societies.uuid'))
@@ -156,12 +197,17 @@ class User(Base):
         'RedemptionRequest', backref='user', lazy='dynamic',
         order_by='desc(RedemptionRequest.created_at)'
     )
+    # read-only, non dynamic view of `roles` that can be eager loaded
+    role_set = db.relationship('Role', secondary='user_role', viewonly=True)
 
 
 class Role(Base):
     """Models Roles to which all Andelans have."""
 
     __tablename__ = 'roles'
+    __table_args__ = (
+        db.Index('ix_roles_name', 'name'),
+    )
     users = db.relationship('User', secondary='user_role', lazy='dynamic',
                             backref=db.backref('roles', lazy='dynamic'))
 
@@ -182,6 +228,8 @@ class Society(Base):
     cohorts = db.relationship('Cohort', backref='society', lazy='dynamic')
     redemptions = db.relationship('RedemptionRequest', backref='society',
                                   lazy='dynamic')
+    ledger = db.relationship('LedgerEntry', backref='society',
+                             lazy='dynamic')
 
     @property
     def total_points(self):
@@ -190,7 +238,8 @@ class Society(Base):
 
     @total_points.setter
     def total_points(self, point):
-        self._total_points += point.value
+        self.record(LedgerEntry(kind='approval', source_id=point.uuid,
+                                total_points=point.value))
 
     @property
     def used_points(self):
@@ -199,7 +248,62 @@ class Society(Base):
 
     @used_points.setter
     def used_points(self, redemption_request):
-        self._used_points += redemption_request.value
+        self.record(LedgerEntry(kind='redemption',
+                                source_id=redemption_request.uuid,
+                                used_points=redemption_request.value))
+
+    def record(self, entry):
+        """Add a points ledger entry and apply it to the society's points.
+
+        Saved societies are updated with `SET column = column + value` so
+        concurrent requests can not overwrite each other's changes. The
+        row stays locked until the transaction ends and the points are
+        reloaded the next time they are read.
+        """
+        if inspect(self).persistent:
+            entry.society_id = self.uuid
+            Society.add_points([entry])
+            db.session.expire(self, ['_total_points', '_used_points'])
+        else:
+            entry.society = self
+            self._total_points = \
+                (self._total_points or 0) + (entry.total_points or 0)
+            self._used_points = \
+                (self._used_points or 0) + (entry.used_points or 0)
+
+    @classmethod
+    def add_points(cls, entries):
+        """Atomically apply many ledger entries to saved societies.
+
+        Args:
+            entries (list): LedgerEntry objects with a society_id
+
+        Rows are updated in uuid order, so concurrent transactions lock
+        societies in the same order and can not deadlock on each other.
+        """
+        cls.apply_points(entries)
+        db.session.add_all(entries)
+
+    @classmethod
+    def apply_points(cls, entries):
+        """Apply ledger entries to the points of their societies.
+
+        The entries are added up per society, so each society is updated
+        once whatever the number of entries. Saving the entries is left
+        to the caller.
+        """
+        changes = defaultdict(lambda: [0, 0])
+        for entry in entries:
+            change = changes[entry.society_id]
+            change[0] += entry.total_points or 0
+            change[1] += entry.used_points or 0
+
+        for society_id in sorted(changes):
+            total_points, used_points = changes[society_id]
+            cls.query.filter(cls.uuid == society_id).update({
+                cls._total_points: cls._total_points + total_points,
+                cls._used_points: cls._used_points + used_points
+            }, synchronize_session=False)
 
     @property
     def remaining_points(self):
@@ -233,6 +337,21 @@ class LoggedActivity(Base):
     """Models Activities logged by fellows."""
 
     __tablename__ = 'logged_activities'
+    __table_args__ = (
+        db.Index('ix_logged_activities_user_id_created_at',
+                 'user_id', 'created_at'),
+        db.Index('ix_logged_activities_user_id_status', 'user_id', 'status'),
+        db.Index('ix_logged_activities_society_id_created_at',
+                 'society_id', 'created_at'),
+        db.Index('ix_logged_activities_society_id_status',
+                 'society_id', 'status'),
+        db.Index('ix_logged_activities_created_at_uuid',
+                 'created_at', 'uuid'),
+        # only a small share of activities is ever awaiting approval
+        db.Index('ix_logged_activities_pending', 'created_at',
+                 postgresql_where=db.text("status = 'pending'"),
+                 sqlite_where=db.text("status = 'pending'")),
+    )
     value = db.Column(db.Integer, nullable=False)
     status = db.Column(db.String, default='in review')
     approved_at = db.Column(db.DateTime)
@@ -254,11 +373,231 @@ class LoggedActivity(Base):
     activity = db.relationship('Activity', uselist=False)
     activity_type = db.relationship('ActivityType', uselist=False)
 
+    @classmethod
+    def transition(cls, ids, from_status, **values):
+        """Move many logged activities out of a status at once.
+
+        Args:
+            ids (list): uuids of the logged activities
+            from_status (str): status the activities must still be in
+            values: the columns to set, e.g. status='approved'
+
+        Return:
+            list: uuid, user_id, society_id, activity_type_id and value of
+                every activity that was moved; unknown, redeemed or
+                activities in another status are left alone
+
+        On postgres this is one UPDATE ... RETURNING. Other databases
+        lock the rows with a SELECT ... FOR UPDATE and update them with
+        the same condition.
+        """
+        table = cls.__table__
+        condition = and_(table.c.uuid.in_(ids),
+                         table.c.status == from_status,
+                         table.c.redeemed.is_(False))
+        columns = (table.c.uuid, table.c.user_id, table.c.society_id,
+                   table.c.activity_type_id, table.c.value)
+        update = table.update().where(condition).values(**values)
+
+        connection = db.session.connection()
+        if connection.dialect.name == 'postgresql':
+            rows = connection.execute(update.returning(*columns)).fetchall()
+        else:
+            rows = connection.execute(
+                select(columns).where(condition).with_for_update()
+            ).fetchall()
+            if rows:
+                connection.execute(update)
+
+        new_status = values.get('status', from_status)
+        update_stats(connection, [
+            (dict(row, status=from_status), dict(row, status=new_status))
+            for row in rows])
+        return rows
+
+
+class ActivityStats(object):
+    """Count logged activities and add up their points by some columns.
+
+    The rows are kept up to date in the transactions that log, review and
+    delete activities, so totals are read from a few rows instead of
+    adding up every logged activity.
+    """
+
+    # the logged activity columns the counts are kept by
+    key_columns = ()
+
+    activities = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def changes(cls, moves):
+        """Work out the changes to the stats as activities move.
+
+        Args:
+            moves (list): (old, new) pairs of dicts with the key columns
+                and value of an activity; old is None for a new activity
+                and new is None for a deleted one
+
+        Return:
+            dict: [activities, points] to add by key
+        """
+        changes = defaultdict(lambda: [0, 0])
+        for old, new in moves:
+            for row, sign in ((old, -1), (new, 1)):
+                if row is None:
+                    continue
+                change = changes[tuple(row[name] for name in cls.key_columns)]
+                change[0] += sign
+                change[1] += sign * (row['value'] or 0)
+        return changes
+
+    @classmethod
+    def apply(cls, connection, changes):
+        """Apply changes to the stats on a flushing connection.
+
+        Args:
+            changes (dict): [activities, points] to add by key
+
+        Rows are changed in key order, so concurrent transactions can not
+        deadlock on each other.
+        """
+        table = cls.__table__
+        keys = [table.c[name] for name in cls.key_columns]
+        for key, (activities, points) in sorted(changes.items()):
+            if not (activities or points):
+                continue
+            values = dict(zip(cls.key_columns, key), activities=activities,
+                          points=points)
+            if connection.dialect.name == 'postgresql':
+                insert = postgresql.insert(table).values(**values)
+                connection.execute(insert.on_conflict_do_update(
+                    index_elements=keys,
+                    set_=dict(activities=table.c.activities + activities,
+                              points=table.c.points + points)))
+                continue
+
+            updated = connection.execute(table.update().where(and_(
+                *(column == value for column, value in zip(keys, key))
+            )).values(activities=table.c.activities + activities,
+                      points=table.c.points + points))
+            if not updated.rowcount:
+                connection.execute(table.insert().values(**values))
+
+
+class UserStats(ActivityStats, db.Model):
+    """Model how many activities a user logged and their points by status."""
+
+    __tablename__ = 'user_stats'
+    key_columns = ('user_id', 'status')
+    user_id = db.Column(db.String, db.ForeignKey('users.uuid'),
+                        primary_key=True)
+    status = db.Column(db.String, primary_key=True)
+
+    @classmethod
+    def of(cls, user_id):
+        """Get a user's number of activities and points by status.
+
+        Return:
+            dict: (activities, points) by status
+        """
+        return {status: (activities, points)
+                for status, activities, points in db.session.query(
+                    cls.status, cls.activities, cls.points
+                ).filter(cls.user_id == user_id)}
+
+
+class SocietyStats(ActivityStats, db.Model):
+    """Model a society's activities and points by status and type."""
+
+    __tablename__ = 'society_stats'
+    key_columns = ('society_id', 'status', 'activity_type_id')
+    # no foreign keys: rows left at zero must not keep societies and
+    # activity types from being deleted
+    society_id = db.Column(db.String, primary_key=True)
+    status = db.Column(db.String, primary_key=True)
+    activity_type_id = db.Column(db.String, primary_key=True)
+
+    @classmethod
+    def of(cls, society_id):
+        """Get a society's stats rows."""
+        return db.session.query(
+            cls.status, cls.activity_type_id, cls.activities, cls.points
+        ).filter(cls.society_id == society_id).all()
+
+
+STATS = (UserStats, SocietyStats)
+STATS_COLUMNS = ('user_id', 'society_id', 'status', 'activity_type_id',
+                 'value')
+
+
+def update_stats(connection, moves):
+    """Update every stats table as logged activities move.
+
+    Args:
+        connection: the connection the activities are written with
+        moves (list): (old, new) pairs of dicts with the STATS_COLUMNS of
+            an activity; old is None for a new activity and new is None
+            for a deleted one
+    """
+    for stats in STATS:
+        stats.apply(connection, stats.changes(moves))
+
+
+def _stats_row(logged_activity):
+    """Get the STATS_COLUMNS of a logged activity object."""
+    return {name: getattr(logged_activity, name) for name in STATS_COLUMNS}
+
+
+def _stored_stats_row(connection, logged_activity):
+    """Read the STATS_COLUMNS of a logged activity's row."""
+    table = LoggedActivity.__table__
+    return dict(connection.execute(
+        select([table.c[name] for name in STATS_COLUMNS]).where(
+            table.c.uuid == logged_activity.uuid)
+    ).first())
+
+
+@event.listens_for(LoggedActivity, 'after_insert')
+def _count_logged(mapper, connection, target):
+    update_stats(connection, [(None, _stats_row(target))])
+
+
+@event.listens_for(LoggedActivity, 'before_update')
+def _count_changed(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes()
+               for name in STATS_COLUMNS):
+        return
+    # the previous values are read from the row, as they are not loaded
+    # when the attributes were set on an expired object
+    stored = _stored_stats_row(connection, target)
+    update_stats(connection, [(stored, _stats_row(target))])
+    if stored['status'] == 'approved' and target.status != 'approved':
+        _reverse_points(connection, target)
+
+
+@event.listens_for(LoggedActivity, 'before_delete')
+def _count_deleted(mapper, connection, target):
+    stored = _stored_stats_row(connection, target)
+    update_stats(connection, [(stored, None)])
+    if stored['status'] == 'approved':
+        _reverse_points(connection, target)
+
 
 class RedemptionRequest(Base):
     """Model all redemption requests by Society Presidents."""
 
     __tablename__ = 'redemptions'
+    __table_args__ = (
+        db.Index('ix_redemptions_society_id_created_at',
+                 'society_id', 'created_at'),
+        db.Index('ix_redemptions_status_created_at', 'status', 'created_at'),
+        db.Index('ix_redemptions_center_id_created_at',
+                 'center_id', 'created_at'),
+        db.Index('ix_redemptions_name', 'name'),
+        db.Index('ix_redemptions_created_at_uuid', 'created_at', 'uuid'),
+    )
     user_id = db.Column(db.String, db.ForeignKey('users.uuid'), nullable=False)
     society_id = db.Column(db.String, db.ForeignKey('societies.uuid'),
                            nullable=False)
@@ -268,3 +607,245 @@ class RedemptionRequest(Base):
                           nullable=False)
     comment = db.Column(db.String)
     rejection = db.Column(db.String)
+
+
+class LedgerEntry(db.Model):
+    """Model one change to a society's points.
+
+    Entries are only ever added: an approval adds to the society's total
+    points, a redemption to its used points, and a reversal undoes an
+    earlier entry with negative values.
+    """
+
+    __tablename__ = 'points_ledger'
+    __table_args__ = (
+        db.Index('ix_points_ledger_society_id_id', 'society_id', 'id'),
+        db.Index('ix_points_ledger_society_id_created_at_id',
+                 'society_id', 'created_at', 'id'),
+        db.Index('ix_points_ledger_source_id', 'source_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    society_id = db.Column(db.String, db.ForeignKey('societies.uuid'),
+                           nullable=False)
+    kind = db.Column(db.String, nullable=False)
+    source_id = db.Column(db.String)
+    total_points = db.Column(db.Integer, nullable=False, default=0)
+    used_points = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False,
+                           default=datetime.utcnow)
+
+    @classmethod
+    def balance(cls, society_id, at=None):
+        """Get a society's points from its ledger.
+
+        Args:
+            society_id (str): uuid of the society
+            at (datetime): get the points as they were at this time,
+                defaults to now
+
+        Return:
+            tuple: total points and used points
+
+        The latest snapshot is found through an index and only the
+        entries added after it are summed up.
+        """
+        last_id = None
+        if at is not None:
+            last_entry = db.session.query(cls.id).filter(
+                cls.society_id == society_id, cls.created_at <= at
+            ).order_by(cls.created_at.desc(), cls.id.desc()).first()
+            if last_entry is None:
+                return 0, 0
+            last_id = last_entry.id
+
+        snapshot = PointsSnapshot.latest(society_id, last_id)
+        tail = db.session.query(
+            func.coalesce(func.sum(cls.total_points), 0),
+            func.coalesce(func.sum(cls.used_points), 0)
+        ).filter(cls.society_id == society_id)
+        if snapshot:
+            tail = tail.filter(cls.id > snapshot.ledger_id)
+        if last_id is not None:
+            tail = tail.filter(cls.id <= last_id)
+
+        total_points, used_points = tail.one()
+        if snapshot:
+            total_points += snapshot.total_points
+            used_points += snapshot.used_points
+        return total_points, used_points
+
+    @classmethod
+    def reverse(cls, connection, source_id):
+        """Undo the points a source's entries added, on a flushing connection.
+
+        The points still standing for the source are summed up from the
+        ledger, so a source that never got any, or was already reversed,
+        is left alone. Each society gets a reversal entry and its points
+        are updated along with it.
+
+        Return:
+            list: uuids of the societies whose points changed
+        """
+        table = cls.__table__
+        standing = connection.execute(select([
+            table.c.society_id,
+            func.coalesce(func.sum(table.c.total_points), 0),
+            func.coalesce(func.sum(table.c.used_points), 0)
+        ]).where(table.c.source_id == source_id).group_by(
+            table.c.society_id).order_by(table.c.society_id)).fetchall()
+
+        societies = Society.__table__
+        reversed_societies = []
+        for society_id, total_points, used_points in standing:
+            if not (total_points or used_points):
+                continue
+            connection.execute(table.insert().values(
+                society_id=society_id, kind='reversal', source_id=source_id,
+                total_points=-total_points, used_points=-used_points))
+            connection.execute(societies.update().where(
+                societies.c.uuid == society_id
+            ).values({
+                societies.c._total_points:
+                    societies.c._total_points - total_points,
+                societies.c._used_points:
+                    societies.c._used_points - used_points
+            }))
+            reversed_societies.append(society_id)
+        return reversed_societies
+
+
+class PointsSnapshot(db.Model):
+    """Model a society's points as of a points ledger entry."""
+
+    __tablename__ = 'points_snapshots'
+    __table_args__ = (
+        db.Index('ix_points_snapshots_society_id_ledger_id',
+                 'society_id', 'ledger_id'),
+    )
+    # entries that are younger than this may belong to transactions that
+    # have not committed yet, and are left for the next snapshot
+    SETTLE_TIME = timedelta(minutes=5)
+
+    id = db.Column(db.Integer, primary_key=True)
+    society_id = db.Column(db.String, db.ForeignKey('societies.uuid'),
+                           nullable=False)
+    ledger_id = db.Column(db.Integer, db.ForeignKey('points_ledger.id'),
+                          nullable=False)
+    total_points = db.Column(db.Integer, nullable=False)
+    used_points = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False,
+                           default=datetime.utcnow)
+
+    @classmethod
+    def latest(cls, society_id, ledger_id=None):
+        """Get a society's newest snapshot, up to a ledger entry."""
+        query = cls.query.filter(cls.society_id == society_id)
+        if ledger_id is not None:
+            query = query.filter(cls.ledger_id <= ledger_id)
+        return query.order_by(cls.ledger_id.desc()).first()
+
+    @classmethod
+    def take(cls, society_id, now=None):
+        """Snapshot a society's points if it has new, settled entries.
+
+        Only the entries since the previous snapshot are summed up.
+
+        Return:
+            PointsSnapshot: the new snapshot, or None
+        """
+        settled_before = (now or datetime.utcnow()) - cls.SETTLE_TIME
+        latest = cls.latest(society_id)
+        entries = db.session.query(LedgerEntry.id).filter(
+            LedgerEntry.society_id == society_id)
+        if latest:
+            entries = entries.filter(LedgerEntry.id > latest.ledger_id)
+
+        ledger_id = entries.filter(
+            LedgerEntry.created_at < settled_before
+        ).order_by(LedgerEntry.id.desc()).limit(1).scalar()
+        if ledger_id is None:
+            return None
+
+        total_points, used_points = entries.filter(
+            LedgerEntry.id <= ledger_id
+        ).with_entities(
+            func.coalesce(func.sum(LedgerEntry.total_points), 0),
+            func.coalesce(func.sum(LedgerEntry.used_points), 0)
+        ).one()
+
+        snapshot = cls(society_id=society_id, ledger_id=ledger_id,
+                       total_points=total_points, used_points=used_points)
+        if latest:
+            snapshot.total_points += latest.total_points
+            snapshot.used_points += latest.used_points
+        db.session.add(snapshot)
+        return snapshot
+
+
+# redemption requests in these statuses have used up their society's points
+SPENT_REDEMPTION_STATUSES = ('approved', 'completed')
+
+
+def _reverse_points(connection, target):
+    """Reverse the points of a logged activity or redemption request.
+
+    The societies' points are changed on the connection, so their loaded
+    objects are expired once the flush is over.
+    """
+    society_ids = LedgerEntry.reverse(connection, target.uuid)
+    if society_ids:
+        info = inspect(target).session.info
+        info.setdefault('written_tables', set()).add(
+            LedgerEntry.__tablename__)
+        info.setdefault('reversed_societies', set()).update(society_ids)
+
+
+@event.listens_for(RedemptionRequest, 'before_update')
+def _unspend_changed(mapper, connection, target):
+    if inspect(target).attrs.status.history.has_changes() and \
+            target.status not in SPENT_REDEMPTION_STATUSES:
+        _reverse_points(connection, target)
+
+
+@event.listens_for(RedemptionRequest, 'before_delete')
+def _unspend_deleted(mapper, connection, target):
+    _reverse_points(connection, target)
+
+
+@event.listens_for(SignallingSession, 'after_flush')
+def _expire_reversed_societies(session, flush_context):
+    mapper = inspect(Society)
+    for society_id in session.info.pop('reversed_societies', ()):
+        society = session.identity_map.get(
+            mapper.identity_key_from_primary_key([society_id]))
+        if society is not None:
+            session.expire(society, ['_total_points', '_used_points'])
+
+
+class CatalogVersion(db.Model):
+    """Model the version of a table kept in memory by the app.
+
+    The version of a catalog is bumped in the transaction that writes its
+    table, so every worker process notices the change with a primary key
+    lookup instead of reloading the table.
+    """
+
+    __tablename__ = 'catalog_versions'
+    name = db.Column(db.String, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def current(cls, name):
+        """Get the version of a catalog, 0 before its first change."""
+        return db.session.query(cls.version).filter(
+            cls.name == name).scalar() or 0
+
+    @classmethod
+    def bump(cls, connection, name):
+        """Bump the version of a catalog on a flushing connection."""
+        table = cls.__table__
+        bumped = connection.execute(table.update().where(
+            table.c.name == name
+        ).values(version=table.c.version + 1))
+        if not bumped.rowcount:
+            connection.execute(table.insert().values(name=name, version=1))
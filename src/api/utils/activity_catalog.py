@@ -0,0 +1,133 @@
+"""In-process catalog of activity types.
+
+Logging an activity used to query the activity types twice, and listing
+them read the whole table on every call. The catalog keeps every
+activity type in memory, keyed by uuid and by lowercased name, along
+with the serialized listing.
+
+Every insert, update or delete of an activity type bumps the catalog's
+CatalogVersion in the same transaction and drops this process' copy.
+Other worker processes compare their copy's version with the database
+once per request, or once per call outside of one, and reload when it
+changed.
+"""
+import hashlib
+import threading
+from collections import namedtuple
+
+from flask import g, has_app_context
+from sqlalchemy import event
+
+from api.models import ActivityType, CatalogVersion
+from api.utils.conditional import Validators
+
+CATALOG = 'activity_types'
+
+
+class ActivityTypeEntry(namedtuple('ActivityTypeEntry', [
+        'uuid', 'name', 'value', 'supports_multiple_participants', 'data'])):
+    """An activity type as the catalog keeps it."""
+
+    __slots__ = ()
+
+    def serialize(self, only=None):
+        """Map the activity type to a dictionary, like Base.serialize."""
+        return {key: value for key, value in self.data.items()
+                if only is None or key in only}
+
+
+class ActivityTypes(object):
+    """The activity types of one catalog version."""
+
+    def __init__(self, version, rows):
+        """Index the rows and serialize the listing once."""
+        from api.utils.marshmallow_schemas import activity_types_schema
+
+        self.version = version
+        self.by_uuid = {}
+        self.by_name = {}
+        for row in rows:
+            entry = ActivityTypeEntry(
+                row.uuid, row.name, row.value,
+                bool(row.supports_multiple_participants), row.serialize())
+            self.by_uuid[entry.uuid] = entry
+            self.by_name.setdefault((entry.name or '').lower(), entry)
+        self.listing = activity_types_schema.dump(rows).data
+
+        changes = [row.modified_at or row.created_at for row in rows
+                   if row.modified_at or row.created_at]
+        self.validators = Validators(
+            hashlib.sha1(repr(self.listing).encode()).hexdigest(),
+            max(changes) if changes else None)
+
+    def get(self, uuid):
+        """Find an activity type by uuid."""
+        return self.by_uuid.get(uuid)
+
+    def find(self, name):
+        """Find an activity type by name, ignoring case."""
+        return self.by_name.get(name.lower()) if name else None
+
+    def search(self, term):
+        """Find the first activity type whose name contains `term`."""
+        term = term.lower()
+        return next((entry for entry in self.by_uuid.values()
+                     if term in (entry.name or '').lower()), None)
+
+
+class ActivityTypeCatalog(object):
+    """Keep the activity types of the latest catalog version."""
+
+    def __init__(self):
+        """Create an empty catalog, loaded on first use."""
+        self._activity_types = None
+        self._lock = threading.Lock()
+
+    def invalidate(self, *args):
+        """Drop the catalog so it is reloaded on next use."""
+        self._activity_types = None
+        if has_app_context():
+            g.pop('activity_type_catalog_version', None)
+
+    def current(self):
+        """Get the activity types, reloaded if their version changed."""
+        version = self._version()
+        activity_types = self._activity_types
+        if activity_types is not None and activity_types.version == version:
+            return activity_types
+
+        with self._lock:
+            rows = ActivityType.query.order_by(
+                ActivityType.created_at, ActivityType.uuid).all()
+            activity_types = ActivityTypes(version, rows)
+            self._activity_types = activity_types
+        return activity_types
+
+    def get(self, uuid):
+        """Find an activity type by uuid."""
+        return self.current().get(uuid)
+
+    def find(self, name):
+        """Find an activity type by name, ignoring case."""
+        return self.current().find(name)
+
+    @staticmethod
+    def _version():
+        # checked once per application context, i.e. once per request
+        if not has_app_context():
+            return CatalogVersion.current(CATALOG)
+        if 'activity_type_catalog_version' not in g:
+            g.activity_type_catalog_version = CatalogVersion.current(CATALOG)
+        return g.activity_type_catalog_version
+
+
+activity_type_catalog = ActivityTypeCatalog()
+
+
+def _bump_version(mapper, connection, target):
+    activity_type_catalog.invalidate()
+    CatalogVersion.bump(connection, CATALOG)
+
+
+for _event in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(ActivityType, _event, _bump_version)
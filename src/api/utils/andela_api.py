@@ -0,0 +1,171 @@
+"""Client for the ANDELA API.
+
+All calls share one keep-alive session with connect/read timeouts. A
+circuit breaker stops calling the API for a while after repeated
+failures, and successful payloads are cached for a short time since
+user, cohort and location data rarely changes. Cache entries are keyed
+on the token as well as the URL, so one caller's payload is never
+served to another token the API would have refused.
+"""
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class APIResponse(namedtuple('APIResponse', ['status_code', 'payload'])):
+    """Parsed ANDELA API response, readable like a requests.Response."""
+
+    __slots__ = ()
+
+    def json(self):
+        """Return the already parsed payload."""
+        return self.payload
+
+
+NETWORK_ERROR = APIResponse(503, {"Error": "Network Error."})
+UNEXPECTED_ERROR = APIResponse(500, {"Error": "Something went wrong."})
+
+
+class CircuitBreaker(object):
+    """Fail fast after `threshold` consecutive failures.
+
+    Once open, the breaker lets a single trial call through after
+    `reset_timeout` seconds and closes again if that call succeeds.
+    """
+
+    def __init__(self, threshold=5, reset_timeout=30):
+        """Create a closed breaker."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """Check whether calls should be refused right now."""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # half open: let the next call through as a trial
+                self.opened_at = time.monotonic()
+                return False
+            return True
+
+    def record_success(self):
+        """Close the breaker."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        """Count a failure, opening the breaker at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class AndelaAPIClient(object):
+    """Pooled, timed and cached GET requests to the ANDELA API."""
+
+    def __init__(self, connect_timeout=3.05, read_timeout=10, cache_ttl=300,
+                 cache_size=1024, pool_size=10, breaker=None):
+        """Create a client with its own session, cache and breaker."""
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, token):
+        """Fetch `url` as the owner of `token`.
+
+        Return:
+            APIResponse, with a 503 status when the API is unreachable,
+            slow or the circuit breaker is open
+        """
+        key = (url, hashlib.sha256(token.encode('utf-8')).hexdigest())
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        if self.breaker.is_open:
+            return NETWORK_ERROR
+
+        try:
+            response = self.session.get(
+                url, headers={'Authorization': 'Bearer ' + token},
+                timeout=self.timeout)
+            api_response = APIResponse(response.status_code,
+                                       response.json())
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout):
+            self.breaker.record_failure()
+            return NETWORK_ERROR
+        except Exception:
+            self.breaker.record_failure()
+            return UNEXPECTED_ERROR
+
+        if api_response.status_code >= 500:
+            self.breaker.record_failure()
+            return api_response
+
+        self.breaker.record_success()
+        if api_response.status_code == 200 and self.cache_ttl:
+            with self._lock:
+                self._cache[key] = (time.monotonic() + self.cache_ttl,
+                                    copy.deepcopy(api_response))
+                if len(self._cache) > self.cache_size:
+                    # drop the oldest entry
+                    del self._cache[next(iter(self._cache))]
+        return api_response
+
+    def get_user(self, url, token, user_id):
+        """Fetch a user's details."""
+        return self.get(f"{url}users/{user_id}", token)
+
+    def get_cohorts(self, url, token):
+        """Fetch all cohorts."""
+        return self.get(f"{url}cohorts", token)
+
+    def get_locations(self, url, token):
+        """Fetch all locations."""
+        return self.get(f"{url}locations", token)
+
+    def clear_cache(self):
+        """Forget all cached payloads."""
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, api_response = entry
+            if expires_at <= time.monotonic():
+                del self._cache[key]
+                return None
+        # callers get their own copy to mutate
+        return copy.deepcopy(api_response)
+
+
+andela_api = AndelaAPIClient(
+    connect_timeout=float(os.getenv('ANDELA_API_CONNECT_TIMEOUT', 3.05)),
+    read_timeout=float(os.getenv('ANDELA_API_READ_TIMEOUT', 10)),
+    cache_ttl=int(os.getenv('ANDELA_API_CACHE_TTL', 300))
+)
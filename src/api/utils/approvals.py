@@ -0,0 +1,118 @@
+"""Set-based status changes of logged activities.
+
+Approving, rejecting or reviewing a list of logged activities moves
+every one of them that is in the expected status with a single
+statement. Approvals also insert a ledger entry per activity at once and
+apply one points increment per society; lists longer than
+BACKGROUND_APPROVALS are approved by a celery task instead of the
+request.
+"""
+from api.models import LedgerEntry, LoggedActivity, Society, db
+from api.utils.counts import mark_written
+from api.utils.notifications.email_notices import celery, flask_app
+
+# how many logged activities one request may approve, reject or review
+MAX_REVIEWS = 5000
+# longer lists are approved in the background
+BACKGROUND_APPROVALS = 1000
+
+
+def read_logged_activities_ids(payload, action):
+    """Read the list of logged activities ids of a request.
+
+    Args:
+        payload (dict): the request's JSON
+        action (str): what is done to the activities, for the messages
+
+    Return:
+        tuple: the distinct ids in request order and None, or None and
+            the error message with its status code
+    """
+    logged_activities_ids = payload.get('loggedActivitiesIds')
+
+    if logged_activities_ids is None:
+        return None, (dict(message='loggedActivitiesIds is required'), 400)
+
+    if not isinstance(logged_activities_ids, list) or \
+            not logged_activities_ids:
+        return None, (dict(
+            message='A List/Array with at least one logged activity'
+                    ' id is needed!'), 400)
+
+    if len(logged_activities_ids) > MAX_REVIEWS:
+        return None, (dict(
+            message=f'Sorry, you can not {action} more than {MAX_REVIEWS}'
+                    ' logged_activities at a go'), 403)
+
+    return list(dict.fromkeys(
+        logged_activity_id for logged_activity_id in logged_activities_ids
+        if isinstance(logged_activity_id, str))), None
+
+
+def approve_logged_activities(ids):
+    """Approve the pending logged activities among `ids`.
+
+    Args:
+        ids (list): uuids of the logged activities
+
+    Return:
+        list: uuid, user_id, society_id and value of each approved
+            activity; the caller commits
+    """
+    approved = LoggedActivity.transition(ids, 'pending', status='approved')
+    entries = [LedgerEntry(society_id=row.society_id, kind='approval',
+                           source_id=row.uuid, total_points=row.value)
+               for row in approved]
+    Society.apply_points(entries)
+    # one INSERT for all the entries, their ids are not needed
+    db.session.bulk_save_objects(entries)
+    mark_written(LoggedActivity.__tablename__, LedgerEntry.__tablename__)
+    return approved
+
+
+def review_logged_activities(ids, from_status, **values):
+    """Move the logged activities among `ids` out of `from_status`.
+
+    Args:
+        ids (list): uuids of the logged activities
+        from_status (str): status the activities have to be in
+        values: the columns to set, including the new status
+
+    Return:
+        tuple: the number of activities moved, and a result per id with
+            either its new status or why it was left alone; the caller
+            commits
+    """
+    moved = {row.uuid for row in
+             LoggedActivity.transition(ids, from_status, **values)}
+    mark_written(LoggedActivity.__tablename__)
+
+    left = [logged_activity_id for logged_activity_id in ids
+            if logged_activity_id not in moved]
+    statuses = dict(db.session.query(
+        LoggedActivity.uuid, LoggedActivity.status
+    ).filter(LoggedActivity.uuid.in_(left))) if left else {}
+
+    results = []
+    for logged_activity_id in ids:
+        if logged_activity_id in moved:
+            results.append(dict(id=logged_activity_id,
+                                status=values['status']))
+        elif logged_activity_id in statuses:
+            results.append(dict(
+                id=logged_activity_id,
+                status=statuses[logged_activity_id],
+                message=f'Logged activity is not {from_status}'))
+        else:
+            results.append(dict(id=logged_activity_id,
+                                message='Logged activity not found'))
+    return len(moved), results
+
+
+@celery.task(ignore_result=True)
+def approve_in_background(ids, app=flask_app):
+    """Approve a long list of logged activities outside of a request."""
+    with app.app_context():
+        approved = approve_logged_activities(ids)
+        db.session.commit()
+        return len(approved)
@@ -5,13 +5,21 @@ This module contains the authorisation required by the client to
 communicate with the API.
 """
 import base64
-from functools import wraps
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
 
 from flask import current_app, g, jsonify, request
 from jose import ExpiredSignatureError, JWTError, jwt
+from jose.exceptions import JWTClaimsError
+from sqlalchemy.orm import joinedload
 
 from api.models import Role, User
 from api.utils.helpers import add_extra_user_info, response_builder
+from api.utils.provisioning import enrich_user_details
+from api.utils.role_registry import current_user_role_ids, role_registry
 
 
 def auth_response(status_code, message):
@@ -23,6 +31,82 @@ def auth_response(status_code, message):
     return response
 
 
+class VerifiedTokenCache(object):
+    """Bounded LRU of verified token payloads.
+
+    Entries are keyed by a digest of the token and the verification
+    parameters, and expire at the token's own `exp` claim so a cached
+    payload is never served for a token that has since expired.
+    """
+
+    def __init__(self, maxsize=1024):
+        """Create an empty cache holding at most `maxsize` payloads."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(authorization_token, public_key, audience=None, issuer=None):
+        """Digest a token together with the parameters it was verified with."""
+        raw = "\x00".join([authorization_token, public_key,
+                           audience or "", issuer or ""])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return a cached payload that has not expired, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, key, payload):
+        """Store a verified payload until its `exp` claim."""
+        try:
+            expires_at = float(payload["exp"])
+        except (KeyError, TypeError, ValueError):
+            # without an expiry we cannot tell when to stop trusting it
+            return
+
+        with self._lock:
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        """Return the number of cached payloads."""
+        return len(self._entries)
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+@lru_cache(maxsize=8)
+def load_public_key(encoded_public_key):
+    """Decode the base64 encoded public key from config once per process."""
+    return base64.b64decode(encoded_public_key).decode("utf-8")
+
+
 def verify_token(authorization_token, public_key, audience=None, issuer=None):
     """Validate token."""
     try:
@@ -36,18 +120,32 @@ def verify_token(authorization_token, public_key, audience=None, issuer=None):
             },
             audience=audience,
             issuer=issuer)
-    except JWTError:
+    except JWTClaimsError:
+        # the signature was already verified above, only the
+        # audience/issuer checks need to be relaxed
         payload = jwt.decode(
             authorization_token,
             public_key,
             algorithms=['RS256'],
             options={
-                'verify_signature': True,
+                'verify_signature': False,
                 'verify_exp': True
             })
     return payload
 
 
+def verify_cached_token(authorization_token, public_key, audience=None,
+                        issuer=None, cache=verified_tokens):
+    """Validate token, skipping verification for recently seen tokens."""
+    key = cache.make_key(authorization_token, public_key, audience, issuer)
+    payload = cache.get(key)
+    if payload is None:
+        payload = verify_token(authorization_token, public_key,
+                               audience, issuer)
+        cache.set(key, payload)
+    return payload
+
+
 # authorization decorator
 def token_required(f):
     """Authenticate that a valid Token is present."""
@@ -65,12 +163,11 @@ def token_required(f):
 
         try:
             # decode token
-            public_key = base64.b64decode(
-                current_app.config['PUBLIC_KEY']).decode("utf-8")
-            payload = verify_token(authorization_token,
-                                   public_key,
-                                   current_app.config['API_AUDIENCE'],
-                                   current_app.config['API_ISSUER'])
+            public_key = load_public_key(current_app.config['PUBLIC_KEY'])
+            payload = verify_cached_token(authorization_token,
+                                          public_key,
+                                          current_app.config['API_AUDIENCE'],
+                                          current_app.config['API_ISSUER'])
         except ExpiredSignatureError:
             expired_response = "The authorization token supplied is expired"
             return response_builder(dict(message=expired_response), 401)
@@ -98,20 +195,32 @@ def token_required(f):
         elif not all(item in payload_user_keys for item in expected_user_keys):
             return response_builder(dict(message=unauthorized_message), 401)
         else:
-            user = User.query.get(payload["UserInfo"]["id"])
+            user = load_identity(payload["UserInfo"]["id"])
             if not user:
                 user = store_user_details(payload, authorization_token)
             g.current_user = user
             g.current_user_token = authorization_token
+            g.current_user_role_ids = None
 
             # attempt to link user to society
-            if not g.current_user.society and g.current_user.cohort:
-                user.society = g.current_user.cohort.society
+            if not user.society_id and user.cohort and \
+                    user.cohort.society_id:
+                user.society = user.cohort.society
                 user.save()
         return f(*args, **kwargs)
     return decorated
 
 
+def load_identity(user_id):
+    """Load a user with their society, cohort, center and roles at once."""
+    return User.query.options(
+        joinedload('society'),
+        joinedload('cohort').joinedload('society'),
+        joinedload('center'),
+        joinedload('role_set')
+    ).filter(User.uuid == user_id).one_or_none()
+
+
 def store_user_details(payload, token):
     """Store user details in our database."""
     user_id = payload["UserInfo"]["id"]
@@ -128,7 +237,19 @@ def store_user_details(payload, token):
             uuid=user_id, name=name, email=email, photo=photo
         )
 
-    cohort, location, _ = add_extra_user_info(token, user_id)
+    role_ids = role_registry.uuids_for(
+        [role.lower() for role in roles if role and role != "Andelan"])
+    user.roles = Role.query.filter(Role.uuid.in_(role_ids)).all() \
+        if role_ids else []
+
+    if current_app.config['ASYNC_USER_PROVISIONING']:
+        # cohort and center are filled in by a celery task
+        user.save()
+        enrich_user_details.delay(user_id)
+        return user
+
+    cohort, location, _ = add_extra_user_info(
+        token, user_id, url=current_app.config['ANDELA_API_URL'])
 
     if cohort:
         cohort.members.append(user)
@@ -139,11 +260,6 @@ def store_user_details(payload, token):
         location.members.append(user)
         location.save()
 
-    # set current user in flask global variable, g
-    user.roles = [
-        Role.query.filter_by(name=role.lower()).first() for role in roles
-        if role and role != "Andelan" and Role.query.filter_by(
-            name=role.lower()).first() is not None]
     user.save()
     return user
 
@@ -157,13 +273,8 @@ def roles_required(roles):
     def check_user_role(f):
         @wraps(f)
         def decorated(*args, **kwargs):
-            route_roles = list(filter(lambda r: r is not None,
-                                      [Role.query.filter_by(name=role).first()
-                                       for role in roles]))
-            for role in g.current_user.roles:
-                if role in route_roles:
-                    break
-            else:
+            route_roles = role_registry.uuids_for(roles)
+            if route_roles.isdisjoint(current_user_role_ids()):
                 return response_builder(
                     dict(message="You're unauthorized"
                          " to perform this operation"), 401)
@@ -0,0 +1,100 @@
+"""Conditional GET support for polled read endpoints.
+
+A response that has not changed since the client last fetched it should
+not cost its serialization. A `Validators` object is taken from the rows
+a response is made of once they are loaded, before they are dumped: the
+precomputed stats that stand in for the rows of other pages, and the
+last change of every row the page shows. Its weak ETag and Last-Modified
+date answer If-None-Match and If-Modified-Since with 304 Not Modified,
+without aggregating over the whole history.
+"""
+import hashlib
+
+from flask import Response, request
+
+from api.models import User
+
+
+class Validators(object):
+    """The ETag and Last-Modified date of a response."""
+
+    def __init__(self, etag, last_modified):
+        """Keep the (unquoted) etag and the last modification time."""
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def of_rows(cls, *rows):
+        """Take the validators of rows that are already loaded.
+
+        Model instances are versioned by their uuid and their last change,
+        modified_at or else created_at. Any other row, e.g. a stats tuple,
+        is taken as it is, as is None for a missing row. Deleted rows
+        change the counts in the stats, so they are noticed as well.
+        """
+        versions = []
+        changes = []
+        for row in rows:
+            if row is None:
+                versions.append(repr(row))
+            elif hasattr(row, '__table__'):
+                latest = row.modified_at or row.created_at
+                versions.append(repr((type(row).__name__, row.uuid,
+                                      latest)))
+                if latest:
+                    changes.append(latest)
+            else:
+                versions.append(repr(tuple(row)))
+
+        etag = hashlib.sha1(repr(sorted(set(versions))).encode()).hexdigest()
+        return cls(etag, max(changes) if changes else None)
+
+    def is_fresh(self):
+        """Check whether the client already has this version."""
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if request.if_modified_since and self.last_modified:
+            # HTTP dates have no fractions of a second
+            return self.last_modified.replace(microsecond=0) <= \
+                request.if_modified_since
+        return False
+
+    def not_modified(self):
+        """Build the 304 response."""
+        return self.apply(Response(status=304))
+
+    def apply(self, response):
+        """Add the ETag and Last-Modified headers to a response."""
+        response.set_etag(self.etag, weak=True)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        return response
+
+
+def logged_activity_rows(logged_activities):
+    """List the rows a dump of logged activities reads.
+
+    Besides the logged activities themselves, their dump reads the names
+    of their activities and types, which are loaded along with them, and
+    of the users who logged, approved and reviewed them; a change to any
+    of those changes the response.
+
+    Args:
+        logged_activities (list): the loaded LoggedActivity rows
+
+    Return:
+        list: rows to pass to Validators.of_rows
+    """
+    rows = list(logged_activities)
+    user_ids = set()
+    for logged_activity in logged_activities:
+        rows.extend(related for related in (logged_activity.user,
+                                            logged_activity.activity,
+                                            logged_activity.activity_type)
+                    if related is not None)
+        user_ids.update((logged_activity.approver_id,
+                         logged_activity.reviewer_id))
+    user_ids.discard(None)
+    if user_ids:
+        rows.extend(User.query.filter(User.uuid.in_(user_ids)))
+    return rows
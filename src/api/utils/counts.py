@@ -0,0 +1,121 @@
+"""Cached and estimated totals for paginated listings.
+
+An exact COUNT(*) costs about as much as fetching the page itself.
+`count_cache` keeps the total of each listing query and drops it once
+one of the tables it reads from is written through the ORM in this
+process. Other worker processes notice writes once their copy is older
+than `ttl` seconds.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask_sqlalchemy import SignallingSession
+from sqlalchemy import event, inspect
+from sqlalchemy.sql.util import find_tables
+
+from api.models import db
+
+
+class CountCache(object):
+    """Map listing queries to their row counts."""
+
+    def __init__(self, ttl=60, maxsize=1024):
+        """Create an empty cache whose counts are kept `ttl` seconds."""
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._counts = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, *tables):
+        """Drop the counts of every query that reads from `tables`."""
+        with self._lock:
+            for table in tables:
+                self._generations[table] = \
+                    self._generations.get(table, 0) + 1
+
+    def clear(self):
+        """Drop all counts."""
+        with self._lock:
+            self._counts.clear()
+
+    def count(self, query):
+        """Return the number of rows `query` returns."""
+        query = query.order_by(None).enable_eagerloads(False)
+        compiled = query.statement.compile()
+        key = (str(compiled), repr(sorted(compiled.params.items())))
+        tables = sorted({table.name for table in find_tables(query.statement)})
+
+        with self._lock:
+            entry = self._counts.get(key)
+            generations = [self._generations.get(table, 0)
+                           for table in tables]
+        if entry is not None:
+            counted_at, entry_generations, total = entry
+            if (entry_generations == generations and
+                    time.monotonic() - counted_at < self.ttl):
+                return total
+
+        total = query.count()
+        with self._lock:
+            self._counts[key] = (time.monotonic(), generations, total)
+            self._counts.move_to_end(key)
+            if len(self._counts) > self.maxsize:
+                self._counts.popitem(last=False)
+        return total
+
+
+count_cache = CountCache()
+
+
+def estimate_count(query):
+    """Estimate the number of rows `query` returns.
+
+    Postgres estimates it from the table statistics (pg_class.reltuples
+    and the column histograms) without reading any rows. Databases that
+    keep no statistics get the cached count instead.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name != 'postgresql':
+        return count_cache.count(query)
+
+    compiled = query.order_by(None).enable_eagerloads(False).statement.compile(
+        dialect=connection.dialect)
+    plan = connection.execute('EXPLAIN (FORMAT JSON) ' + str(compiled),
+                              compiled.params).scalar()
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def mark_written(*tables):
+    """Drop the counts of tables written with Core statements.
+
+    ORM flushes and bulk updates are noticed on their own; an INSERT or
+    UPDATE executed directly on the session has to be reported.
+    """
+    db.session.info.setdefault('written_tables', set()).update(tables)
+    count_cache.invalidate(*tables)
+
+
+@event.listens_for(SignallingSession, 'after_flush')
+def _invalidate_flushed(session, flush_context):
+    tables = session.info.setdefault('written_tables', set())
+    for instance in session.new | session.dirty | session.deleted:
+        tables.add(inspect(instance).mapper.local_table.name)
+    count_cache.invalidate(*tables)
+
+
+@event.listens_for(SignallingSession, 'after_bulk_update')
+@event.listens_for(SignallingSession, 'after_bulk_delete')
+def _invalidate_bulk(update_context):
+    table = update_context.primary_table.name
+    update_context.session.info.setdefault('written_tables', set()).add(table)
+    count_cache.invalidate(table)
+
+
+@event.listens_for(SignallingSession, 'after_commit')
+@event.listens_for(SignallingSession, 'after_rollback')
+def _invalidate_finished(session):
+    # counts taken inside the transaction may be stale for everyone else
+    tables = session.info.pop('written_tables', ())
+    count_cache.invalidate(*tables)
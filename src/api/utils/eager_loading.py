@@ -0,0 +1,63 @@
+"""Eager loading derived from what a schema dumps.
+
+A field such as `fields.String(attribute='user.name')` reads through a
+relationship. Dumping a list of items with it lazy loads the relationship
+once per item. `eager_loads` finds every relationship a schema reads
+through, nested schemas included, and eager loads it along with the
+items instead.
+"""
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, subqueryload
+
+
+def eager_loads(schema, model):
+    """Build the loader options for the relationships a schema reads.
+
+    Many-to-one relationships are joined into the query; collections are
+    loaded with one extra query for all of the items.
+
+    Args:
+        schema (Schema): the schema the items are dumped with
+        model (Model): the class of the items
+
+    Return:
+        list: options for the query that loads the items
+    """
+    options = []
+    for path in sorted(relationship_paths(schema, inspect(model))):
+        option = None
+        mapper = inspect(model)
+        for key in path:
+            relationship = mapper.relationships[key]
+            loader = subqueryload if relationship.uselist else joinedload
+            attribute = getattr(mapper.class_, key)
+            option = loader(attribute) if option is None else \
+                getattr(option, loader.__name__)(attribute)
+            mapper = relationship.mapper
+        options.append(option)
+    return options
+
+
+def relationship_paths(schema, mapper):
+    """Find the relationship paths the fields of a schema read through."""
+    paths = set()
+    for name, field in schema.fields.items():
+        path = []
+        current = mapper
+        for key in (field.attribute or name).split('.'):
+            relationship = current.relationships.get(key)
+            # dynamic relationships are queries, which can not be preloaded
+            if relationship is None or relationship.lazy == 'dynamic':
+                break
+            path.append(key)
+            current = relationship.mapper
+        if not path:
+            continue
+
+        paths.add(tuple(path))
+        if isinstance(field, fields.Nested):
+            paths.update(tuple(path) + nested
+                         for nested in relationship_paths(field.schema,
+                                                          current))
+    return paths
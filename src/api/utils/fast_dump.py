@@ -0,0 +1,145 @@
+"""Generated dump functions for marshmallow schemas.
+
+marshmallow 2 dumps every field of every item through the same generic
+path: the Marshaller looks the field's value up by splitting its
+attribute path, dispatches to the field, and wraps each call to record
+errors. `CompiledSchema` writes the source of a function that dumps one
+item of a schema instance, with each field's lookup and conversion
+spelled out, and compiles it once when the schema is created.
+
+Only the common, plain field types are inlined; the others are still
+dumped by their own field objects. Whenever the generated function can
+not give the same result as marshmallow, e.g. for items that are not
+models or fields that fail to serialize, the dump falls back to
+marshmallow's.
+"""
+from marshmallow import Schema, ValidationError, fields, utils
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.schema import MarshalResult
+from marshmallow.utils import missing
+
+from api.models import db
+
+
+class CompiledSchema(Schema):
+    """A schema whose dump runs a generated function per item."""
+
+    def __init__(self, *args, **kwargs):
+        """Create the schema and compile its dump function."""
+        super().__init__(*args, **kwargs)
+        self.dump_item = compile_dump(self)
+
+    def dump(self, obj, many=None, update_fields=True, **kwargs):
+        """Serialize `obj` like Schema.dump does."""
+        many = self.many if many is None else bool(many)
+        if many and utils.is_iterable_but_not_string(obj):
+            obj = list(obj)
+        items = obj if many else [obj]
+        if kwargs or self.extra or not isinstance(items, list) or \
+                not all(isinstance(item, db.Model) for item in items):
+            return super().dump(obj, many, update_fields, **kwargs)
+
+        try:
+            data = obj
+            if self._has_processors:
+                data = self._invoke_dump_processors(PRE_DUMP, data, many,
+                                                    original_data=obj)
+            dump_item = self.dump_item
+            if many:
+                result = [dump_item(item) for item in data]
+            else:
+                result = dump_item(data)
+            if self._has_processors:
+                result = self._invoke_dump_processors(POST_DUMP, result, many,
+                                                      original_data=obj)
+        except (ValidationError, AttributeError, TypeError, ValueError):
+            # let marshmallow collect the errors the way it does
+            return super().dump(obj, many, update_fields, **kwargs)
+        return MarshalResult(result, {})
+
+
+def compile_dump(schema):
+    """Generate and compile the function that dumps one item of a schema.
+
+    The generated code for e.g. `owner = fields.String(attribute='user.name')`
+    reads::
+
+        value = getattr(obj, 'user', missing)
+        if callable(value):
+            value = value()
+        if value is not missing:
+            value = getattr(value, 'name', missing)
+            if callable(value):
+                value = value()
+        if value is not missing:
+            result['owner'] = value if value is None or \\
+                type(value) is str else ensure_text_type(value)
+    """
+    namespace = {'missing': missing,
+                 'ensure_text_type': utils.ensure_text_type}
+    lines = ['def dump_item(obj):', '    result = {}']
+    for number, (name, field) in enumerate(schema.fields.items()):
+        if field.load_only:
+            continue
+        key = field.dump_to or name
+        field_name = 'field_{}'.format(number)
+        namespace[field_name] = field
+        lines.extend('    ' + line
+                     for line in field_lines(schema, name, field, key,
+                                             field_name, namespace))
+    lines.append('    return result')
+
+    source = '\n'.join(lines)
+    exec(compile(source, '<dump {}>'.format(type(schema).__name__), 'exec'),
+         namespace)
+    dump_item = namespace['dump_item']
+    dump_item.source = source
+    return dump_item
+
+
+def field_lines(schema, name, field, key, field_name, namespace):
+    """Write the lines that dump one field into `result`."""
+    field_type = type(field)
+    if field_type is fields.Method and field.serialize_method_name:
+        method_name = 'method_{}'.format(field_name)
+        namespace[method_name] = getattr(schema, field.serialize_method_name)
+        return ['try:',
+                '    result[{!r}] = {}(obj)'.format(key, method_name),
+                'except AttributeError:',
+                '    pass']
+
+    inlined = {
+        fields.String: 'value if value is None or type(value) is str '
+                       'else ensure_text_type(value)',
+        fields.Integer: 'None if value is None else int(value)',
+        fields.Boolean: 'value if value is None or type(value) is bool '
+                        'else {}._serialize(value, {!r}, obj)'.format(
+                            field_name, name),
+        fields.DateTime: 'None if value is None '
+                         'else {}._serialize(value, {!r}, obj)'.format(
+                             field_name, name),
+        fields.Date: 'None if value is None else value.isoformat()',
+        fields.Nested: '{}._serialize(value, {!r}, obj)'.format(
+            field_name, name),
+    }
+    plain = field_type in inlined and field.default is missing and \
+        not getattr(field, 'as_string', False)
+    if not plain:
+        return ['value = {}.serialize({!r}, obj)'.format(field_name, name),
+                'if value is not missing:',
+                '    result[{!r}] = value'.format(key)]
+
+    # like marshmallow.utils.get_value, a callable attribute is called
+    lines = []
+    for depth, part in enumerate((field.attribute or name).split('.')):
+        get = ['value = getattr({}, {!r}, missing)'.format(
+                   'value' if depth else 'obj', part),
+               'if callable(value):',
+               '    value = value()']
+        if depth:
+            lines.append('if value is not missing:')
+            lines.extend('    ' + line for line in get)
+        else:
+            lines.extend(get)
+    return lines + ['if value is not missing:',
+                    '    result[{!r}] = {}'.format(key, inlined[field_type])]
@@ -0,0 +1,139 @@
+"""Sparse fieldsets for listings.
+
+A listing request can send `fields=id,name,createdAt` to get only those
+keys of each item. The names are the keys of the serialized items. The
+columns that only feed other keys are left out of the SQL query with
+load_only, so they are never fetched.
+"""
+from collections import defaultdict
+from functools import lru_cache
+
+from flask import request
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+from api.models import camel_case
+
+
+def requested_fields():
+    """Get the keys asked for with the `fields` argument.
+
+    Return:
+        frozenset: the keys, or None when every key is wanted
+    """
+    fields = request.args.get('fields', '')
+    return frozenset(
+        field.strip() for field in fields.split(',') if field.strip()
+    ) or None
+
+
+def check_fields(fields, known):
+    """Make sure every requested key exists.
+
+    Raises:
+        ValueError: naming the keys that do not exist
+    """
+    unknown = fields - set(known)
+    if unknown:
+        raise ValueError('Unknown fields: {}.'.format(
+            ', '.join(sorted(unknown))))
+
+
+def model_fieldset(model, fields):
+    """Find the load options for the Base.serialize keys of a model.
+
+    Return:
+        list: query options that load only the columns behind `fields`
+
+    Raises:
+        ValueError: when a key is not serialized by the model
+    """
+    columns = {camel_case(column.name): column.name
+               for column in model.__table__.columns}
+    check_fields(fields, columns)
+    return [load_only(*cursor_columns(
+        {columns[field] for field in fields}))]
+
+
+def schema_fieldset(schema, model, fields, relations=None):
+    """Trim a many=True schema, and its query, to serialized keys.
+
+    Args:
+        schema (Schema): the schema the items are dumped with
+        model (Model): the model the query is for
+        fields (frozenset): the keys to keep, None keeps them all
+        relations (dict): keys the caller adds to each item itself,
+            mapped to the attributes they read
+
+    Return:
+        tuple: query options, and a schema dumping only `fields`, which
+            is None when all of them are in `relations`
+
+    Raises:
+        ValueError: when a key is not dumped by the schema
+
+    Fields are matched to columns through their attribute; a field whose
+    attribute is neither a column nor a relationship, such as a Method
+    field, lists the columns it reads in its `columns` metadata. When
+    that is missing every column is loaded.
+    """
+    relations = relations or {}
+    if not fields:
+        return [], schema
+
+    names = defaultdict(list)
+    for name, field in schema.fields.items():
+        names[field.dump_to or name].append(name)
+    check_fields(fields, set(names) | set(relations))
+
+    attributes = set()
+    only = []
+    load_all = False
+    for field in fields:
+        if field in relations:
+            attributes.update(relations[field])
+            continue
+        for name in names[field]:
+            only.append(name)
+            read = field_attributes(model, name, schema.fields[name])
+            if read is None:
+                load_all = True
+            else:
+                attributes.update(read)
+
+    options = []
+    if not load_all:
+        options.append(load_only(*cursor_columns(attributes)))
+    if not only:
+        return options, None
+    return options, trimmed_schema(type(schema), frozenset(only),
+                                   tuple(sorted(schema.exclude)),
+                                   schema.many)
+
+
+def field_attributes(model, name, field):
+    """Find the mapped attributes a schema field reads, if known."""
+    if 'columns' in field.metadata:
+        return set(field.metadata['columns'])
+
+    mapper = inspect(model)
+    attribute = (field.attribute or name).split('.')[0]
+    if attribute in mapper.column_attrs:
+        return {attribute}
+    if attribute in mapper.relationships:
+        # lazy loads need the foreign keys of the row
+        return {mapper.get_property_by_column(column).key
+                for column in mapper.relationships[attribute].local_columns}
+    return None
+
+
+def cursor_columns(attributes):
+    """Add the columns cursor pagination reads to a set of attributes."""
+    return sorted(set(attributes) | {'uuid', 'created_at'})
+
+
+@lru_cache(maxsize=256)
+def trimmed_schema(schema_class, only, exclude, many):
+    """Build, once, a schema that dumps only some of its fields."""
+    return schema_class(only=tuple(sorted(only)), exclude=exclude,
+                        many=many)
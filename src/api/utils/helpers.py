@@ -1,16 +1,27 @@
 """Contain utility functions and constants."""
+import base64
+import binascii
+import csv
 import datetime
+import io
+import json
 import os
 from collections import namedtuple
 
-
-import requests
 from flask import (
-    Response, current_app, jsonify, request, url_for, g
+    Response, current_app, jsonify, request, stream_with_context, url_for, g
 )
-from api.models import (Activity, ActivityType, Cohort, Center, Role, Society,
-                        RedemptionRequest, LoggedActivity, db)
+from flask_sqlalchemy import Pagination
+from sqlalchemy import literal, tuple_
+from api.models import (Activity, Cohort, Center, Role, Society,
+                        RedemptionRequest, LoggedActivity, User, db)
+from api.utils.activity_catalog import activity_type_catalog
+from api.utils.andela_api import andela_api
+from api.utils.counts import count_cache, estimate_count
+from api.utils.fieldsets import (model_fieldset, requested_fields,
+                                 schema_fieldset)
 from api.utils.marshmallow_schemas import basic_info_schema, redemption_schema
+from api.utils.role_registry import current_user_role_ids, role_registry
 
 
 ParsedResult = namedtuple(
@@ -20,22 +31,53 @@ ParsedResult = namedtuple(
 
 PaginatedResult = namedtuple(
     'PaginatedResult',
-    ['data', 'count', 'page', 'pages', 'previous_url', 'next_url']
+    ['data', 'count', 'page', 'pages', 'previous_url', 'next_url',
+     'next_cursor']
 )
 
+CURSOR_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# keys serialize_redmp adds to a redemption, and the columns they read
+REDEMPTION_RELATIONS = {
+    'user': ('user_id',),
+    'society': ('user_id',),
+    'center': ('center_id',)
+}
+
 
 def parse_log_activity_fields(result):
     """Parse the fields of the Log Activity Fields."""
+    parsed_result, error = check_log_activity_fields(result)
+    if error:
+        return response_builder(*error)
+    return parsed_result
+
+
+def check_log_activity_fields(result, activities=None):
+    """Check the fields of an activity to log and work out its points.
+
+    Args:
+        result (dict): the loaded fields of the activity
+        activities (dict): activities by uuid, to look them up in instead
+            of the database
+
+    Return:
+        tuple: the ParsedResult and None, or None and the error message
+            with its status code
+    """
     if result.get('activity_id'):
-        activity = Activity.query.get(result['activity_id'])
+        if activities is None:
+            activity = Activity.query.get(result['activity_id'])
+        else:
+            activity = activities.get(result['activity_id'])
         if not activity:
-            return response_builder(dict(message='Invalid activity id'), 422)
+            return None, (dict(message='Invalid activity id'), 422)
 
-        activity_type = activity.activity_type
+        activity_type = activity_type_catalog.get(activity.activity_type_id)
         if activity_type.supports_multiple_participants and \
                 not (result.get('no_of_participants') and
                      result.get('description')):
-            return response_builder(dict(
+            return None, (dict(
                 message='Please send the number of interviewees and'
                 ' their names in the description'
             ), 400)
@@ -45,19 +87,16 @@ def parse_log_activity_fields(result):
     else:
         activity_date = result['date']
         if activity_date > datetime.date.today():
-            return response_builder(dict(message='Invalid activity date'), 422)
+            return None, (dict(message='Invalid activity date'), 422)
 
-        activity_type = ActivityType.query.get(
-            result['activity_type_id']
-        )
+        activity_type = activity_type_catalog.get(result['activity_type_id'])
         if not activity_type:
-            return response_builder(dict(message='Invalid activity type id'),
-                                    422)
+            return None, (dict(message='Invalid activity type id'), 422)
         activity = None
         time_difference = datetime.date.today() - activity_date
 
     if time_difference.days > 30:
-        return response_builder(dict(
+        return None, (dict(
             message='You\'re late. That activity'
             ' happened more than 30 days ago'
         ), 422)
@@ -68,47 +107,69 @@ def parse_log_activity_fields(result):
 
     return ParsedResult(
         activity, activity_type, activity_date, activity_value
-    )
+    ), None
 
 
-def paginate_items(fetched_data, serialize=True):
-    """Paginate all roles for display."""
+def paginate_items(fetched_data, serialize=True, total=None):
+    """Paginate all roles for display.
+
+    Requests with a `cursor` argument are paginated by cursor instead, see
+    paginate_by_cursor. The `count` argument picks how the total is found:
+    `exact` runs COUNT(*), `cached` reuses the last count of the same
+    query and `estimate` asks the database for an estimate. A `total` the
+    caller already keeps is used as is. When items are serialized here, a
+    `fields` argument trims them to those keys.
+    """
     _page = request.args.get('page', type=int) or current_app.config['DEFAULT_PAGE']
     _limit = request.args.get('limit', type=int) or current_app.config['PAGE_LIMIT']
     page = current_app.config['DEFAULT_PAGE'] if _page < 0 else _page
     limit = current_app.config['PAGE_LIMIT'] if _limit < 0 else _limit
 
-    fetched_data = fetched_data.paginate(
-        page=page,
-        per_page=limit,
-        error_out=False
-    )
+    fields = None
+    if serialize:
+        try:
+            fetched_data, fields = apply_fieldset(fetched_data)
+        except ValueError as error:
+            return response_builder(dict(
+                status="fail",
+                message=str(error)
+            ), 400)
+
+    if 'cursor' in request.args:
+        return paginate_by_cursor(fetched_data, request.args['cursor'], limit,
+                                  serialize, fields)
+
+    count = request.args.get('count', current_app.config['PAGE_COUNT'])
+    if total is not None or count in ('cached', 'estimate'):
+        fetched_data = paginate_with_total(fetched_data, page, limit, count,
+                                           total)
+    else:
+        fetched_data = fetched_data.paginate(
+            page=page,
+            per_page=limit,
+            error_out=False
+        )
     if fetched_data.items:
         previous_url = None
         next_url = None
 
         if fetched_data.has_next:
             next_url = url_for(request.endpoint, limit=limit,
-                               page=page+1, _external=True)
+                               page=page+1, _external=True,
+                               **request.view_args)
         if fetched_data.has_prev:
             previous_url = url_for(request.endpoint, limit=limit,
-                                   page=page-1, _external=True)
+                                   page=page-1, _external=True,
+                                   **request.view_args)
 
         if serialize:
-            data_list = []
-            for _fetched_item in fetched_data.items:
-                if isinstance(_fetched_item, RedemptionRequest):
-                    data_item = serialize_redmp(_fetched_item)
-                    data_list.append(data_item)
-                else:
-                    data_item = _fetched_item.serialize()
-                    data_list.append(data_item)
+            data_list = serialize_items(fetched_data.items, fields)
         else:
             data_list = fetched_data.items
 
             return PaginatedResult(
                 data_list, fetched_data.total, fetched_data.page,
-                fetched_data.pages, previous_url, next_url
+                fetched_data.pages, previous_url, next_url, None
             )
 
         return response_builder(dict(
@@ -122,9 +183,141 @@ def paginate_items(fetched_data, serialize=True):
             message="fetched successfully."
         ), 200)
 
+    return empty_page(serialize)
+
+
+def paginate_with_total(fetched_data, page, limit, count, total=None):
+    """Paginate like Query.paginate, with a known, cached or estimated total.
+
+    One row more than the page holds is fetched, so whether there is a
+    next page is known even when the total is off.
+    """
+    items = fetched_data.limit(limit + 1).offset((page - 1) * limit).all()
+    if total is None and count == 'estimate':
+        total = estimate_count(fetched_data)
+    elif total is None:
+        total = count_cache.count(fetched_data)
+
+    seen = (page - 1) * limit + len(items)
+    if len(items) > limit:
+        total = max(total, seen)
+    elif items:
+        total = seen
+    return Pagination(fetched_data, page, limit, total, items[:limit])
+
+
+def paginate_by_cursor(fetched_data, cursor, limit, serialize=True,
+                       fields=None):
+    """Paginate items by (created_at, uuid) from an opaque cursor.
+
+    Unlike page numbers, a cursor lets the database seek straight to the
+    page through an index, however deep it is, and no COUNT(*) is run.
+    An empty cursor starts from the first page; each page links to the
+    next one until the last page, which has no nextCursor.
+    """
+    model = fetched_data.column_descriptions[0]['type']
+    query = fetched_data.order_by(None).order_by(model.created_at,
+                                                 model.uuid)
+    if cursor:
+        try:
+            created_at, uuid = decode_cursor(cursor)
+        except ValueError:
+            return response_builder(dict(
+                status="fail",
+                message="Invalid cursor."
+            ), 400)
+        query = query.filter(
+            tuple_(model.created_at, model.uuid) >
+            tuple_(literal(created_at, model.created_at.type),
+                   literal(uuid, model.uuid.type)))
+
+    items = query.limit(limit + 1).all()
+    if not items:
+        return empty_page(serialize)
+
+    next_cursor = None
+    next_url = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1])
+        args = request.args.to_dict()
+        args.update(request.view_args, limit=limit, cursor=next_cursor)
+        next_url = url_for(request.endpoint, _external=True, **args)
+
+    if not serialize:
+        return PaginatedResult(items, None, None, None, None, next_url,
+                               next_cursor)
+
+    return response_builder(dict(
+        status="success",
+        data=serialize_items(items, fields),
+        nextCursor=next_cursor,
+        nextUrl=next_url,
+        message="fetched successfully."
+    ), 200)
+
+
+def encode_cursor(item):
+    """Encode the position of an item as an opaque cursor."""
+    position = [item.created_at.strftime(CURSOR_DATE_FORMAT), item.uuid]
+    return base64.urlsafe_b64encode(
+        json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into its created_at and uuid.
+
+    Raises:
+        ValueError: when the cursor was not made by encode_cursor
+    """
+    try:
+        created_at, uuid = json.loads(
+            base64.urlsafe_b64decode(cursor.encode()).decode())
+        return (datetime.datetime.strptime(created_at, CURSOR_DATE_FORMAT),
+                str(uuid))
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError('invalid cursor: {}'.format(cursor))
+
+
+def apply_fieldset(query):
+    """Load only the columns behind the keys asked for with `fields`.
+
+    Return:
+        tuple: the query, and the keys to serialize or None for all
+
+    Raises:
+        ValueError: when a requested key does not exist
+    """
+    fields = requested_fields()
+    if not fields:
+        return query, None
+
+    model = query.column_descriptions[0]['type']
+    if model is RedemptionRequest:
+        options, _ = schema_fieldset(redemption_schema, model, fields,
+                                     REDEMPTION_RELATIONS)
+    else:
+        options = model_fieldset(model, fields)
+    return query.options(*options), fields
+
+
+def serialize_items(items, fields=None):
+    """Serialize a page of items, keeping only `fields` if given."""
+    if items and isinstance(items[0], RedemptionRequest):
+        return serialize_redemptions(items, fields)
+
+    data_list = []
+    for _fetched_item in items:
+        data_item = _fetched_item.serialize(fields)
+        data_list.append(data_item)
+    return data_list
+
+
+def empty_page(serialize=True):
+    """Build the result for a page without items."""
     if not serialize:
         return PaginatedResult(
-            [], 0, None, 0, None, None
+            [], 0, None, 0, None, None, None
         )
 
     return response_builder(dict(
@@ -192,6 +385,78 @@ def find_item(data):
     ), 404)
 
 
+def stream_ndjson(query, schema, batch_size=1000):
+    """Stream the items of a query as newline delimited JSON.
+
+    Items are read from a server-side cursor `batch_size` rows at a time
+    and each batch is serialized and sent before the next one is read, so
+    memory use does not grow with the number of rows.
+
+    Args:
+        query (Query): the items to send
+        schema (Schema): a `many=True` schema to serialize them with
+    """
+    def generate():
+        batch = []
+        for item in query.yield_per(batch_size):
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield serialize_lines(batch)
+                batch = []
+        if batch:
+            yield serialize_lines(batch)
+
+    def serialize_lines(batch):
+        return ''.join(json.dumps(item) + '\n'
+                       for item in schema.dump(batch).data)
+
+    return Response(stream_with_context(generate()),
+                    mimetype='application/x-ndjson')
+
+
+def stream_csv(query, header, filename, batch_size=1000):
+    """Stream the rows of a query as a CSV attachment.
+
+    Rows are read from a server-side cursor and sent `batch_size` at a
+    time, so memory use does not grow with the number of rows.
+
+    Args:
+        query (Query): a query for plain column values
+        header (list): the column titles
+        filename (str): name the download is saved as
+    """
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for number, row in enumerate(query.yield_per(batch_size), 1):
+            writer.writerow([csv_safe(value) for value in row])
+            if number % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    response = Response(stream_with_context(generate()), mimetype='text/csv')
+    response.headers['Content-Disposition'] = \
+        'attachment; filename={}'.format(filename)
+    return response
+
+
+def csv_safe(value):
+    """Keep spreadsheets from running user input as a formula."""
+    if isinstance(value, str) and value.startswith(('=', '+', '-', '@')):
+        return "'" + value
+    return value
+
+
+def wants_ndjson():
+    """Check whether the client asked for newline delimited JSON."""
+    return request.accept_mimetypes.best_match(
+        ['application/json', 'application/x-ndjson']
+    ) == 'application/x-ndjson'
+
+
 def response_builder(data, status_code=200):
     """Build the jsonified response to return."""
     response = jsonify(data)
@@ -213,51 +478,107 @@ def add_extra_user_info(
 
     """
     cohort = location = None
-    Bearer = 'Bearer '
-    headers = {'Authorization': Bearer + token}
 
-    try:
-        api_response = requests.get(url + f"users/{user_id}", headers=headers)
-    except requests.exceptions.ConnectionError:
-        response = Response()
-        response.status_code = 503
-        response.json = lambda: {"Error": "Network Error."}
-        return cohort, location, response
-    except Exception:
-        response = Response()
-        response.status_code = 500
-        response.json = lambda: {"Error": "Something went wrong."}
-        return cohort, location, response
-
-    if api_response.status_code == 200 and api_response.json().get('cohort'):
-        cohort = Cohort.query.filter_by(
-            uuid=api_response.json().get('cohort').get('id')).first()
+    api_response = andela_api.get_user(url, token, user_id)
+    user_info = api_response.json()
+
+    if api_response.status_code == 200 and user_info.get('cohort'):
+        cohort_info = user_info.get('cohort')
+        cohort = Cohort.query.get(cohort_info.get('id'))
         if not cohort:
-            cohort = Cohort(uuid=api_response.json().get('cohort').get('id'),
-                            name=api_response.json().get('cohort').get('name'))
+            cohort = Cohort(uuid=cohort_info.get('id'),
+                            name=cohort_info.get('name'))
 
-        location = Center.query.filter_by(
-            uuid=api_response.json().get('location').get('id')).first()
+        location_id = user_info.get('location').get('id')
+        location = Center.query.get(location_id)
         if not location:
-            location = Center(
-                uuid=api_response.json().get('location').get('id'))
+            location = Center(uuid=location_id)
     return cohort, location, api_response
 
 
-def serialize_redmp(redemption):
-    """To serialize and package redeptions."""
-    serial_data, _ = redemption_schema.dump(redemption)
-    seriallized_user, _ = basic_info_schema.dump(redemption.user)
-    serilaized_society, _ = basic_info_schema.dump(
-        Society.query.get(redemption.user.society_id))
-    serial_data["user"] = seriallized_user
-    serial_data["society"] = serilaized_society
-    serial_data["center"], _ = basic_info_schema.dump(redemption.center)
+def serialize_redmp(redemption, fields=None):
+    """To serialize and package redeptions.
+
+    Args:
+        redemption (RedemptionRequest): the redemption to serialize
+        fields (frozenset): keys to keep, defaults to all
+    """
+    _, schema = schema_fieldset(redemption_schema, RedemptionRequest,
+                                fields, REDEMPTION_RELATIONS)
+    serial_data = schema.dump(redemption).data if schema else {}
+    if not fields or "user" in fields:
+        serial_data["user"], _ = basic_info_schema.dump(redemption.user)
+    if not fields or "society" in fields:
+        serial_data["society"], _ = basic_info_schema.dump(
+            Society.query.get(redemption.user.society_id))
+    if not fields or "center" in fields:
+        serial_data["center"], _ = basic_info_schema.dump(redemption.center)
     return serial_data
 
 
+def serialize_redemptions(redemptions, fields=None):
+    """Serialize a page of redemptions the way serialize_redmp does.
+
+    The users, their societies and the centers of the whole page are
+    loaded with one query each, instead of a few queries per redemption.
+
+    Args:
+        redemptions (list): the RedemptionRequest objects of the page
+        fields (frozenset): keys to keep, defaults to all
+    """
+    _, schema = schema_fieldset(redemption_schema, RedemptionRequest,
+                                fields, REDEMPTION_RELATIONS)
+    if schema:
+        data_list = schema.dump(redemptions, many=True).data
+    else:
+        data_list = [{} for _ in redemptions]
+
+    def wanted(key):
+        return not fields or key in fields
+
+    users = serialized_users = societies = centers = {}
+    if wanted("user") or wanted("society"):
+        users = load_by_uuid(User, {redemption.user_id
+                                    for redemption in redemptions})
+    if wanted("user"):
+        serialized_users = dump_by_uuid(users)
+    if wanted("society"):
+        societies = dump_by_uuid(load_by_uuid(
+            Society, {user.society_id for user in users.values()}))
+    if wanted("center"):
+        centers = dump_by_uuid(load_by_uuid(
+            Center, {redemption.center_id for redemption in redemptions}))
+
+    for serial_data, redemption in zip(data_list, redemptions):
+        if wanted("user"):
+            serial_data["user"] = serialized_users[redemption.user_id]
+        if wanted("society"):
+            serial_data["society"] = societies.get(
+                users[redemption.user_id].society_id, {})
+        if wanted("center"):
+            serial_data["center"] = centers[redemption.center_id]
+    return data_list
+
+
+def load_by_uuid(model, uuids):
+    """Load the rows with the given uuids in one query, by uuid."""
+    uuids.discard(None)
+    if not uuids:
+        return {}
+    return {row.uuid: row
+            for row in model.query.filter(model.uuid.in_(uuids))}
+
+
+def dump_by_uuid(rows):
+    """Serialize rows with basic_info_schema, by uuid."""
+    uuids = list(rows)
+    return dict(zip(uuids, basic_info_schema.dump(
+        [rows[uuid] for uuid in uuids], many=True).data))
+
+
 def get_redemption_request(redeem_id):
-    if "society president" in [role.name for role in g.current_user.roles]:
+    if role_registry.uuids_for(["society president"]) & \
+            current_user_role_ids():
         redemp_request = g.current_user.society.redemptions.filter_by(
             uuid=redeem_id).one_or_none()
     else:
@@ -5,9 +5,9 @@ This contains the sample initial data required for the test run of the system.
 import datetime
 import os
 import base64
-import requests
 from jose import ExpiredSignatureError, JWTError
 
+from api.utils.andela_api import andela_api
 from api.utils.auth import verify_token
 from api.models import (ActivityType, Activity, Center, LoggedActivity,
                         Society, User, Cohort, Role)
@@ -61,13 +61,10 @@ def get_andela_api_cohort_location_data():
             print('\n\n Getting Data from API : ',
                   payload.get('UserInfo').get('first_name'))
 
-            Bearer = 'Bearer '
-            headers = {'Authorization': Bearer + authorization_token}
-
-            cohort_data_response = requests.get(url + 'cohorts',
-                                                headers=headers).json()
-            location_data_response = requests.get(url + 'locations',
-                                                  headers=headers).json()
+            cohort_data_response = andela_api.get_cohorts(
+                url, authorization_token).json()
+            location_data_response = andela_api.get_locations(
+                url, authorization_token).json()
             # test centers
             locations = {}
 
@@ -231,7 +228,7 @@ def test_dev_activities_seed_data(args):
         reviewer_id=president.uuid,
         activity_date=python_hackathon.activity_date
     )
-    phoenix._total_points = hackathon_points.value
+    phoenix.total_points = hackathon_points
     interview_points = LoggedActivity(
         value=interview.value * 5,
         activity=interview_2017,
@@ -1,13 +1,15 @@
 """Validation schemas."""
 from datetime import date
 
-from marshmallow import (Schema, ValidationError, fields, post_load, validate,
-                         validates, validates_schema)
+from marshmallow import (ValidationError, fields, post_dump, post_load,
+                         validate, validates, validates_schema)
 
-from api.models import Activity, ActivityType, Role, User
+from api.models import Activity, Role, User, db
+from api.utils.activity_catalog import activity_type_catalog
+from api.utils.fast_dump import CompiledSchema
 
 
-class BaseSchema(Schema):
+class BaseSchema(CompiledSchema):
     """Creates a base validation schema."""
 
     uuid = fields.String(dump_only=True, dump_to='id',
@@ -67,10 +69,7 @@ class ActivityTypesSchema(BaseSchema):
     @post_load
     def verify_activity_type(self, data):
         """Extra validation of activity type."""
-        existing_activity_type_name = ActivityType.query.filter(
-            ActivityType.name.ilike(data['name'])).first()
-
-        if existing_activity_type_name:
+        if activity_type_catalog.find(data['name']):
             self.context = {'status_code': 409}
             raise ValidationError({'message':
                                    'Activity Type (name) already exists!'})
@@ -96,28 +95,38 @@ class LoggedActivitySchema(BaseSchema):
                                         dump_to='noOfParticipants')
     society_id = fields.String(dump_to='societyId', load_from='societyId')
     society = fields.String(attribute='society.name')
-    approved_by = fields.Method(
-        'get_approver', dump_to='approvedBy', load_from='approvedBy'
+    # dumped as user ids, which resolve_user_names replaces with names
+    approved_by = fields.String(
+        attribute='approver_id', dump_only=True, dump_to='approvedBy',
+        load_from='approvedBy', columns=('approver_id',)
     )
-    reviewed_by = fields.Method(
-        'get_reviewer', dump_to='reviewedBy', load_from='reviewedBy'
+    reviewed_by = fields.String(
+        attribute='reviewer_id', dump_only=True, dump_to='reviewedBy',
+        load_from='reviewedBy', columns=('reviewer_id',)
     )
 
-    @staticmethod
-    def get_approver(obj):
-        """Get approver name."""
-        if obj.approver_id:
-            approver = User.query.get(obj.approver_id)
-            return approver.name
-        return
-
-    @staticmethod
-    def get_reviewer(obj):
-        """Get reviewer name."""
-        if obj.reviewer_id:
-            reviewer = User.query.get(obj.reviewer_id)
-            return reviewer.name
-        return
+    @post_dump(pass_many=True)
+    def resolve_user_names(self, data, many):
+        """Look the approver and reviewer names of all items up at once.
+
+        A page costs one query instead of up to two per item. The names
+        stay local to the dump, since schema instances are shared by
+        concurrent requests.
+        """
+        items = data if many else [data]
+        keys = ('approvedBy', 'reviewedBy')
+        user_ids = {item.get(key) for item in items for key in keys}
+        user_ids.discard(None)
+
+        user_names = {}
+        if user_ids:
+            user_names = dict(db.session.query(User.uuid, User.name).filter(
+                User.uuid.in_(user_ids)))
+        for item in items:
+            for key in keys:
+                if item.get(key):
+                    item[key] = user_names.get(item[key])
+        return data
 
 
 class LoggedActivitiesSchema(LoggedActivitySchema):
@@ -154,7 +163,7 @@ class ActivitySchema(BaseSchema):
     def verify_activity(self, data):
         """Extra validation for the Activity Schema."""
         invalid_activity_names = ['Blog', 'App', 'Open Source']
-        activity_type = ActivityType.query.get(data['activity_type_id'])
+        activity_type = activity_type_catalog.get(data['activity_type_id'])
         existing_activity = Activity.query.filter(
             Activity.name.ilike(data['name'])).first()
 
@@ -218,9 +227,8 @@ class LogEditActivitySchema(BaseSchema):
         # bootcamps, tech events etc is made a requirement, it should
         # be removed so that only supported activity types are logged
         # via activity_type_id
-        multi_participant_activities = [x.uuid for x in ActivityType.query.filter_by(
-            supports_multiple_participants=True).all()]
-        if data.get('activity_type_id') in multi_participant_activities \
+        activity_type = activity_type_catalog.get(data.get('activity_type_id'))
+        if activity_type and activity_type.supports_multiple_participants \
                 and not data.get('no_of_participants'):
             raise ValidationError(
                 'Please send all required fields for this activity'
@@ -0,0 +1,32 @@
+"""Helpers for the alembic migrations.
+
+The alembic this project pins predates `autocommit_block`, which newer
+releases offer for statements Postgres refuses to run in a transaction
+block, like CREATE INDEX CONCURRENTLY. `autocommit_block` here does the
+same for the single transaction env.py runs the migrations in.
+"""
+from contextlib import contextmanager
+
+from alembic import op
+
+
+@contextmanager
+def autocommit_block():
+    """Run the statements of the block outside of the migration transaction.
+
+    The migration transaction is committed before the block and a new one
+    is started after it, so the migrations that come next still run, and
+    are stamped, in a transaction. The connection must not be left with
+    open cursors or uncommitted state the block depends on.
+
+    Other databases than Postgres run the block in the transaction.
+    """
+    if op.get_context().dialect.name != 'postgresql':
+        yield
+        return
+
+    op.execute('COMMIT')
+    try:
+        yield
+    finally:
+        op.execute('BEGIN')
@@ -15,7 +15,9 @@ flask_app = create_celery_flask()
 celery = Celery(
     "notifications",
     broker=os.environ.get("CELERY_BROKER_URL", None),
-    backend=os.environ.get("CELERY_BACKEND", None)
+    backend=os.environ.get("CELERY_BACKEND", None),
+    include=["api.utils.approvals", "api.utils.provisioning",
+             "api.utils.snapshots"]
 )
 
 celery.conf.beat_schedule = {
@@ -25,6 +27,10 @@ celery.conf.beat_schedule = {
             hour=9, minute=0,  # timezone is UTC by default
             day_of_week=flask_app.config['SUCCESS_OPS_NEWSLETTER_DAY']
         )
+    },
+    'snapshot-points': {
+        'task': 'api.utils.snapshots.snapshot_points',
+        'schedule': crontab(minute=0)
     }
 }
 
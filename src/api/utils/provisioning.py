@@ -0,0 +1,64 @@
+"""Background provisioning of new users.
+
+With ASYNC_USER_PROVISIONING enabled, a user's first request only stores
+what the JWT already tells us. Their cohort and center are fetched from
+the ANDELA API by the task below, outside of the request. The task
+authenticates with the ANDELA_API_TOKEN service credential: task
+arguments and results sit in the broker and result backend, where a
+user's bearer token must not end up.
+"""
+from celery.utils.log import get_task_logger
+from sqlalchemy.exc import SQLAlchemyError
+
+from api.models import User, db
+from api.utils.helpers import add_extra_user_info
+from api.utils.notifications.email_notices import celery, flask_app
+
+logger = get_task_logger(__name__)
+
+
+@celery.task(bind=True, max_retries=5, default_retry_delay=30,
+             ignore_result=True)
+def enrich_user_details(self, user_id, app=flask_app):
+    """Link a user to their cohort, center and society.
+
+    The task is safe to run more than once: users that already have a
+    cohort and center are skipped, and existing cohorts and centers are
+    reused. Network errors and write conflicts are retried. Without a
+    service token the task gives up before calling the API, so that a
+    missing setting isn't counted against the API's circuit breaker.
+    """
+    token = app.config.get('ANDELA_API_TOKEN')
+    if not token:
+        logger.error('ANDELA_API_TOKEN is not set, not enriching user %s',
+                     user_id)
+        return False
+
+    with app.app_context():
+        user = User.query.get(user_id)
+        if not user or (user.cohort_id and user.center_id):
+            return False
+
+        cohort, location, api_response = add_extra_user_info(
+            token, user_id, url=app.config['ANDELA_API_URL'])
+
+        if api_response is None or api_response.status_code >= 500:
+            raise self.retry()
+
+        if location:
+            user.center = location
+        if cohort:
+            if not cohort.center_id and location:
+                cohort.center = location
+            user.cohort = cohort
+            if not user.society_id:
+                user.society = cohort.society
+
+        try:
+            db.session.add(user)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            # most likely a concurrent task created the same cohort or center
+            db.session.rollback()
+            raise self.retry(exc=e)
+        return True
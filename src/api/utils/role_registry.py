@@ -0,0 +1,65 @@
+"""In-process registry of role names.
+
+`roles_required` used to look every route role up by name on each
+protected request. The registry maps role names to uuids once per process
+and is dropped whenever a Role row is inserted, updated or deleted in this
+process. Other worker processes pick up changes once their copy is older
+than `ttl` seconds.
+"""
+import threading
+import time
+
+from flask import g
+from sqlalchemy import event
+
+from api.models import Role, db
+
+
+class RoleRegistry(object):
+    """Map role names to role uuids."""
+
+    def __init__(self, ttl=60):
+        """Create an empty registry that is reloaded after `ttl` seconds."""
+        self.ttl = ttl
+        self._uuids = None
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, *args):
+        """Drop the registry so it is reloaded on next use."""
+        self._uuids = None
+
+    def uuids_for(self, names):
+        """Return the set of role uuids for the given role names."""
+        uuids = self._load()
+        return {uuids[name] for name in names if name in uuids}
+
+    def _load(self):
+        uuids = self._uuids
+        if uuids is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return uuids
+
+        with self._lock:
+            uuids = {}
+            # keep the first role per name, as filter_by(name=...).first()
+            # used to
+            for uuid, name in db.session.query(Role.uuid, Role.name):
+                uuids.setdefault(name, uuid)
+            self._uuids = uuids
+            self._loaded_at = time.monotonic()
+        return uuids
+
+
+role_registry = RoleRegistry()
+
+for _event in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Role, _event, role_registry.invalidate)
+
+
+def current_user_role_ids():
+    """Return the uuids of the current user's roles, loaded once a request."""
+    role_ids = getattr(g, 'current_user_role_ids', None)
+    if role_ids is None:
+        role_ids = {role.uuid for role in g.current_user.role_set}
+        g.current_user_role_ids = role_ids
+    return role_ids
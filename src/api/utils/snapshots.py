@@ -0,0 +1,20 @@
+"""Periodic snapshots of society points.
+
+`LedgerEntry.balance` starts from a society's latest snapshot and sums up
+the entries added after it, so snapshots are taken every hour to keep
+that tail short.
+"""
+from api.models import PointsSnapshot, Society, db
+from api.utils.notifications.email_notices import celery, flask_app
+
+
+@celery.task
+def snapshot_points(app=flask_app):
+    """Snapshot the points of every society with new ledger entries."""
+    with app.app_context():
+        taken = 0
+        for (society_id,) in db.session.query(Society.uuid):
+            if PointsSnapshot.take(society_id):
+                taken += 1
+        db.session.commit()
+        return taken
@@ -7,19 +7,24 @@ from flask_restful import Api
 from api.endpoints.activity_types import ActivityTypesAPI
 from api.endpoints.activities import ActivitiesAPI
 from api.endpoints.societies import SocietyResource, AddCohort
+from api.endpoints.societies import SocietyLoggedActivitiesAPI
 from api.endpoints.redemption_requests import PointRedemptionAPI
 from api.endpoints.redemption_requests import RedemptionRequestNumeration
 from api.endpoints.redemption_requests import RedemptionRequestFunds
+from api.endpoints.redemption_requests import RedemptionRequestExportAPI
 from api.endpoints.users import UserAPI
 from api.endpoints.logged_activities import (UserLoggedActivitiesAPI,
                                              SecretaryReviewLoggedActivityAPI)
 from api.endpoints.logged_activities import LoggedActivitiesAPI
+from api.endpoints.logged_activities import LoggedActivitiesBulkAPI
+from api.endpoints.logged_activities import LoggedActivitiesExportAPI
 from api.endpoints.logged_activities import LoggedActivityAPI
 from api.endpoints.logged_activities import (LoggedActivityApprovalAPI,
                                              LoggedActivityRejectionAPI,
                                              LoggedActivityInfoAPI)
 from api.endpoints.roles import RoleAPI, SocietyRoleAPI
 from api.models import db
+from api.utils.auth import verified_tokens
 
 
 try:
@@ -40,6 +45,7 @@ def create_app(environment="Production"):
     app = Flask(__name__)
     app.config.from_object(configuration[environment])
     db.init_app(app)
+    verified_tokens.maxsize = app.config['TOKEN_CACHE_SIZE']
 
     api = Api(app=app)
 
@@ -71,6 +77,15 @@ def create_app(environment="Production"):
         '/api/v1/logged-activities', '/api/v1/logged-activities/',
         endpoint='logged_activities'
     )
+    api.add_resource(
+        LoggedActivitiesBulkAPI,
+        '/api/v1/logged-activities/bulk', '/api/v1/logged-activities/bulk/',
+        endpoint='bulk_logged_activities'
+    )
+    api.add_resource(
+        LoggedActivitiesExportAPI, '/api/v1/logged-activities/export.csv',
+        endpoint='logged_activities_export'
+    )
     api.add_resource(
         LoggedActivityAPI,
         '/api/v1/logged-activities/<string:logged_activity_id>',
@@ -90,6 +105,8 @@ def create_app(environment="Production"):
         SecretaryReviewLoggedActivityAPI,
         '/api/v1/logged-activities/review/<string:logged_activity_id>',
         '/api/v1/logged-activities/review/<string:logged_activity_id>/',
+        '/api/v1/logged-activities/review',
+        '/api/v1/logged-activities/review/',
         endpoint='secretary_logged_activity'
     )
 
@@ -114,6 +131,8 @@ def create_app(environment="Production"):
         LoggedActivityRejectionAPI,
         "/api/v1/logged-activity/reject/<string:logged_activity_id>",
         "/api/v1/logged-activity/reject/<string:logged_activity_id>/",
+        "/api/v1/logged-activities/reject",
+        "/api/v1/logged-activities/reject/",
         endpoint="reject_logged_activity"
     )
 
@@ -135,6 +154,12 @@ def create_app(environment="Production"):
 
         endpoint="society"
     )
+    api.add_resource(
+        SocietyLoggedActivitiesAPI,
+        "/api/v1/societies/<string:society_id>/logged-activities",
+        "/api/v1/societies/<string:society_id>/logged-activities/",
+        endpoint="society_logged_activities"
+    )
 
     # redemption endpoints
     api.add_resource(
@@ -143,6 +168,11 @@ def create_app(environment="Production"):
         endpoint="point_redemption"
     )
 
+    api.add_resource(
+        RedemptionRequestExportAPI, "/api/v1/societies/redeem/export.csv",
+        endpoint="redemption_requests_export"
+    )
+
     api.add_resource(
         PointRedemptionAPI, "/api/v1/societies/redeem/<string:redeem_id>",
         "/api/v1/societies/redeem/<string:redeem_id>/",
@@ -0,0 +1,5 @@
+"""Micro-benchmarks for hot request paths.
+
+Run a benchmark from the src directory, e.g.
+python -m benchmarks.bench_token_verification
+"""
@@ -0,0 +1,34 @@
+"""Compare ANDELA API lookups with and without pooling and caching."""
+import timeit
+
+import requests
+
+from api.utils.andela_api import AndelaAPIClient
+from tests.andela_api_stub import AndelaAPIStub
+
+ROUNDS = 200
+USER = {'id': '-Kbench_user', 'cohort': {'id': '-Kcohort', 'name': 'c-1'},
+        'location': {'id': '-Klocation'}}
+
+
+def main():
+    """Time user lookups against a local fake ANDELA API."""
+    with AndelaAPIStub({'users/-Kbench_user': (200, USER)}) as stub:
+        url = stub.url + 'users/-Kbench_user'
+        headers = {'Authorization': 'Bearer token'}
+        pooled = AndelaAPIClient(cache_ttl=0)
+        cached = AndelaAPIClient()
+
+        timings = [
+            ('new connection', lambda: requests.get(
+                url, headers=headers).json()),
+            ('pooled', lambda: pooled.get(url, 'token')),
+            ('pooled + cached', lambda: cached.get(url, 'token')),
+        ]
+        for name, lookup in timings:
+            seconds = timeit.timeit(lookup, number=ROUNDS)
+            print(f"{name:>16}: {seconds / ROUNDS * 1e3:7.3f} ms/lookup")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Compare marshmallow's dump with the generated dump functions.
+
+Set BENCH_DATABASE to run against another database than in-memory
+SQLite.
+"""
+import datetime
+import os
+import timeit
+
+from flask import Flask
+from marshmallow import Schema
+
+from api.models import (Activity, ActivityType, Center, LoggedActivity,
+                        RedemptionRequest, Society, User, db)
+from api.utils.eager_loading import eager_loads
+from api.utils.marshmallow_schemas import (basic_info_schema,
+                                           logged_activities_schema,
+                                           redemption_schema,
+                                           user_logged_activities_schema)
+
+ROWS = 5000
+USERS = 50
+ROUNDS = 3
+
+
+def seed():
+    """Insert ROWS logged activities and redemptions by a few users."""
+    db.drop_all()
+    db.create_all()
+    now = datetime.datetime.utcnow()
+    db.session.add_all(
+        [Center(uuid='-Kcenter', name='Nairobi')] +
+        [Society(uuid=f'-Ksociety{number}', name=f'Society {number}')
+         for number in range(4)] +
+        [User(uuid=f'-Kuser{number}', name=f'User {number}',
+              email=f'user{number}@andela.com',
+              photo=f'https://photos.andela.com/{number}.png',
+              society_id=f'-Ksociety{number % 4}')
+         for number in range(USERS)] +
+        [ActivityType(uuid='-Ktype', name='Hackathon', value=100,
+                      description='A hackathon'),
+         Activity(uuid='-Kactivity', name='Alibaba AI Challenge',
+                  activity_type_id='-Ktype', activity_date=now.date(),
+                  added_by_id='-Kuser0')])
+    db.session.commit()
+    db.session.execute(LoggedActivity.__table__.insert(), [
+        dict(uuid=f'{number:08d}', name=f'logged activity {number}',
+             description='Participated in this event', value=100,
+             status=('pending', 'approved')[number % 2], redeemed=False,
+             created_at=now, activity_date=now.date(),
+             user_id=f'-Kuser{number % USERS}',
+             society_id=f'-Ksociety{number % USERS % 4}',
+             activity_id='-Kactivity', activity_type_id='-Ktype',
+             approver_id='-Kuser0' if number % 2 else None)
+        for number in range(ROWS)
+    ])
+    db.session.execute(RedemptionRequest.__table__.insert(), [
+        dict(uuid=f'{number:08d}', name=f'request {number}', value=10,
+             status='pending', created_at=now, center_id='-Kcenter',
+             user_id=f'-Kuser{number % USERS}',
+             society_id=f'-Ksociety{number % USERS % 4}')
+        for number in range(ROWS)
+    ])
+    db.session.commit()
+
+
+def main():
+    """Time both dumps of each hot schema."""
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=os.getenv('BENCH_DATABASE', 'sqlite://'),
+        SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+
+    with app.app_context():
+        seed()
+        logged_activities = LoggedActivity.query.options(
+            *eager_loads(logged_activities_schema, LoggedActivity)).all()
+        redemptions = RedemptionRequest.query.all()
+        users = User.query.all() * (ROWS // USERS)
+
+        for name, schema, rows in [
+                ('LoggedActivitiesSchema', logged_activities_schema,
+                 logged_activities),
+                ('LoggedActivitySchema', user_logged_activities_schema,
+                 logged_activities),
+                ('RedemptionSchema', redemption_schema, redemptions),
+                ('BaseSchema', basic_info_schema, users)]:
+            assert schema.dump(rows, many=True).data == \
+                Schema.dump(schema, rows, many=True).data
+            for dump_name, dump in [('marshmallow', Schema.dump),
+                                    ('generated', type(schema).dump)]:
+                seconds = timeit.timeit(
+                    lambda: dump(schema, rows, many=True), number=ROUNDS)
+                print(f"{name:>22}, {dump_name:>11}: "
+                      f"{len(rows) * ROUNDS / seconds:10.0f} rows/s")
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
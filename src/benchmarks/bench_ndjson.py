@@ -0,0 +1,108 @@
+"""Compare peak memory of the JSON and NDJSON logged activity listings.
+
+Set BENCH_DATABASE to run against another database than a temporary
+SQLite file, and BENCH_ROWS to a comma separated list of table sizes.
+"""
+import datetime
+import os
+import tempfile
+import tracemalloc
+
+from flask import Flask
+from sqlalchemy.orm import joinedload
+
+from api.models import (ActivityType, Center, LoggedActivity, Society, User,
+                        db)
+from api.utils.helpers import response_builder, stream_ndjson
+from api.utils.marshmallow_schemas import logged_activities_schema
+
+SIZES = [int(rows) for rows in
+         os.getenv('BENCH_ROWS', '10000,50000').split(',')]
+CHUNK = 10000
+
+
+def create_bench_app(database):
+    """Create an app serving logged activities both ways."""
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=database,
+                      SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+
+    @app.route('/json')
+    def as_json():
+        # what LoggedActivitiesAPI.get does with paginate=false
+        logged_activities = LoggedActivity.query.all()
+        count = LoggedActivity.query.count()
+        return response_builder(dict(data=dict(
+            count=count,
+            loggedActivities=logged_activities_schema.dump(
+                logged_activities).data)))
+
+    @app.route('/ndjson')
+    def as_ndjson():
+        return stream_ndjson(
+            LoggedActivity.query.options(
+                joinedload('user'), joinedload('activity'),
+                joinedload('activity_type'), joinedload('society')
+            ).order_by(LoggedActivity.created_at, LoggedActivity.uuid),
+            logged_activities_schema)
+
+    return app
+
+
+def seed(rows):
+    """Insert `rows` logged activities."""
+    db.drop_all()
+    db.create_all()
+    db.session.add_all([
+        Center(uuid='-Kcenter', name='Nairobi'),
+        Society(uuid='-Ksociety', name='Phoenix'),
+        ActivityType(uuid='-Ktype', name='Hackathon', value=1),
+        User(uuid='-Kuser', name='Bench User', email='bench@andela.com',
+             center_id='-Kcenter', society_id='-Ksociety'),
+    ])
+    db.session.commit()
+
+    now = datetime.datetime.utcnow()
+    for offset in range(0, rows, CHUNK):
+        db.session.execute(LoggedActivity.__table__.insert(), [
+            dict(uuid=f'{number:08d}', name=f'logged activity {number}',
+                 description='Participated in this event', value=1,
+                 status='approved', redeemed=False, user_id='-Kuser',
+                 society_id='-Ksociety', activity_type_id='-Ktype',
+                 created_at=now)
+            for number in range(offset, min(offset + CHUNK, rows))
+        ])
+        db.session.commit()
+
+
+def peak_memory(client, url):
+    """Return the peak traced memory, in MB, of reading `url`."""
+    tracemalloc.start()
+    response = client.get(url, buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    response.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20, size
+
+
+def main():
+    """Measure both listings at each table size."""
+    with tempfile.NamedTemporaryFile(suffix='.sqlite') as database:
+        app = create_bench_app(os.getenv('BENCH_DATABASE',
+                                         'sqlite:///' + database.name))
+        with app.app_context():
+            client = app.test_client()
+            for rows in SIZES:
+                seed(rows)
+                for url in ('/json', '/ndjson'):
+                    peak, size = peak_memory(client, url)
+                    db.session.remove()
+                    print(f"{rows:>8} rows, {url:>7}: {peak:8.1f} MB peak, "
+                          f"{size / 2 ** 20:6.1f} MB sent")
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Compare page number and cursor pagination of logged activities.
+
+Set BENCH_DATABASE to run against another database than in-memory
+SQLite, and BENCH_ROWS to a comma separated list of table sizes.
+"""
+import datetime
+import os
+import timeit
+
+from flask import Flask
+
+from api.models import (ActivityType, Center, LoggedActivity, Society, User,
+                        db)
+from api.utils.helpers import encode_cursor, paginate_items
+
+SIZES = [int(rows) for rows in
+         os.getenv('BENCH_ROWS', '100000,1000000').split(',')]
+CHUNK = 10000
+LIMIT = 10
+ROUNDS = 20
+
+
+def create_bench_app():
+    """Create an app with a single paginated endpoint."""
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=os.getenv('BENCH_DATABASE', 'sqlite://'),
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        DEFAULT_PAGE=1, PAGE_LIMIT=LIMIT, SERVER_NAME='bench')
+    db.init_app(app)
+
+    @app.route('/logged-activities')
+    def logged_activities():
+        result = paginate_items(LoggedActivity.query, serialize=False)
+        return str(len(result.data))
+
+    return app
+
+
+def seed(rows):
+    """Insert `rows` logged activities, created a second apart."""
+    db.drop_all()
+    db.create_all()
+    db.session.add_all([
+        Center(uuid='-Kcenter', name='Nairobi'),
+        Society(uuid='-Ksociety', name='Phoenix'),
+        ActivityType(uuid='-Ktype', name='Hackathon', value=1),
+        User(uuid='-Kuser', name='Bench User', email='bench@andela.com',
+             center_id='-Kcenter', society_id='-Ksociety'),
+    ])
+    db.session.commit()
+
+    start = datetime.datetime(2018, 1, 1)
+    for offset in range(0, rows, CHUNK):
+        db.session.execute(LoggedActivity.__table__.insert(), [
+            dict(uuid=f'{number:08d}', value=1, status='approved',
+                 redeemed=False, user_id='-Kuser', society_id='-Ksociety',
+                 activity_type_id='-Ktype',
+                 created_at=start + datetime.timedelta(seconds=number))
+            for number in range(offset, min(offset + CHUNK, rows))
+        ])
+        db.session.commit()
+
+
+def main():
+    """Time the first, middle and last page both ways."""
+    app = create_bench_app()
+    with app.app_context():
+        client = app.test_client()
+        for rows in SIZES:
+            print(f"seeding {rows} logged activities...")
+            seed(rows)
+            ordered = LoggedActivity.query.order_by(LoggedActivity.created_at,
+                                                    LoggedActivity.uuid)
+            for name, position in [('first', 0), ('middle', rows // 2),
+                                   ('last', rows - LIMIT)]:
+                page = position // LIMIT + 1
+                cursor = ''
+                if position:
+                    cursor = encode_cursor(ordered.offset(position - 1).first())
+                db.session.rollback()
+
+                for mode, url in [
+                        ('page', f'/logged-activities?page={page}'),
+                        ('cursor', f'/logged-activities?cursor={cursor}')]:
+                    seconds = timeit.timeit(lambda: client.get(url),
+                                            number=ROUNDS)
+                    print(f"{rows:>8} rows, {name:>6} page, {mode:>6}: "
+                          f"{seconds / ROUNDS * 1e3:8.2f} ms/page")
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Compare ledger balances with recomputing them from every activity.
+
+Set BENCH_DATABASE to run against another database than in-memory
+SQLite, and BENCH_ROWS to change the number of approved activities.
+"""
+import datetime
+import os
+import timeit
+
+from flask import Flask
+from sqlalchemy import func
+
+from api.models import (ActivityType, Center, LedgerEntry, LoggedActivity,
+                        PointsSnapshot, RedemptionRequest, Society, User, db)
+
+ROWS = int(os.getenv('BENCH_ROWS', 1000000))
+# entries between two snapshots, roughly an hour of approvals
+SNAPSHOT_EVERY = 10000
+CHUNK = 10000
+ROUNDS = 20
+
+
+def recompute(society_id):
+    """Sum up a society's points from its activities and redemptions."""
+    total_points = db.session.query(
+        func.coalesce(func.sum(LoggedActivity.value), 0)
+    ).filter(LoggedActivity.society_id == society_id,
+             LoggedActivity.status == 'approved').scalar()
+    used_points = db.session.query(
+        func.coalesce(func.sum(RedemptionRequest.value), 0)
+    ).filter(RedemptionRequest.society_id == society_id,
+             RedemptionRequest.status == 'approved').scalar()
+    return total_points, used_points
+
+
+def seed(society_id):
+    """Insert ROWS approved activities with their ledger entries."""
+    start = datetime.datetime.utcnow() - datetime.timedelta(
+        hours=ROWS // SNAPSHOT_EVERY + 1)
+    db.session.add_all([
+        Center(uuid='-Kcenter', name='Nairobi'),
+        Society(uuid=society_id, name='Phoenix'),
+        ActivityType(uuid='-Ktype', name='Hackathon', value=1),
+        User(uuid='-Kuser', name='Bench User', email='bench@andela.com',
+             center_id='-Kcenter', society_id=society_id),
+    ])
+    db.session.commit()
+
+    for offset in range(0, ROWS, CHUNK):
+        activities, entries = [], []
+        for number in range(offset, min(offset + CHUNK, ROWS)):
+            created_at = start + datetime.timedelta(
+                seconds=3600 * number / SNAPSHOT_EVERY)
+            activities.append(dict(
+                uuid=str(number), value=number % 7 + 1, status='approved',
+                redeemed=False, user_id='-Kuser', society_id=society_id,
+                activity_type_id='-Ktype', created_at=created_at))
+            entries.append(dict(
+                society_id=society_id, kind='approval', source_id=str(number),
+                total_points=number % 7 + 1, used_points=0,
+                created_at=created_at))
+        db.session.execute(LoggedActivity.__table__.insert(), activities)
+        db.session.execute(LedgerEntry.__table__.insert(), entries)
+        db.session.commit()
+
+        if offset + CHUNK < ROWS:
+            snapshot_time = activities[-1]['created_at'] + \
+                PointsSnapshot.SETTLE_TIME + datetime.timedelta(seconds=1)
+            PointsSnapshot.take(society_id, now=snapshot_time)
+            db.session.commit()
+    return start
+
+
+def main():
+    """Time current and historical balances both ways."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('BENCH_DATABASE',
+                                                      'sqlite://')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        society_id = '-Ksociety'
+        print(f"seeding {ROWS} approved activities...")
+        start = seed(society_id)
+        middle = start + datetime.timedelta(hours=ROWS / SNAPSHOT_EVERY / 2)
+        assert recompute(society_id) == LedgerEntry.balance(society_id)
+
+        timings = [
+            ('full recompute', lambda: recompute(society_id)),
+            ('ledger', lambda: LedgerEntry.balance(society_id)),
+            ('ledger, halfway', lambda: LedgerEntry.balance(society_id,
+                                                            middle)),
+        ]
+        for name, balance in timings:
+            seconds = timeit.timeit(balance, number=ROUNDS)
+            print(f"{name:>16}: {seconds / ROUNDS * 1e3:9.3f} ms/balance")
+
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
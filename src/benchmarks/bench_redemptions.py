@@ -0,0 +1,87 @@
+"""Compare serializing redemption pages one by one and in bulk.
+
+Set BENCH_DATABASE to run against another database than in-memory
+SQLite.
+"""
+import os
+import timeit
+
+from flask import Flask
+from sqlalchemy import event
+
+from api.models import Center, RedemptionRequest, Society, User, db
+from api.utils.helpers import serialize_redemptions, serialize_redmp
+
+PAGE_SIZES = [100, 1000]
+USERS = 50
+ROUNDS = 5
+
+
+def seed(rows):
+    """Insert `rows` redemptions by users of a few societies and centers."""
+    db.drop_all()
+    db.create_all()
+    db.session.add_all(
+        [Center(uuid=f'-Kcenter{number}', name=f'Center {number}')
+         for number in range(3)] +
+        [Society(uuid=f'-Ksociety{number}', name=f'Society {number}')
+         for number in range(4)] +
+        [User(uuid=f'-Kuser{number}', name=f'User {number}',
+              email=f'user{number}@andela.com',
+              center_id=f'-Kcenter{number % 3}',
+              society_id=f'-Ksociety{number % 4}')
+         for number in range(USERS)])
+    db.session.commit()
+    db.session.execute(RedemptionRequest.__table__.insert(), [
+        dict(uuid=f'{number:08d}', name=f'request {number}', value=10,
+             status='pending', user_id=f'-Kuser{number % USERS}',
+             society_id=f'-Ksociety{number % USERS % 4}',
+             center_id=f'-Kcenter{number % USERS % 3}')
+        for number in range(rows)
+    ])
+    db.session.commit()
+
+
+def run(serialize):
+    """Serialize a freshly loaded page, counting the queries made."""
+    db.session.expire_all()
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    page = RedemptionRequest.query.all()
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        serialize(page)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return len(statements)
+
+
+def main():
+    """Time both serializers at each page size."""
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=os.getenv('BENCH_DATABASE', 'sqlite://'),
+        SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+
+    with app.app_context():
+        for rows in PAGE_SIZES:
+            seed(rows)
+            for name, serialize in [
+                    ('per item', lambda page: [serialize_redmp(redemption)
+                                               for redemption in page]),
+                    ('bulk', serialize_redemptions)]:
+                queries = run(serialize)
+                seconds = timeit.timeit(lambda: run(serialize),
+                                        number=ROUNDS)
+                print(f"{rows:>5} rows, {name:>8}: "
+                      f"{seconds / ROUNDS * 1e3:8.1f} ms/page, "
+                      f"{queries:>5} queries")
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Compare Base.serialize with the previous per-call implementation."""
+import datetime
+import timeit
+
+from api.models import LoggedActivity, camel_case
+
+ROWS = 10000
+
+
+def legacy_serialize(instance):
+    """Serialize the way Base.serialize used to."""
+    return {
+        camel_case(attribute.name): str(getattr(instance, attribute.name))
+        if not isinstance(getattr(instance, attribute.name), int)
+        else getattr(instance, attribute.name)
+        for attribute in instance.__table__.columns
+    }
+
+
+def main():
+    """Serialize 10k logged activities both ways."""
+    now = datetime.datetime.utcnow()
+    rows = [
+        LoggedActivity(uuid=str(i), name=f"activity {i}", value=i,
+                       description="Participated in this event",
+                       status='pending', created_at=now, redeemed=False,
+                       activity_date=now.date(), user_id='-Kuser',
+                       society_id='-Ksociety', activity_type_id='-Ktype')
+        for i in range(ROWS)
+    ]
+
+    legacy = timeit.timeit(lambda: [legacy_serialize(row) for row in rows],
+                           number=1)
+    current = timeit.timeit(lambda: [row.serialize() for row in rows],
+                            number=1)
+
+    print(f"legacy:      {legacy * 1e3:8.1f} ms / {ROWS} rows")
+    print(f"precompiled: {current * 1e3:8.1f} ms / {ROWS} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Compare cold and warm verification of the same bearer token."""
+import base64
+import datetime
+import os
+import timeit
+
+from jose import jwt
+
+from api.utils.auth import (VerifiedTokenCache, load_public_key,
+                            verify_cached_token, verify_token)
+
+ROUNDS = 1000
+
+
+def main():
+    """Time RS256 verification with and without the token cache."""
+    private_key = base64.b64decode(
+        os.environ['PRIVATE_KEY_TEST']).decode("utf-8")
+    public_key = load_public_key(os.environ['PUBLIC_KEY_TEST'])
+    token = jwt.encode({
+        "UserInfo": {"id": "-Kbench_user"},
+        "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=1),
+        "aud": "andela.com",
+        "iss": "accounts.andela.com"
+    }, private_key, algorithm="RS256")
+
+    cache = VerifiedTokenCache()
+    cold = timeit.timeit(
+        lambda: verify_token(token, public_key, "andela.com",
+                             "accounts.andela.com"),
+        number=ROUNDS)
+    warm = timeit.timeit(
+        lambda: verify_cached_token(token, public_key, "andela.com",
+                                    "accounts.andela.com", cache=cache),
+        number=ROUNDS)
+
+    print(f"cold: {cold / ROUNDS * 1e6:9.1f} us/token")
+    print(f"warm: {warm / ROUNDS * 1e6:9.1f} us/token "
+          f"(hits={cache.hits}, misses={cache.misses})")
+
+
+if __name__ == '__main__':
+    main()
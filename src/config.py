@@ -20,9 +20,12 @@ class Config(object):
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     PAGE_LIMIT = 10
     DEFAULT_PAGE = 1
+    # how paginated listings count their items: exact, cached or estimate
+    PAGE_COUNT = os.getenv('PAGE_COUNT', 'exact')
     PUBLIC_KEY = os.environ.get('PUBLIC_KEY')
     API_ISSUER = "accounts.andela.com"
     API_AUDIENCE = "andela.com"
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 1024))
     MAIL_GUN_URL = os.environ.get('MAIL_GUN_URL')
     MAIL_GUN_API_KEY = os.environ.get('MAIL_GUN_API_KEY')
     SENDER_CREDS = os.environ.get("SENDER_CREDS")
@@ -30,6 +33,12 @@ class Config(object):
     CELERY_BACKEND = os.environ.get("CELERY_BACKEND")
     CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL")
     CIO = os.environ.get("CIO")
+    ANDELA_API_URL = os.environ.get('ANDELA_API_URL')
+    # create new users from their token and fetch cohort/center in celery
+    ASYNC_USER_PROVISIONING = os.getenv('ASYNC_USER_PROVISIONING') == 'True'
+    # the celery tasks call the ANDELA API as this service account, so
+    # users' own tokens never go through the broker
+    ANDELA_API_TOKEN = os.environ.get('ANDELA_API_TOKEN')
 
     SUCCESS_OPS_NEWSLETTER_DAY = os.getenv(
         'SUCCESS_OPS_NEWSLETTER_DAY', 'mon'
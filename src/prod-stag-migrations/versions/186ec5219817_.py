@@ -0,0 +1,32 @@
+"""add catalog versions
+
+Revision ID: 186ec5219817
+Revises: ff6f4a43d34e
+Create Date: 2026-10-16 23:05:12.318470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '186ec5219817'
+down_revision = 'ff6f4a43d34e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('catalog_versions',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.execute(
+        "INSERT INTO catalog_versions (name, version) "
+        "VALUES ('activity_types', 0)"
+    )
+
+
+def downgrade():
+    op.drop_table('catalog_versions')
@@ -0,0 +1,66 @@
+"""add points ledger and snapshots
+
+Revision ID: 37d0f365a081
+Revises: 3ed8a11bd6d3
+Create Date: 2026-10-16 14:03:27.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '37d0f365a081'
+down_revision = '3ed8a11bd6d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('points_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('society_id', sa.String(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('source_id', sa.String(), nullable=True),
+    sa.Column('total_points', sa.Integer(), nullable=False),
+    sa.Column('used_points', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['society_id'], ['societies.uuid'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_points_ledger_society_id_id', 'points_ledger',
+                    ['society_id', 'id'])
+    op.create_index('ix_points_ledger_society_id_created_at_id',
+                    'points_ledger', ['society_id', 'created_at', 'id'])
+    op.create_table('points_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('society_id', sa.String(), nullable=False),
+    sa.Column('ledger_id', sa.Integer(), nullable=False),
+    sa.Column('total_points', sa.Integer(), nullable=False),
+    sa.Column('used_points', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['ledger_id'], ['points_ledger.id'], ),
+    sa.ForeignKeyConstraint(['society_id'], ['societies.uuid'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_points_snapshots_society_id_ledger_id',
+                    'points_snapshots', ['society_id', 'ledger_id'])
+
+    # open every society's ledger with the points it already has
+    op.execute(
+        "INSERT INTO points_ledger "
+        "(society_id, kind, total_points, used_points, created_at) "
+        "SELECT uuid, 'opening', COALESCE(_total_points, 0), "
+        "COALESCE(_used_points, 0), CURRENT_TIMESTAMP FROM societies"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_points_snapshots_society_id_ledger_id',
+                  table_name='points_snapshots')
+    op.drop_table('points_snapshots')
+    op.drop_index('ix_points_ledger_society_id_created_at_id',
+                  table_name='points_ledger')
+    op.drop_index('ix_points_ledger_society_id_id',
+                  table_name='points_ledger')
+    op.drop_table('points_ledger')
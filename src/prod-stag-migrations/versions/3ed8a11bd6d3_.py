@@ -0,0 +1,69 @@
+"""add indexes for hot query paths
+
+Revision ID: 3ed8a11bd6d3
+Revises: 7d327a0fb0cf
+Create Date: 2026-10-16 09:12:41.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from api.utils.migrations import autocommit_block
+
+
+# revision identifiers, used by Alembic.
+revision = '3ed8a11bd6d3'
+down_revision = '7d327a0fb0cf'
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status = 'pending'")
+
+# (index name, table, columns, partial index condition)
+INDEXES = [
+    ('ix_logged_activities_user_id_created_at', 'logged_activities',
+     ['user_id', 'created_at'], None),
+    ('ix_logged_activities_user_id_status', 'logged_activities',
+     ['user_id', 'status'], None),
+    ('ix_logged_activities_society_id_created_at', 'logged_activities',
+     ['society_id', 'created_at'], None),
+    ('ix_logged_activities_society_id_status', 'logged_activities',
+     ['society_id', 'status'], None),
+    ('ix_logged_activities_created_at_uuid', 'logged_activities',
+     ['created_at', 'uuid'], None),
+    ('ix_logged_activities_pending', 'logged_activities',
+     ['created_at'], PENDING),
+    ('ix_redemptions_society_id_created_at', 'redemptions',
+     ['society_id', 'created_at'], None),
+    ('ix_redemptions_status_created_at', 'redemptions',
+     ['status', 'created_at'], None),
+    ('ix_redemptions_center_id_created_at', 'redemptions',
+     ['center_id', 'created_at'], None),
+    ('ix_redemptions_name', 'redemptions', ['name'], None),
+    ('ix_roles_name', 'roles', ['name'], None),
+    ('ix_cohorts_society_id', 'cohorts', ['society_id'], None),
+    ('ix_user_role_user_uuid_role_uuid', 'user_role',
+     ['user_uuid', 'role_uuid'], None),
+    ('ix_user_role_role_uuid', 'user_role', ['role_uuid'], None),
+    ('ix_user_activity_user_uuid_activity_uuid', 'user_activity',
+     ['user_uuid', 'activity_uuid'], None),
+    ('ix_user_activity_activity_uuid', 'user_activity',
+     ['activity_uuid'], None),
+]
+
+
+def upgrade():
+    # Postgres only builds indexes concurrently outside of a transaction
+    with autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(name, table, columns,
+                            postgresql_concurrently=True,
+                            postgresql_where=where,
+                            sqlite_where=where)
+
+
+def downgrade():
+    with autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table,
+                          postgresql_concurrently=True)
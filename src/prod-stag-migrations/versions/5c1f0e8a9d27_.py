@@ -0,0 +1,37 @@
+"""add user stats
+
+Revision ID: 5c1f0e8a9d27
+Revises: 186ec5219817
+Create Date: 2026-10-16 23:41:37.104215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1f0e8a9d27'
+down_revision = '186ec5219817'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('activities', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.uuid'], ),
+    sa.PrimaryKeyConstraint('user_id', 'status')
+    )
+    op.execute(
+        "INSERT INTO user_stats (user_id, status, activities, points) "
+        "SELECT user_id, status, count(*), coalesce(sum(value), 0) "
+        "FROM logged_activities WHERE status IS NOT NULL "
+        "GROUP BY user_id, status"
+    )
+
+
+def downgrade():
+    op.drop_table('user_stats')
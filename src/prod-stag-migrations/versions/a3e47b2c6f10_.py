@@ -0,0 +1,39 @@
+"""add society stats
+
+Revision ID: a3e47b2c6f10
+Revises: 5c1f0e8a9d27
+Create Date: 2026-10-17 00:12:09.553081
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e47b2c6f10'
+down_revision = '5c1f0e8a9d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('society_stats',
+    sa.Column('society_id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('activity_type_id', sa.String(), nullable=False),
+    sa.Column('activities', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('society_id', 'status', 'activity_type_id')
+    )
+    op.execute(
+        "INSERT INTO society_stats (society_id, status, activity_type_id, "
+        "activities, points) "
+        "SELECT society_id, status, activity_type_id, count(*), "
+        "coalesce(sum(value), 0) "
+        "FROM logged_activities WHERE status IS NOT NULL "
+        "GROUP BY society_id, status, activity_type_id"
+    )
+
+
+def downgrade():
+    op.drop_table('society_stats')
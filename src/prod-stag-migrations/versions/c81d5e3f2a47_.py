@@ -0,0 +1,24 @@
+"""index points ledger entries by source
+
+Revision ID: c81d5e3f2a47
+Revises: a3e47b2c6f10
+Create Date: 2026-10-17 09:41:27.318204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81d5e3f2a47'
+down_revision = 'a3e47b2c6f10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_points_ledger_source_id', 'points_ledger',
+                    ['source_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_points_ledger_source_id', table_name='points_ledger')
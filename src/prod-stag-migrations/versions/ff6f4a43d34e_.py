@@ -0,0 +1,30 @@
+"""add index for cursor pagination of redemptions
+
+Revision ID: ff6f4a43d34e
+Revises: 37d0f365a081
+Create Date: 2026-10-16 16:21:08.441377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from api.utils.migrations import autocommit_block
+
+
+# revision identifiers, used by Alembic.
+revision = 'ff6f4a43d34e'
+down_revision = '37d0f365a081'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with autocommit_block():
+        op.create_index('ix_redemptions_created_at_uuid', 'redemptions',
+                        ['created_at', 'uuid'], postgresql_concurrently=True)
+
+
+def downgrade():
+    with autocommit_block():
+        op.drop_index('ix_redemptions_created_at_uuid',
+                      table_name='redemptions', postgresql_concurrently=True)
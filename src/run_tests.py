@@ -10,6 +10,7 @@ def test():
         branch=True,
         omit=[
             '*/tests/*',
+            '*/benchmarks/*',
             '*/marshmallow_schemas.py',
             'manage.py',
             '*/.virtualenvs/*',
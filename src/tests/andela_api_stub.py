@@ -0,0 +1,69 @@
+"""Local stand-in for the ANDELA API used in tests."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """Handle each keep-alive connection in its own daemon thread."""
+
+    daemon_threads = True
+
+
+class AndelaAPIStub(object):
+    """Serve canned ANDELA API payloads from a local HTTP server.
+
+    `responses` maps a path relative to the API root, e.g. 'users/<id>',
+    to a (status_code, payload) tuple. Every request path is recorded
+    in `requests` and every accepted connection is counted in
+    `connections`.
+    """
+
+    def __init__(self, responses=None, delay=0):
+        """Create a stub that waits `delay` seconds before each response."""
+        self.responses = responses or {}
+        self.delay = delay
+        self.requests = []
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                stub.connections += 1
+                BaseHTTPRequestHandler.setup(self)
+
+            def do_GET(self):
+                path = self.path.split('/', 2)[-1]
+                stub.requests.append(path)
+                time.sleep(stub.delay)
+                status_code, payload = stub.responses.get(
+                    path, (404, {'error': 'not found'}))
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}/api/'.format(self.server.server_port)
+
+    def __enter__(self):
+        """Start serving in a background thread."""
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def __exit__(self, *args):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
@@ -4,15 +4,17 @@ import base64
 import datetime
 import os
 import sys
+from contextlib import contextmanager
 from unittest import TestCase, mock
 from jose import jwt
+from sqlalchemy import event
 
 try:
     from app import create_app
     from api.models import (Activity, ActivityType, Cohort, Center,
-                            LoggedActivity, Society, User, Role,
-                            RedemptionRequest,
-                            db)
+                            LedgerEntry, LoggedActivity, PointsSnapshot,
+                            Society, SocietyStats, User, Role,
+                            RedemptionRequest, UserStats, db, update_stats)
 except ModuleNotFoundError:
     # this will enable us to run individual test files
     # pytest <path to file>
@@ -26,9 +28,9 @@ except ModuleNotFoundError:
 
     from app import create_app
     from api.models import (Activity, ActivityType, Cohort, Center,
-                            LoggedActivity, Society, User, Role,
-                            RedemptionRequest,
-                            db)
+                            LedgerEntry, LoggedActivity, PointsSnapshot,
+                            Society, SocietyStats, User, Role,
+                            RedemptionRequest, UserStats, db, update_stats)
 
 
 class BaseTestCase(TestCase):
@@ -472,6 +474,21 @@ class BaseTestCase(TestCase):
         token = jwt.encode(payload, decoded_key, algorithm="RS256")
         return token
 
+    @staticmethod
+    @contextmanager
+    def count_queries():
+        """Record the SQL statements executed within the block."""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
     def tearDown(self):
         """Clean up after every test."""
         self.patcher.stop()
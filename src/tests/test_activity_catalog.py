@@ -0,0 +1,86 @@
+"""Test suite for the in-process catalog of activity types."""
+import datetime
+import json
+
+from api.utils.activity_catalog import CATALOG, activity_type_catalog
+
+from .base_test import ActivityType, BaseTestCase, db
+
+
+class ActivityTypeCatalogTestCase(BaseTestCase):
+    """Test the activity type catalog and its version."""
+
+    def setUp(self):
+        """Load the catalog once so requests start from a warm one."""
+        super().setUp()
+        self.client.get('api/v1/activity-types', headers=self.header)
+
+    def activity_type_selects(self, statements):
+        """Pick the statements that read the activity types table."""
+        return [statement for statement in statements
+                if 'FROM activity_types' in statement]
+
+    def test_lookups_by_uuid_and_name(self):
+        """Test finding activity types by uuid and by any cased name."""
+        self.assertEqual(activity_type_catalog.get(self.hackathon.uuid).name,
+                         'Hackathon')
+        self.assertEqual(activity_type_catalog.find('hACKATHON').uuid,
+                         self.hackathon.uuid)
+        self.assertIsNone(activity_type_catalog.get('-Kmissing'))
+
+    def test_writes_bump_the_version(self):
+        """Test that creating, editing and deleting bump the version."""
+        version = activity_type_catalog.current().version
+        design = ActivityType(name='Design Sprint', value=50,
+                              description='A week long design sprint')
+        design.save()
+        design.value = 75
+        design.save()
+        design.delete()
+
+        self.assertEqual(activity_type_catalog.current().version,
+                         version + 3)
+        self.assertIsNone(activity_type_catalog.find('design sprint'))
+
+    def test_listing_is_not_read_again(self):
+        """Test that listing activity types only checks the version."""
+        with self.count_queries() as statements:
+            response = self.client.get('api/v1/activity-types',
+                                       headers=self.header)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['data']), 3)
+        self.assertEqual(self.activity_type_selects(statements), [])
+
+    def test_other_processes_changes_are_picked_up(self):
+        """Test that a version bumped elsewhere reloads the catalog."""
+        # another worker renames an activity type and bumps the version
+        db.session.execute(
+            "UPDATE activity_types SET name = 'Hack Week' WHERE uuid = :uuid",
+            dict(uuid=self.hackathon.uuid))
+        db.session.execute(
+            "UPDATE catalog_versions SET version = version + 1 "
+            "WHERE name = :name", dict(name=CATALOG))
+        db.session.commit()
+
+        # the next request checks the version again
+        with self.app.app_context():
+            self.assertEqual(
+                activity_type_catalog.get(self.hackathon.uuid).name,
+                'Hack Week')
+
+    def test_logging_an_activity_does_not_read_activity_types(self):
+        """Test that logged activities are validated against the catalog."""
+        payload = json.dumps(dict(
+            activityTypeId=self.interview.uuid,
+            date=str(datetime.date.today() - datetime.timedelta(days=5)),
+            description='Interviewed a few candidates',
+            noOfParticipants=2))
+
+        with self.count_queries() as statements:
+            response = self.client.post('api/v1/logged-activities',
+                                        headers=self.header, data=payload)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(json.loads(response.data)['data']['points'],
+                         2 * self.interview.value)
+        # only the lazy load of the new logged activity's category is left
+        self.assertEqual(len(self.activity_type_selects(statements)), 1)
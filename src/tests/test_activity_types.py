@@ -170,6 +170,30 @@ class ActivityTypesTestCase(BaseTestCase):
         # test that response data matches database
         self.assertEqual(len(activity_types), len(response_content['data']))
 
+    def test_get_activity_types_conditionally(self):
+        """Test that an unchanged activity type list is not sent again."""
+        response = self.client.get('api/v1/activity-types',
+                                   headers=self.header)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertIn('Last-Modified', response.headers)
+
+        response = self.client.get('api/v1/activity-types',
+                                   headers=dict(self.header,
+                                                **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        self.tech_event.value = 3000
+        self.tech_event.save()
+        response = self.client.get('api/v1/activity-types',
+                                   headers=dict(self.header,
+                                                **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
     def test_get_activity_type_by_id(self):
         """Test retrieval of a single activity type by ID."""
         response = self.client.get(
@@ -0,0 +1,108 @@
+"""Test suite for the ANDELA API client."""
+from unittest import TestCase
+
+from .andela_api_stub import AndelaAPIStub
+from api.utils.andela_api import AndelaAPIClient, CircuitBreaker
+
+
+class AndelaAPIClientTestCase(TestCase):
+    """Test pooling, timeouts, caching and the circuit breaker."""
+
+    user = {'id': '-Kuser_id', 'first_name': 'Test', 'last_name': 'User'}
+
+    def test_connections_are_reused(self):
+        """Test that requests share one keep-alive connection."""
+        client = AndelaAPIClient(cache_ttl=0)
+        with AndelaAPIStub({'cohorts': (200, {'values': []}),
+                            'locations': (200, {'values': []})}) as stub:
+            for _ in range(3):
+                client.get_cohorts(stub.url, 'token')
+                client.get_locations(stub.url, 'token')
+
+        self.assertEqual(len(stub.requests), 6)
+        self.assertEqual(stub.connections, 1)
+
+    def test_payloads_are_cached(self):
+        """Test that a repeated lookup is served from the cache."""
+        client = AndelaAPIClient()
+        with AndelaAPIStub({'users/-Kuser_id': (200, self.user)}) as stub:
+            first = client.get_user(stub.url, 'token', '-Kuser_id')
+            second = client.get_user(stub.url, 'token', '-Kuser_id')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.json(), self.user)
+        self.assertEqual(stub.requests, ['users/-Kuser_id'])
+
+    def test_payloads_are_cached_per_token(self):
+        """Test that a payload is not served to a different token."""
+        client = AndelaAPIClient()
+        with AndelaAPIStub({'users/-Kuser_id': (200, self.user)}) as stub:
+            client.get_user(stub.url, 'token', '-Kuser_id')
+            client.get_user(stub.url, 'other-token', '-Kuser_id')
+            client.get_user(stub.url, 'other-token', '-Kuser_id')
+
+        self.assertEqual(stub.requests, ['users/-Kuser_id'] * 2)
+
+    def test_cached_payloads_are_copied(self):
+        """Test that changing a response doesn't change the cache."""
+        client = AndelaAPIClient()
+        with AndelaAPIStub({'users/-Kuser_id': (200, self.user)}) as stub:
+            client.get_user(stub.url, 'token', '-Kuser_id').json()['id'] = 1
+            cached = client.get_user(stub.url, 'token', '-Kuser_id')
+            cached.json()['first_name'] = 'Changed'
+            response = client.get_user(stub.url, 'token', '-Kuser_id')
+
+        self.assertEqual(response.json(), self.user)
+        self.assertEqual(len(stub.requests), 1)
+
+    def test_errors_are_not_cached(self):
+        """Test that only successful payloads are cached."""
+        client = AndelaAPIClient()
+        with AndelaAPIStub() as stub:
+            client.get_user(stub.url, 'token', '-Kmissing')
+            response = client.get_user(stub.url, 'token', '-Kmissing')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(stub.requests), 2)
+
+    def test_slow_responses_time_out(self):
+        """Test that a slow API is reported as a network error."""
+        client = AndelaAPIClient(read_timeout=0.05)
+        with AndelaAPIStub({'cohorts': (200, {'values': []})},
+                           delay=0.5) as stub:
+            response = client.get_cohorts(stub.url, 'token')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"Error": "Network Error."})
+
+    def test_unreachable_api(self):
+        """Test that connection errors are reported as network errors."""
+        client = AndelaAPIClient(connect_timeout=0.5)
+        response = client.get_cohorts('http://127.0.0.1:1/api/', 'token')
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_circuit_breaker_opens_after_failures(self):
+        """Test that the API is not called while the breaker is open."""
+        client = AndelaAPIClient(breaker=CircuitBreaker(threshold=2,
+                                                        reset_timeout=60))
+        with AndelaAPIStub({'cohorts': (500, {'error': 'down'})}) as stub:
+            for _ in range(4):
+                response = client.get_cohorts(stub.url, 'token')
+
+        self.assertEqual(len(stub.requests), 2)
+        self.assertEqual(response.status_code, 503)
+
+    def test_circuit_breaker_closes_after_successful_trial(self):
+        """Test that a successful trial call closes the breaker."""
+        breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+        client = AndelaAPIClient(cache_ttl=0, breaker=breaker)
+        with AndelaAPIStub({'cohorts': (500, {'error': 'down'})}) as stub:
+            client.get_cohorts(stub.url, 'token')
+            self.assertIsNotNone(breaker.opened_at)
+
+            stub.responses['cohorts'] = (200, {'values': []})
+            response = client.get_cohorts(stub.url, 'token')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(breaker.opened_at)
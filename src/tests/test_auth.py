@@ -1,5 +1,9 @@
 """Authorization Test Suite."""
-from .base_test import BaseTestCase
+import time
+from unittest import mock
+
+from .base_test import BaseTestCase, User
+from api.utils.auth import VerifiedTokenCache, verified_tokens, verify_token
 
 
 class AuthTestCase(BaseTestCase):
@@ -47,3 +51,78 @@ class AuthTestCase(BaseTestCase):
 
         response_message = response.data.decode('utf-8')
         self.assertIn(error_message, response_message)
+
+    def test_repeated_token_is_served_from_cache(self):
+        """Test that a repeated token skips signature verification."""
+        verified_tokens.clear()
+
+        with mock.patch('api.utils.auth.verify_token',
+                        wraps=verify_token) as verify:
+            self.client.get('api/v1/societies', headers=self.header)
+            self.client.get('api/v1/societies', headers=self.header)
+
+        self.assertEqual(verify.call_count, 1)
+        self.assertEqual(verified_tokens.misses, 1)
+        self.assertEqual(verified_tokens.hits, 1)
+
+    def test_token_cache_is_sized_by_the_app(self):
+        """Test that the cache size is configured when the app is made."""
+        self.assertEqual(verified_tokens.maxsize,
+                         self.app.config['TOKEN_CACHE_SIZE'])
+
+    def test_cached_token_expires_with_token(self):
+        """Test that cache entries are not served past the token's exp."""
+        cache = VerifiedTokenCache()
+        cache.set('expired', {'exp': time.time() - 1})
+        cache.set('valid', {'exp': time.time() + 60})
+
+        self.assertIsNone(cache.get('expired'))
+        self.assertIsNotNone(cache.get('valid'))
+        self.assertEqual(len(cache), 1)
+
+    def test_token_cache_is_bounded(self):
+        """Test that the least recently used token is evicted first."""
+        cache = VerifiedTokenCache(maxsize=2)
+        expires_at = time.time() + 60
+        cache.set('first', {'exp': expires_at})
+        cache.set('second', {'exp': expires_at})
+        cache.get('first')
+        cache.set('third', {'exp': expires_at})
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('second'))
+        self.assertIsNotNone(cache.get('first'))
+
+    def test_identity_is_loaded_in_one_query(self):
+        """Test that the user and their relations are loaded at once."""
+        self.successops_role.save()
+        self.client.post('api/v1/roles', headers=self.success_ops)
+
+        with self.count_queries() as statements:
+            self.client.get('api/v1/activity-types', headers=self.header)
+            self.client.post('api/v1/roles', headers=self.success_ops)
+
+        # one identity query for each request, plus the catalog version and
+        # the activity types loaded by the GET
+        self.assertEqual(len(statements), 4)
+
+    def test_society_link_is_not_written_without_change(self):
+        """Test that a user whose cohort has no society causes no writes."""
+        self.test_user.society = None
+        self.test_user.save()
+
+        with mock.patch.object(User, 'save') as save:
+            self.client.get('api/v1/activity-types', headers=self.header)
+
+        save.assert_not_called()
+
+    def test_user_is_linked_to_cohort_society(self):
+        """Test that a user is linked to the society of their cohort."""
+        self.test_user.society = None
+        self.cohort_1_Nig.society = self.istelle
+        self.test_user.save()
+
+        self.client.get('api/v1/activity-types', headers=self.header)
+
+        self.assertEqual(User.query.get(self.test_user.uuid).society_id,
+                         self.istelle.uuid)
@@ -0,0 +1,90 @@
+"""Test suite for cached and estimated listing totals."""
+import json
+from unittest import mock
+
+from api.utils.counts import count_cache
+
+from .base_test import BaseTestCase, RedemptionRequest, db
+
+
+class CountTestCase(BaseTestCase):
+    """Test the count argument of paginated listings."""
+
+    def setUp(self):
+        """Save a few redemption requests."""
+        super().setUp()
+        count_cache.clear()
+        self.phoenix.save()
+        # along with self.redemp_req, which is saved with self.test_user
+        for number in range(2):
+            self.add_redemption(f"request {number}")
+
+    def add_redemption(self, name, status="pending"):
+        """Save a redemption request for phoenix."""
+        redemption = RedemptionRequest(name=name, value=10, status=status,
+                                       user=self.test_user,
+                                       center=self.test_user.center,
+                                       society=self.phoenix)
+        redemption.save()
+        return redemption
+
+    def get_count(self, url):
+        """Fetch a listing and return its count and the SQL it ran."""
+        with self.count_queries() as statements:
+            response = self.client.get(url, headers=self.cio)
+        self.assertEqual(response.status_code, 200)
+        response_details = json.loads(response.data)
+        counts = [statement for statement in statements
+                  if 'count(' in statement.lower()]
+        return response_details["count"], response_details["pages"], counts
+
+    def test_cached_count_is_reused(self):
+        """Test that the same listing is only counted once."""
+        url = "api/v1/societies/redeem?count=cached&limit=2"
+        self.assertEqual(self.get_count(url)[:2], (3, 2))
+
+        count, pages, counts = self.get_count(url)
+        self.assertEqual((count, pages, counts), (3, 2, []))
+
+    def test_cached_count_is_kept_per_filter(self):
+        """Test that differently filtered listings are counted apart."""
+        self.add_redemption("approved request", status="approved")
+        self.get_count("api/v1/societies/redeem?count=cached")
+
+        count, _, counts = self.get_count(
+            "api/v1/societies/redeem?count=cached&status=approved")
+        self.assertEqual(count, 1)
+        self.assertEqual(len(counts), 1)
+
+    def test_cached_count_is_dropped_on_writes(self):
+        """Test that inserts and bulk updates invalidate cached counts."""
+        url = "api/v1/societies/redeem?count=cached&status=pending&limit=2"
+        self.assertEqual(self.get_count(url)[0], 3)
+
+        self.add_redemption("another request")
+        self.assertEqual(self.get_count(url)[0], 4)
+
+        RedemptionRequest.query.filter_by(name="another request").update(
+            {"status": "approved"})
+        db.session.commit()
+        self.assertEqual(self.get_count(url)[0], 3)
+
+    def test_cached_count_expires(self):
+        """Test that counts are taken again after ttl seconds."""
+        url = "api/v1/societies/redeem?count=cached&limit=2"
+        self.get_count(url)
+
+        with mock.patch.object(count_cache, 'ttl', 0):
+            self.assertEqual(len(self.get_count(url)[2]), 1)
+
+    def test_estimated_count(self):
+        """Test that estimated totals are corrected on the last page."""
+        count, pages, _ = self.get_count(
+            "api/v1/societies/redeem?count=estimate&limit=2&page=2")
+        self.assertEqual((count, pages), (3, 2))
+
+        count, _, counts = self.get_count(
+            "api/v1/societies/redeem?count=estimate&limit=2")
+        self.assertGreaterEqual(count, 3)
+        if db.engine.dialect.name == 'postgresql':
+            self.assertEqual(counts, [])
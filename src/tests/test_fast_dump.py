@@ -0,0 +1,96 @@
+"""Test suite for the generated dump functions of the schemas."""
+import datetime
+
+from marshmallow import Schema, fields
+
+from api.utils.fast_dump import CompiledSchema
+from api.utils.marshmallow_schemas import (basic_info_schema,
+                                           logged_activities_schema,
+                                           redemption_schema,
+                                           single_logged_activity_schema,
+                                           society_schema,
+                                           user_logged_activities_schema)
+
+from .base_test import BaseTestCase, LoggedActivity
+
+
+class FastDumpTestCase(BaseTestCase):
+    """Compare the generated dumps with marshmallow's own."""
+
+    def setUp(self):
+        """Save logged activities in every status and a redemption."""
+        super().setUp()
+        self.phoenix.save()
+        self.president.save()
+        self.secretary.save()
+        self.log_alibaba_challenge.save()
+        self.log_alibaba_challenge2.approver_id = self.president.uuid
+        self.log_alibaba_challenge2.reviewer_id = self.secretary.uuid
+        self.log_alibaba_challenge2.status = 'approved'
+        self.log_alibaba_challenge2.save()
+        # an item without activity date or description
+        self.assertTrue(LoggedActivity(
+            name="bare logged activity", value=10, user=self.test_user,
+            society=self.phoenix, activity=self.js_meet_up,
+            activity_type=self.interview, no_of_participants=3).save())
+        self.redemp_req.save()
+        self.logged_activities = LoggedActivity.query.order_by(
+            LoggedActivity.name).all()
+
+    def assertDumpsLikeMarshmallow(self, schema, obj, many=None):
+        """Check that a schema dumps `obj` like a plain Schema would."""
+        expected = Schema.dump(schema, obj, many=many)
+        result = schema.dump(obj, many=many)
+        self.assertEqual(result.errors, expected.errors)
+        self.assertEqual(result.data, expected.data)
+        return result.data
+
+    def test_logged_activity_listings_match(self):
+        """Test both logged activity listing schemas on every item."""
+        for schema in (logged_activities_schema,
+                       user_logged_activities_schema):
+            data = self.assertDumpsLikeMarshmallow(schema,
+                                                   self.logged_activities)
+            self.assertEqual(len(data), 3)
+
+        approved = [item for item in data if item['status'] == 'approved']
+        self.assertEqual(approved[0]['approvedBy'], self.president.name)
+        self.assertEqual(approved[0]['reviewedBy'], self.secretary.name)
+
+    def test_single_items_match(self):
+        """Test the schemas that dump one item at a time."""
+        for logged_activity in self.logged_activities:
+            self.assertDumpsLikeMarshmallow(single_logged_activity_schema,
+                                            logged_activity)
+        self.assertDumpsLikeMarshmallow(redemption_schema, self.redemp_req)
+        self.assertDumpsLikeMarshmallow(basic_info_schema, self.test_user)
+        self.assertDumpsLikeMarshmallow(society_schema, self.phoenix)
+
+    def test_redemption_pages_match(self):
+        """Test many=True dumps of a schema defined without it."""
+        self.assertDumpsLikeMarshmallow(redemption_schema,
+                                        [self.redemp_req], many=True)
+
+    def test_dicts_are_dumped_by_marshmallow(self):
+        """Test that items other than models are left to marshmallow."""
+        item = dict(uuid='-Kid', name='a name',
+                    created_at=datetime.datetime(2018, 1, 1))
+        data = self.assertDumpsLikeMarshmallow(basic_info_schema, item)
+        self.assertEqual(data['id'], '-Kid')
+
+    def test_failing_fields_are_reported_by_marshmallow(self):
+        """Test that field errors are collected the way marshmallow does."""
+        class PointsSchema(CompiledSchema):
+            points = fields.Integer(attribute='name')
+
+        schema = PointsSchema()
+        result = self.assertDumpsLikeMarshmallow(schema,
+                                                 self.log_alibaba_challenge)
+        self.assertEqual(result, {})
+
+    def test_generated_source_reads_each_field_directly(self):
+        """Test that plain fields are inlined in the generated function."""
+        source = logged_activities_schema.dump_item.source
+        self.assertIn("getattr(value, 'name', missing)", source)
+        # only the Url field of the owner's photo is left to its field
+        self.assertEqual(source.count(".serialize("), 1)
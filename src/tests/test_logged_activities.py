@@ -1,8 +1,15 @@
 """Logged Activity Test Suite."""
+import csv
 import datetime
+import io
 import json
 
-from .base_test import BaseTestCase, LoggedActivity
+from unittest import mock
+
+from api.utils.approvals import approve_in_background
+from api.utils.marshmallow_schemas import LoggedActivitySchema
+from .base_test import (BaseTestCase, LedgerEntry, LoggedActivity, Society,
+                        UserStats, db, update_stats)
 
 
 class LoggedActivitiesTestCase(BaseTestCase):
@@ -39,6 +46,60 @@ class LoggedActivitiesTestCase(BaseTestCase):
         # test that response data matches database query results
         self.assertEqual(len(logged_activities), len(response_content['data']))
 
+    def test_user_stats_follow_logged_activities(self):
+        """Test that stats are kept as activities are changed and deleted."""
+        user_id = self.test_user.uuid
+        self.assertEqual(UserStats.of(user_id), {'in review': (2, 5000)})
+
+        self.log_alibaba_challenge.status = 'approved'
+        self.log_alibaba_challenge.save()
+        self.assertEqual(UserStats.of(user_id), {
+            'in review': (1, 2500), 'approved': (1, 2500)})
+
+        # changes made after the objects were expired are seen too
+        logged_activity = LoggedActivity.query.get(
+            self.log_alibaba_challenge2.uuid)
+        logged_activity.value = 10
+        logged_activity.user_id = self.test_user_2.uuid
+        logged_activity.save()
+        self.log_alibaba_challenge.delete()
+        self.assertEqual(UserStats.of(user_id), {
+            'in review': (0, 0), 'approved': (0, 0)})
+        self.assertEqual(UserStats.of(self.test_user_2.uuid),
+                         {'in review': (1, 10)})
+
+    def test_get_user_logged_activities_is_paginated(self):
+        """Test that a user's activities are paged and totals kept."""
+        self.log_alibaba_challenge.status = 'approved'
+        self.log_alibaba_challenge.save()
+        for number in range(11):
+            LoggedActivity(
+                name=f'logged activity {number}', value=10,
+                user=self.test_user, activity=self.alibaba_ai_challenge,
+                society=self.phoenix,
+                activity_type=self.hackathon).save()
+        url = f'/api/v1/users/{self.test_user.uuid}/logged-activities'
+
+        with self.count_queries() as statements:
+            response = self.client.get(f'{url}?limit=5&page=3',
+                                       headers=self.header)
+        content = json.loads(response.data)
+        self.assertEqual(len(content['data']), 3)
+        self.assertEqual((content['count'], content['pages']), (13, 3))
+        self.assertIn(f'{url}?limit=5&page=2', content['previousUrl'])
+        self.assertEqual(content['activitiesLogged'], 13)
+        self.assertEqual(content['pointsEarned'],
+                         self.log_alibaba_challenge.value)
+        # the totals come from the stats, not from counting activities
+        self.assertFalse([statement for statement in statements
+                          if 'count(' in statement.lower() and
+                          'FROM logged_activities' in statement and
+                          'max(' not in statement.lower()])
+
+        response = self.client.get(f'{url}?paginate=false',
+                                   headers=self.header)
+        self.assertEqual(len(json.loads(response.data)['data']), 13)
+
     def test_get_logged_activities_message_when_user_has_none(self):
         """
         Test that users with no logged activities get a helpful
@@ -102,6 +163,247 @@ class LoggedActivitiesTestCase(BaseTestCase):
         self.assertEqual(logged_activities_count,
                          response_content['data']['count'])
 
+    def test_logged_activities_queries_do_not_grow_with_rows(self):
+        """Test that listing logged activities makes no query per row."""
+        def list_activities(url):
+            db.session.expire_all()
+            with self.count_queries() as statements:
+                response = self.client.get(url, headers=self.header)
+            self.assertEqual(response.status_code, 200)
+            return len(statements)
+
+        self.log_alibaba_challenge.approver_id = self.test_user.uuid
+        self.log_alibaba_challenge.save()
+        urls = ['/api/v1/logged-activities',
+                '/api/v1/logged-activities?paginate=false',
+                f'/api/v1/users/{self.test_user.uuid}/logged-activities']
+        before = [list_activities(url) for url in urls]
+
+        for user, activity_type in [(self.test_user_2, self.tech_event),
+                                    (self.president, self.interview)]:
+            LoggedActivity(name='another logged activity', value=10,
+                           user=self.test_user, society=self.sparks,
+                           activity=self.js_meet_up,
+                           activity_type=activity_type,
+                           approver_id=user.uuid).save()
+
+        self.assertEqual([list_activities(url) for url in urls], before)
+
+    def test_approver_and_reviewer_names_looked_up_at_once(self):
+        """Test that dumping a page resolves user names in one query."""
+        for number in range(4):
+            db.session.add(LoggedActivity(
+                name=f'logged activity {number}', value=10,
+                user=self.test_user, society=self.phoenix,
+                activity_type=self.hackathon,
+                approver_id=self.test_user.uuid,
+                reviewer_id=self.test_user_2.uuid if number % 2 else None
+            ))
+        db.session.commit()
+        logged_activities = LoggedActivity.query.all()
+        schema = LoggedActivitySchema(
+            many=True, only=('uuid', 'approved_by', 'reviewed_by'))
+
+        with self.count_queries() as statements:
+            dumped = schema.dump(logged_activities).data
+
+        self.assertEqual(len(statements), 1)
+        # shared schema instances keep no per-dump state
+        self.assertEqual(schema.context, {})
+        by_id = {item['id']: item for item in dumped}
+        for logged_activity in logged_activities:
+            item = by_id[logged_activity.uuid]
+            self.assertEqual(
+                item['approvedBy'],
+                self.test_user.name if logged_activity.approver_id else None)
+            self.assertEqual(
+                item['reviewedBy'],
+                self.test_user_2.name if logged_activity.reviewer_id
+                else None)
+
+    def test_get_user_logged_activities_conditionally(self):
+        """Test that a user's unchanged logged activities are not resent."""
+        url = f'/api/v1/users/{self.test_user.uuid}/logged-activities'
+        response = self.client.get(url, headers=self.header)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+
+        with self.count_queries() as statements:
+            response = self.client.get(url, headers=dict(
+                self.header, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 304)
+        # only the requested page is read, not the whole history
+        self.assertFalse(any('FROM logged_activities' in statement and
+                             ('count(' in statement.lower() or
+                              'max(' in statement.lower())
+                             for statement in statements))
+
+        self.log_alibaba_challenge.status = 'approved'
+        self.log_alibaba_challenge.save()
+        response = self.client.get(url, headers=dict(
+            self.header, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_user_logged_activities_follow_related_rows(self):
+        """Test that renaming an activity or a user changes the listing."""
+        url = f'/api/v1/users/{self.test_user.uuid}/logged-activities'
+        etag = self.client.get(url, headers=self.header).headers['ETag']
+
+        self.alibaba_ai_challenge.name = 'Alibaba AI Challenge 2'
+        self.alibaba_ai_challenge.save()
+        response = self.client.get(url, headers=dict(
+            self.header, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+
+        self.test_user.name = 'Renamed User'
+        self.test_user.save()
+        response = self.client.get(url, headers=dict(
+            self.header, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_user_logged_activities_follow_other_pages(self):
+        """Test that a change outside of the page changes its ETag."""
+        url = (f'/api/v1/users/{self.test_user.uuid}/logged-activities'
+               '?limit=1')
+        response = self.client.get(url, headers=self.header)
+        etag = response.headers['ETag']
+        listed = json.loads(response.data)['data'][0]['id']
+
+        other = next(logged_activity for logged_activity in (
+            self.log_alibaba_challenge, self.log_alibaba_challenge2)
+            if logged_activity.uuid != listed)
+        other.status = 'approved'
+        other.save()
+        response = self.client.get(url, headers=dict(
+            self.header, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_logged_activities_by_cursor(self):
+        """Test walking through all logged activities with cursors."""
+        now = datetime.datetime.utcnow()
+        for number in range(4):
+            LoggedActivity(
+                name=f'logged activity {number}', value=10,
+                user=self.test_user, activity=self.alibaba_ai_challenge,
+                society=self.phoenix, activity_type=self.hackathon,
+                # two activities share a created_at, the uuid breaks the tie
+                created_at=now + datetime.timedelta(seconds=number // 2)
+            ).save()
+
+        seen = []
+        url = '/api/v1/logged-activities?limit=2&cursor='
+        with self.count_queries() as statements:
+            while url:
+                response = self.client.get(url, headers=self.header)
+                self.assertEqual(response.status_code, 200)
+                data = json.loads(response.get_data(as_text=True))['data']
+                self.assertIsNone(data['count'])
+                seen.extend(item['id'] for item in data['loggedActivities'])
+                url = data['next_url']
+                self.assertEqual(url is None, data['nextCursor'] is None)
+
+        expected = LoggedActivity.query.order_by(
+            LoggedActivity.created_at, LoggedActivity.uuid).all()
+        self.assertEqual(seen, [item.uuid for item in expected])
+        self.assertFalse(any('count(' in statement.lower()
+                             for statement in statements))
+
+    def test_get_logged_activities_with_invalid_cursor(self):
+        """Test that a made up cursor is rejected."""
+        response = self.client.get(
+            '/api/v1/logged-activities?cursor=not-a-cursor',
+            headers=self.header
+        )
+        response_content = json.loads(response.get_data(as_text=True))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response_content['message'], 'Invalid cursor.')
+
+    def test_get_logged_activities_with_sparse_fieldset(self):
+        """Test that unrequested logged activity columns are not fetched."""
+        with self.count_queries() as statements:
+            response = self.client.get(
+                '/api/v1/logged-activities?fields=id,status,owner',
+                headers=self.header
+            )
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.get_data(as_text=True))['data']
+        self.assertTrue(data['loggedActivities'])
+        for logged_activity in data['loggedActivities']:
+            self.assertEqual(set(logged_activity), {'id', 'status', 'owner'})
+        selects = [statement for statement in statements
+                   if 'FROM logged_activities' in statement]
+        self.assertFalse(any('logged_activities.description' in statement
+                             for statement in selects))
+
+        response = self.client.get(
+            '/api/v1/logged-activities?fields=id,secret',
+            headers=self.header
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_unpaginated_logged_activities(self):
+        """Test streaming all logged activities as newline delimited JSON."""
+        self.log_alibaba_challenge2.save()
+        header = dict(self.header, Accept='application/x-ndjson')
+
+        response = self.client.get(
+            '/api/v1/logged-activities?paginate=false',
+            headers=header
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+
+        lines = response.get_data(as_text=True).splitlines()
+        streamed = [json.loads(line) for line in lines]
+        listed = json.loads(self.client.get(
+            '/api/v1/logged-activities?paginate=false',
+            headers=self.header
+        ).get_data(as_text=True))['data']['loggedActivities']
+
+        self.assertEqual(len(streamed), LoggedActivity.query.count())
+        self.assertEqual(sorted(streamed, key=lambda item: item['id']),
+                         sorted(listed, key=lambda item: item['id']))
+
+    def test_export_logged_activities_csv(self):
+        """Test exporting logged activities with their related names."""
+        self.log_alibaba_challenge.approver_id = self.test_user.uuid
+        self.log_alibaba_challenge.save()
+
+        def export():
+            with self.count_queries() as statements:
+                response = self.client.get(
+                    '/api/v1/logged-activities/export.csv',
+                    headers=self.header
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, 'text/csv')
+            rows = list(csv.DictReader(
+                io.StringIO(response.get_data(as_text=True))))
+            return rows, statements
+
+        rows, statements = export()
+        self.assertEqual(len(rows), LoggedActivity.query.count())
+        row = next(row for row in rows
+                   if row['id'] == self.log_alibaba_challenge.uuid)
+        self.assertEqual(row['owner'], self.test_user.name)
+        self.assertEqual(row['society'], 'Phoenix')
+        self.assertEqual(row['category'], 'Hackathon')
+        self.assertEqual(row['activity'], 'Fashion challenge')
+        self.assertEqual(row['approvedBy'], self.test_user.name)
+        self.assertEqual(row['reviewedBy'], '')
+
+        LoggedActivity(name='another logged activity', value=10,
+                       user=self.test_user_2, society=self.sparks,
+                       activity_type=self.hackathon).save()
+        more_rows, more_statements = export()
+        self.assertEqual(len(more_rows), len(rows) + 1)
+        # names come from joins, not from a query per row
+        self.assertEqual(len(more_statements), len(statements))
+
     def test_get_logged_activities_message_when_user_does_not_exist(self):
         """Test that a 404 error is thrown when a user does not exist."""
         response = self.client.get(
@@ -328,6 +630,83 @@ class LogActivityTestCase(BaseTestCase):
         )
 
 
+class BulkLogActivitiesTestCase(BaseTestCase):
+    """Log many activities at once test cases."""
+
+    def setUp(self):
+        """Save the activities the payloads refer to."""
+        super().setUp()
+        self.alibaba_ai_challenge.save()
+        self.js_meet_up.save()
+        self.logged_before = LoggedActivity.query.count()
+
+    def payload(self, count):
+        """Build a list of `count` activities to log."""
+        date = str(datetime.date.today() - datetime.timedelta(days=5))
+        return [dict(activityId=self.alibaba_ai_challenge.uuid)
+                if number % 2 else
+                dict(activityTypeId=self.interview.uuid, date=date,
+                     description=f'Interviewed candidates {number}',
+                     noOfParticipants=number + 1)
+                for number in range(count)]
+
+    def post_bulk(self, items):
+        """Post a list of activities to the bulk endpoint."""
+        return self.client.post(
+            'api/v1/logged-activities/bulk', headers=self.header,
+            data=json.dumps(dict(loggedActivities=items)))
+
+    def test_bulk_log_activities_is_successful(self):
+        """Test that every activity of the list is logged."""
+        response = self.post_bulk(self.payload(4))
+
+        self.assertEqual(response.status_code, 201, response.data)
+        data = json.loads(response.data)['data']
+        self.assertEqual([item['points'] for item in data],
+                         [self.interview.value, self.alibaba_ai_challenge.
+                          activity_type.value,
+                          3 * self.interview.value, self.alibaba_ai_challenge.
+                          activity_type.value])
+        self.assertEqual({item['status'] for item in data}, {'in review'})
+        self.assertEqual(LoggedActivity.query.count(),
+                         self.logged_before + 4)
+
+    def test_bulk_log_activities_reports_errors_per_item(self):
+        """Test that nothing is logged when any of the items is invalid."""
+        items = self.payload(3)
+        items[1] = dict(activityId='invalid_id_yo')
+        items.append(dict(activityTypeId=self.interview.uuid,
+                          date=str(datetime.date.today()),
+                          description='Interviewed a candidate'))
+
+        response = self.post_bulk(items)
+
+        self.assertEqual(response.status_code, 400)
+        errors = json.loads(response.data)['errors']
+        self.assertEqual([error['index'] for error in errors], [1, 3])
+        self.assertEqual(errors[0]['message'], 'Invalid activity id')
+        self.assertEqual(LoggedActivity.query.count(), self.logged_before)
+
+    def test_bulk_log_activities_payload_is_checked(self):
+        """Test that empty, malformed and oversized lists are refused."""
+        for items, status in [([], 400), ('not a list', 400),
+                              (self.payload(1) * 501, 403)]:
+            response = self.post_bulk(items)
+            self.assertEqual(response.status_code, status)
+        self.assertEqual(LoggedActivity.query.count(), self.logged_before)
+
+    def test_bulk_log_activities_queries_do_not_grow_with_items(self):
+        """Test that the items are validated and inserted at once."""
+        self.post_bulk(self.payload(2))
+        with self.count_queries() as few:
+            self.post_bulk(self.payload(2))
+        with self.count_queries() as many:
+            response = self.post_bulk(self.payload(40))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(many), len(few))
+
+
 class EditLoggedActivityTestCase(BaseTestCase):
     """Edit activity test cases."""
 
@@ -454,6 +833,8 @@ class EditLoggedActivityTestCase(BaseTestCase):
         response_payload = json.loads(response.data)
         self.assertEqual(response_payload.get('data').get('status'),
                          payload.get('status'))
+        self.assertEqual(LoggedActivity.query.get(uuid).reviewer_id,
+                         '-Kuty7hryt8cbkc')
         self.assertEqual(response.status_code, 200)
 
     def test_secretary_edit_reject_activity_works(self):
@@ -472,6 +853,26 @@ class EditLoggedActivityTestCase(BaseTestCase):
                          payload.get('status'))
         self.assertEqual(response.status_code, 200)
 
+    def test_secretary_edit_needs_activity_in_review(self):
+        """Test that only activities in review can be reviewed."""
+        self.log_alibaba_challenge.status = 'approved'
+        self.log_alibaba_challenge.save()
+        uuid = self.log_alibaba_challenge.uuid
+        points = self.phoenix.total_points
+
+        response = self.client.put(
+            f'/api/v1/logged-activities/review/{uuid}',
+            data=json.dumps({'status': 'pending'}),
+            headers=self.society_secretary
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.data)['message'],
+                         'Logged activity is not in review')
+        self.assertEqual(LoggedActivity.query.get(uuid).status, 'approved')
+        self.assertEqual(Society.query.get(self.phoenix.uuid).total_points,
+                         points)
+
     def test_secretary_edit_invalid_input(self):
         """Test invalid input is rejected."""
         payload = {'status': 'invalid'}
@@ -628,17 +1029,17 @@ class LoggedActivityApprovalTestCase(BaseTestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response_details['message'], message)
 
-    def test_approving_over_twenty_logged_activities_fails(self):
+    def test_approving_over_five_thousand_logged_activities_fails(self):
 
         """
         Test a scenario where approval for logged activities fails
-        if logged activities request is more than 20.
+        if logged activities request is more than 5000.
         """
 
         self.successops_role.save()
         self.payload = dict(
             status='approved',
-            loggedActivitiesIds=['i' for count in range(0, 21)]
+            loggedActivitiesIds=[str(count) for count in range(0, 5001)]
         )
 
         response = self.client.put(
@@ -647,7 +1048,7 @@ class LoggedActivityApprovalTestCase(BaseTestCase):
            headers=self.success_ops
         )
 
-        message = 'Sorry, you can not approve more than 20 logged_activities at a go'
+        message = 'Sorry, you can not approve more than 5000 logged_activities at a go'
         response_details = json.loads(response.get_data(as_text=True))
 
         self.assertEqual(response.status_code, 403)
@@ -680,6 +1081,103 @@ class LoggedActivityApprovalTestCase(BaseTestCase):
         self.assertEqual(response_details['message'], message)
 
 
+class BulkReviewTestCase(BaseTestCase):
+    """Base for tests that change the status of many logged activities."""
+
+    def setUp(self):
+        """Save the societies of the activities and a success ops."""
+        super().setUp()
+        self.successops_role.save()
+        self.log_alibaba_challenge.save()
+        self.invictus.save()
+        self.phoenix_points = Society.query.get(self.phoenix.uuid).total_points
+
+    def log_activities(self, count, society=None, status='pending'):
+        """Insert `count` logged activities worth 10 points each."""
+        society = society or self.phoenix
+        first = LoggedActivity.query.count()
+        uuids = [f'-Kpending{number:05d}'
+                 for number in range(first, first + count)]
+        rows = [dict(uuid=uuid, name='pending activity', value=10,
+                     status=status, redeemed=False,
+                     created_at=datetime.datetime.utcnow(),
+                     user_id=self.test_user.uuid, society_id=society.uuid,
+                     activity_id=self.alibaba_ai_challenge.uuid,
+                     activity_type_id=self.hackathon.uuid)
+                for uuid in uuids]
+        db.session.execute(LoggedActivity.__table__.insert(), rows)
+        update_stats(db.session.connection(), [(None, row) for row in rows])
+        db.session.commit()
+        return uuids
+
+
+class BulkApprovalTestCase(BulkReviewTestCase):
+    """Test approving many logged activities with one statement."""
+
+    def approve(self, ids):
+        """Approve the logged activities `ids` as success ops."""
+        return self.client.put(
+            '/api/v1/logged-activities/approve/', headers=self.success_ops,
+            data=json.dumps(dict(loggedActivitiesIds=ids)))
+
+    def test_only_pending_activities_are_approved_once(self):
+        """Test that points are awarded once per pending activity."""
+        pending = self.log_activities(3)
+        rejected = self.log_activities(2, society=self.invictus,
+                                       status='rejected')
+
+        response = self.approve(pending + pending + rejected + ['-Kmissing'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(item['id'] for item in json.loads(response.data)['data']),
+            pending)
+
+        # approving them again changes nothing
+        self.assertEqual(self.approve(pending).status_code, 400)
+
+        self.assertEqual(Society.query.get(self.phoenix.uuid).total_points,
+                         self.phoenix_points + 30)
+        self.assertEqual(Society.query.get(self.invictus.uuid).total_points, 0)
+        self.assertEqual(LedgerEntry.query.filter(
+            LedgerEntry.source_id.in_(pending)).count(), 3)
+
+    def test_approval_queries_do_not_grow_with_activities(self):
+        """Test that activities and societies are updated set-based."""
+        few = self.log_activities(2) + \
+            self.log_activities(2, society=self.invictus)
+        many = self.log_activities(200) + \
+            self.log_activities(200, society=self.invictus)
+        # warm up the success ops user and the approved stats
+        self.approve(self.log_activities(1) +
+                     self.log_activities(1, society=self.invictus))
+
+        with self.count_queries() as few_statements:
+            self.assertEqual(self.approve(few).status_code, 200)
+        with self.count_queries() as many_statements:
+            self.assertEqual(self.approve(many).status_code, 200)
+
+        self.assertEqual(len(many_statements), len(few_statements))
+        self.assertEqual(Society.query.get(self.invictus.uuid).total_points,
+                         2030)
+
+    @mock.patch('api.endpoints.logged_activities.approve_in_background')
+    def test_long_lists_are_approved_in_the_background(self, task):
+        """Test that over a thousand activities are left to a task."""
+        pending = self.log_activities(1001)
+        phoenix_id = self.phoenix.uuid
+
+        response = self.approve(pending)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(sorted(task.delay.call_args[0][0]), pending)
+        self.assertEqual(LoggedActivity.query.filter_by(
+            status='approved').count(), 0)
+
+        # what the worker then does
+        self.assertEqual(approve_in_background(pending, app=self.app), 1001)
+        self.assertEqual(Society.query.get(phoenix_id).total_points,
+                         self.phoenix_points + 10010)
+
+
 class LoggedActivityRejectTestCase(BaseTestCase):
     """Test to check rejection of Logged activities by success ops"""
 
@@ -749,6 +1247,87 @@ class LoggedActivityRejectTestCase(BaseTestCase):
         self.assertEqual(response_details['message'], message)
 
 
+class BulkRejectionTestCase(BulkReviewTestCase):
+    """Test rejecting and reviewing many logged activities at once."""
+
+    def test_reject_logged_activities_in_bulk(self):
+        """Test that only pending activities are rejected."""
+        pending = self.log_activities(3)
+        in_review = self.log_activities(1, status='in review')
+
+        with self.count_queries() as statements:
+            response = self.client.put(
+                '/api/v1/logged-activities/reject', headers=self.success_ops,
+                data=json.dumps(dict(
+                    loggedActivitiesIds=pending + in_review + ['-Kmissing'])))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['data'], [
+            dict(id=pending[0], status='rejected'),
+            dict(id=pending[1], status='rejected'),
+            dict(id=pending[2], status='rejected'),
+            dict(id=in_review[0], status='in review',
+                 message='Logged activity is not pending'),
+            dict(id='-Kmissing', message='Logged activity not found')])
+        self.assertEqual(len([statement for statement in statements
+                              if statement.startswith(
+                                  'UPDATE logged_activities')]), 1)
+        self.assertEqual(LoggedActivity.query.filter_by(
+            status='rejected').count(), 3)
+
+    def test_reject_logged_activities_in_bulk_needs_pending_ones(self):
+        """Test that a list without pending activities is refused."""
+        rejected = self.log_activities(2, status='rejected')
+
+        response = self.client.put(
+            '/api/v1/logged-activities/reject', headers=self.success_ops,
+            data=json.dumps(dict(loggedActivitiesIds=rejected)))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [item['status'] for item in json.loads(response.data)['data']],
+            ['rejected', 'rejected'])
+
+    def test_secretary_reviews_logged_activities_in_bulk(self):
+        """Test that only activities in review are moved to pending."""
+        in_review = self.log_activities(3, status='in review')
+        approved = self.log_activities(1, status='approved')
+
+        response = self.client.put(
+            '/api/v1/logged-activities/review',
+            headers=self.society_secretary,
+            data=json.dumps(dict(status='pending',
+                                 loggedActivitiesIds=in_review + approved)))
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)['data']
+        self.assertEqual([item['status'] for item in data],
+                         ['pending', 'pending', 'pending', 'approved'])
+        reviewed = LoggedActivity.query.filter(
+            LoggedActivity.uuid.in_(in_review)).all()
+        self.assertEqual({(logged_activity.status,
+                           bool(logged_activity.reviewer_id))
+                          for logged_activity in reviewed},
+                         {('pending', True)})
+
+    def test_secretary_bulk_review_payload_is_checked(self):
+        """Test that a status and a list of ids are required."""
+        in_review = self.log_activities(1, status='in review')
+
+        for payload, status in [
+                (dict(loggedActivitiesIds=in_review), 400),
+                (dict(status='approved', loggedActivitiesIds=in_review), 400),
+                (dict(status='rejected', loggedActivitiesIds='-Kid'), 400),
+                (dict(status='rejected',
+                      loggedActivitiesIds=in_review * 5001), 403)]:
+            response = self.client.put(
+                '/api/v1/logged-activities/review',
+                headers=self.society_secretary, data=json.dumps(payload))
+            self.assertEqual(response.status_code, status)
+        self.assertEqual(LoggedActivity.query.get(in_review[0]).status,
+                         'in review')
+
+
 class DeleteLoggedActivityTestCase(BaseTestCase):
     """Delete logged activity test cases."""
 
@@ -1,9 +1,11 @@
 """Models TestSuite."""
+import json
 
 from .base_test import (
     BaseTestCase, Activity, ActivityType, Cohort, Center,
     LoggedActivity, Society, User, Role, RedemptionRequest
 )
+from api.models import camel_case
 
 
 class UserTestCase(BaseTestCase):
@@ -264,3 +266,32 @@ class RedemptionRequestTestCase(BaseTestCase):
 
         self.assertTrue(self.redemp_req.save(),
                         msg="Redemption Request save failed.")
+
+
+class SerializeTestCase(BaseTestCase):
+    """Test the precompiled model serializer."""
+
+    @staticmethod
+    def legacy_serialize(instance):
+        """Serialize the way Base.serialize used to."""
+        return {
+            camel_case(attribute.name): str(getattr(instance, attribute.name))
+            if not isinstance(getattr(instance, attribute.name), int)
+            else getattr(instance, attribute.name)
+            for attribute in instance.__table__.columns
+        }
+
+    def test_serialize_matches_legacy_output(self):
+        """Test that serialized models are identical to the old output."""
+        self.log_alibaba_challenge.save()
+        self.redemp_req.save()
+        self.phoenix.save()
+        instances = [self.test_user, self.phoenix, self.lagos,
+                     self.cohort_1_Nig, self.hackathon,
+                     self.alibaba_ai_challenge, self.log_alibaba_challenge,
+                     self.redemp_req, Role(name='transient role')]
+
+        for instance in instances:
+            expected = self.legacy_serialize(instance)
+            serialized = instance.serialize()
+            self.assertEqual(json.dumps(serialized), json.dumps(expected))
@@ -0,0 +1,155 @@
+"""Concurrency tests for society point accounting.
+
+These need a database with row level locking, so they only run when
+TEST_DATABASE points at Postgres, e.g.
+TEST_DATABASE=postgresql://postgres@localhost/societies_test pytest
+tests/test_point_accounting.py
+"""
+import json
+import os
+import random
+import threading
+import unittest
+from collections import namedtuple
+
+from .base_test import (BaseTestCase, LedgerEntry, LoggedActivity, Society,
+                        db)
+
+Points = namedtuple('Points', ['uuid', 'value'])
+
+THREADS = 8
+
+
+@unittest.skipUnless(
+    os.environ.get('TEST_DATABASE', '').startswith('postgres'),
+    'needs a Postgres TEST_DATABASE')
+class PointAccountingTestCase(BaseTestCase):
+    """Hammer the point accounting code from several threads."""
+
+    def setUp(self):
+        """Save a society with its members and roles."""
+        super().setUp()
+        self.successops_role.save()
+        self.phoenix.save()
+        self.sparks.save()
+        self.test_user_2.save()
+
+    def run_threads(self, target):
+        """Run `target(thread_number)` in THREADS threads at once."""
+        barrier = threading.Barrier(THREADS)
+        errors = []
+
+        def run(number):
+            barrier.wait()
+            try:
+                target(number)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(number,))
+                   for number in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def society_points(self, society_id):
+        """Read a society's points as committed in the database."""
+        db.session.expire_all()
+        society = Society.query.get(society_id)
+        return society.total_points, society.used_points
+
+    def assertLedgerMatches(self, society_id):
+        """Check that the ledger adds up to the society's points."""
+        self.assertEqual(LedgerEntry.balance(society_id),
+                         self.society_points(society_id))
+
+    def test_concurrent_increments_are_not_lost(self):
+        """Every increment made by every thread ends up in the total."""
+        society_id = self.phoenix.uuid
+        increments = 50
+
+        def add_points(number):
+            with self.app.app_context():
+                for _ in range(increments):
+                    society = Society.query.get(society_id)
+                    society.total_points = Points(None, 3)
+                    db.session.commit()
+
+        self.run_threads(add_points)
+
+        self.assertEqual(self.society_points(society_id),
+                         (THREADS * increments * 3, 0))
+        self.assertLedgerMatches(society_id)
+
+    def test_concurrent_approvals_award_points_once(self):
+        """Overlapping approval requests award each activity's points once."""
+        activities = [
+            LoggedActivity(name=f'logged activity {number}',
+                           value=10 + number,
+                           status='pending',
+                           user=self.test_user if number % 2
+                           else self.test_user_2,
+                           activity=self.alibaba_ai_challenge,
+                           society=self.phoenix if number % 2
+                           else self.sparks,
+                           activity_type=self.hackathon)
+            for number in range(60)
+        ]
+        db.session.add_all(activities)
+        db.session.commit()
+        ids = [activity.uuid for activity in activities]
+        expected = {
+            self.phoenix.uuid: sum(a.value for a in activities[1::2]),
+            self.sparks.uuid: sum(a.value for a in activities[::2])
+        }
+
+        # create the success ops user before the threads race to do it
+        self.client.get('/api/v1/roles', headers=self.success_ops)
+        db.session.commit()
+
+        approved_ids = []
+
+        def approve(number):
+            shuffled = random.Random(number).sample(ids, len(ids))
+            client = self.app.test_client()
+            for start in range(0, len(shuffled), 20):
+                response = client.put(
+                    '/api/v1/logged-activities/approve/',
+                    data=json.dumps(dict(
+                        loggedActivitiesIds=shuffled[start:start + 20])),
+                    headers=self.success_ops)
+                if response.status_code == 200:
+                    data = json.loads(response.get_data(as_text=True))
+                    approved_ids.extend(item['id'] for item in data['data'])
+
+        self.run_threads(approve)
+
+        self.assertEqual(sorted(approved_ids), sorted(ids))
+        for society_id, total in expected.items():
+            self.assertEqual(self.society_points(society_id), (total, 0))
+            self.assertLedgerMatches(society_id)
+
+    def test_concurrent_redemption_approvals_use_points_once(self):
+        """Approving a redemption request many times at once uses its
+        points once.
+        """
+        self.phoenix._total_points = 5000
+        self.phoenix.save()
+        self.redemp_req.save()
+        redemption_id = self.redemp_req.uuid
+
+        self.client.get('/api/v1/roles', headers=self.success_ops)
+        db.session.commit()
+
+        def approve(number):
+            self.app.test_client().put(
+                f'/api/v1/societies/redeem/verify/{redemption_id}',
+                data=json.dumps(dict(status='approved')),
+                headers=self.success_ops)
+
+        self.run_threads(approve)
+
+        self.assertEqual(self.society_points(self.phoenix.uuid),
+                         (5000, self.redemp_req.value))
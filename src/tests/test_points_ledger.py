@@ -0,0 +1,180 @@
+"""Test suite for the points ledger and its snapshots."""
+import datetime
+import json
+
+from .base_test import (BaseTestCase, LedgerEntry, LoggedActivity,
+                        PointsSnapshot, RedemptionRequest, Society, db)
+
+
+class PointsLedgerTestCase(BaseTestCase):
+    """Points ledger test cases."""
+
+    def setUp(self):
+        """Save the societies and a few approved activities."""
+        super().setUp()
+        self.successops_role.save()
+        self.phoenix.save()
+        self.sparks.save()
+        self.log_alibaba_challenge.save()
+        self.log_alibaba_challenge2.save()
+
+    def add_entry(self, total_points=0, used_points=0, age=0):
+        """Record an entry on phoenix's ledger `age` minutes ago."""
+        entry = LedgerEntry(
+            society_id=self.phoenix.uuid, kind='approval',
+            total_points=total_points, used_points=used_points,
+            created_at=datetime.datetime.utcnow() -
+            datetime.timedelta(minutes=age))
+        db.session.add(entry)
+        db.session.commit()
+        return entry
+
+    def test_points_setters_record_ledger_entries(self):
+        """Test that awarding and using points adds ledger entries."""
+        self.phoenix.total_points = self.log_alibaba_challenge
+        self.phoenix.used_points = self.redemp_req
+        db.session.commit()
+
+        entries = self.phoenix.ledger.order_by(LedgerEntry.id).all()
+        self.assertEqual(
+            [(entry.kind, entry.source_id, entry.total_points,
+              entry.used_points) for entry in entries],
+            [('approval', self.log_alibaba_challenge.uuid, 2500, 0),
+             ('redemption', self.redemp_req.uuid, 0, 2500)])
+        self.assertEqual(LedgerEntry.balance(self.phoenix.uuid),
+                         (self.phoenix.total_points,
+                          self.phoenix.used_points))
+
+    def test_approving_logged_activities_records_ledger_entries(self):
+        """Test that approved activities end up in their society's ledger."""
+        self.log_alibaba_challenge.status = 'pending'
+        self.log_alibaba_challenge2.status = 'pending'
+        self.log_alibaba_challenge.save()
+        self.log_alibaba_challenge2.save()
+
+        response = self.client.put(
+            '/api/v1/logged-activities/approve/',
+            data=json.dumps(dict(loggedActivitiesIds=[
+                self.log_alibaba_challenge.uuid,
+                self.log_alibaba_challenge2.uuid])),
+            headers=self.success_ops)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(LedgerEntry.balance(self.phoenix.uuid), (2500, 0))
+        self.assertEqual(LedgerEntry.balance(self.sparks.uuid), (2500, 0))
+        self.assertEqual(self.sparks.ledger.one().source_id,
+                         self.log_alibaba_challenge2.uuid)
+
+    def assert_ledger_matches_points(self, society):
+        """Check a society's ledger balance against its points."""
+        society = Society.query.get(society.uuid)
+        self.assertEqual(LedgerEntry.balance(society.uuid),
+                         (society.total_points, society.used_points))
+
+    def test_unapproved_and_deleted_activities_are_reversed(self):
+        """Test that activities losing their approval give points back."""
+        self.log_alibaba_challenge.status = 'pending'
+        self.log_alibaba_challenge2.status = 'pending'
+        self.log_alibaba_challenge.save()
+        self.log_alibaba_challenge2.save()
+        self.client.put(
+            '/api/v1/logged-activities/approve/',
+            data=json.dumps(dict(loggedActivitiesIds=[
+                self.log_alibaba_challenge.uuid,
+                self.log_alibaba_challenge2.uuid])),
+            headers=self.success_ops)
+
+        unapproved = LoggedActivity.query.get(self.log_alibaba_challenge.uuid)
+        unapproved.status = 'pending'
+        unapproved.save()
+        LoggedActivity.query.get(self.log_alibaba_challenge2.uuid).delete()
+        # activities that have nothing left to reverse add no entries
+        unapproved.status = 'rejected'
+        unapproved.save()
+        unapproved.delete()
+
+        for society in (self.phoenix, self.sparks):
+            self.assertEqual(
+                [(entry.kind, entry.total_points) for entry in
+                 society.ledger.order_by(LedgerEntry.id)],
+                [('approval', 2500), ('reversal', -2500)])
+            self.assertEqual(Society.query.get(society.uuid).total_points, 0)
+            self.assert_ledger_matches_points(society)
+
+    def test_rejected_and_deleted_redemptions_are_reversed(self):
+        """Test that spent redemptions give their points back."""
+        self.phoenix.total_points = self.log_alibaba_challenge
+        db.session.commit()
+        redemptions = [self.redemp_req, RedemptionRequest(
+            name="Sweaters", value=100, user=self.test_user,
+            center=self.test_user.center, society=self.phoenix)]
+        for redemption in redemptions:
+            redemption.save()
+            self.client.put(
+                f"api/v1/societies/redeem/verify/{redemption.uuid}",
+                data=json.dumps(dict(status="approved")),
+                headers=self.success_ops)
+        self.assertEqual(Society.query.get(self.phoenix.uuid).used_points,
+                         2600)
+
+        self.client.put(
+            f"api/v1/societies/redeem/verify/{self.redemp_req.uuid}",
+            data=json.dumps(dict(status="rejected", rejection="no budget")),
+            headers=self.success_ops)
+        completed = RedemptionRequest.query.get(redemptions[1].uuid)
+        completed.status = 'completed'
+        completed.save()
+        completed.delete()
+
+        self.assertEqual(
+            [(entry.kind, entry.used_points) for entry in
+             self.phoenix.ledger.filter_by(kind='reversal').order_by(
+                 LedgerEntry.id)],
+            [('reversal', -2500), ('reversal', -100)])
+        self.assertEqual(Society.query.get(self.phoenix.uuid).used_points, 0)
+        self.assert_ledger_matches_points(self.phoenix)
+
+    def test_snapshots_skip_unsettled_entries(self):
+        """Test that snapshots only cover entries older than SETTLE_TIME."""
+        self.add_entry(total_points=100, age=30)
+        self.add_entry(total_points=10, age=20)
+        self.add_entry(total_points=1)
+
+        snapshot = PointsSnapshot.take(self.phoenix.uuid)
+        db.session.commit()
+
+        self.assertEqual((snapshot.total_points, snapshot.used_points),
+                         (110, 0))
+        self.assertIsNone(PointsSnapshot.take(self.phoenix.uuid))
+        self.assertEqual(LedgerEntry.balance(self.phoenix.uuid), (111, 0))
+
+    def test_snapshots_build_on_the_previous_snapshot(self):
+        """Test that a snapshot adds the new entries to the previous one."""
+        self.add_entry(total_points=100, age=30)
+        PointsSnapshot.take(self.phoenix.uuid)
+        self.add_entry(used_points=40, age=20)
+        snapshot = PointsSnapshot.take(self.phoenix.uuid)
+        db.session.commit()
+
+        self.assertEqual((snapshot.total_points, snapshot.used_points),
+                         (100, 40))
+        self.assertEqual(PointsSnapshot.query.count(), 2)
+
+    def test_balance_at_a_point_in_time(self):
+        """Test that historical balances ignore later entries."""
+        now = datetime.datetime.utcnow()
+        self.add_entry(total_points=100, age=30)
+        self.add_entry(used_points=40, age=20)
+        PointsSnapshot.take(self.phoenix.uuid)
+        self.add_entry(total_points=7, age=10)
+        db.session.commit()
+
+        def balance_ago(minutes):
+            return LedgerEntry.balance(
+                self.phoenix.uuid, now - datetime.timedelta(minutes=minutes))
+
+        self.assertEqual(balance_ago(40), (0, 0))
+        self.assertEqual(balance_ago(25), (100, 0))
+        self.assertEqual(balance_ago(15), (100, 40))
+        self.assertEqual(balance_ago(5), (107, 40))
+        self.assertEqual(LedgerEntry.balance(self.sparks.uuid), (0, 0))
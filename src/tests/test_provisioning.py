@@ -0,0 +1,113 @@
+"""Test suite for asynchronous first-login provisioning."""
+from unittest import mock
+
+from celery.exceptions import Retry
+
+from .andela_api_stub import AndelaAPIStub
+from .base_test import BaseTestCase, Center, Cohort, User
+from api.utils.andela_api import andela_api
+from api.utils.provisioning import enrich_user_details
+
+
+class ProvisioningTestCase(BaseTestCase):
+    """Test creating users from their token and enriching them later."""
+
+    def setUp(self):
+        """Enable asynchronous provisioning."""
+        BaseTestCase.setUp(self)
+        self.app.config['ASYNC_USER_PROVISIONING'] = True
+        self.app.config['ANDELA_API_TOKEN'] = 'service-token'
+        andela_api.clear_cache()
+        andela_api.breaker.record_success()
+        self.successops_role.save()
+        self.phoenix.cohorts.append(self.cohort_14_Ke)
+        self.phoenix.save()
+
+    def user_response(self, cohort_id, cohort_name, location_id):
+        """Build the ANDELA API response for the success ops user."""
+        return {
+            'users/-Ktest_id': (200, {
+                'id': '-Ktest_id',
+                'cohort': {'id': cohort_id, 'name': cohort_name},
+                'location': {'id': location_id}
+            })
+        }
+
+    @mock.patch('api.utils.auth.enrich_user_details')
+    def test_first_request_does_not_call_andela_api(self, enrich):
+        """Test that new users are stored from their token alone."""
+        response = self.client.get('api/v1/activity-types',
+                                   headers=self.success_ops)
+
+        self.assertEqual(response.status_code, 200)
+        user = User.query.get('-Ktest_id')
+        self.assertEqual(user.email, 'test.successops@andela.com')
+        self.assertEqual([role.name for role in user.roles],
+                         ['success ops'])
+        self.assertIsNone(user.cohort_id)
+        # the user's token is not queued
+        enrich.delay.assert_called_once_with('-Ktest_id')
+        self.patcher.target.add_extra_user_info.assert_not_called()
+
+    @mock.patch('api.utils.auth.enrich_user_details')
+    def test_enrich_user_details_links_cohort_and_center(self, _):
+        """Test that the task links the user to cohort, center and society."""
+        self.client.get('api/v1/activity-types', headers=self.success_ops)
+        responses = self.user_response(self.cohort_14_Ke.uuid,
+                                       self.cohort_14_Ke.name,
+                                       self.nairobi.uuid)
+
+        with AndelaAPIStub(responses) as stub:
+            self.app.config['ANDELA_API_URL'] = stub.url
+            self.assertTrue(enrich_user_details('-Ktest_id', app=self.app))
+            # running the task again is a no-op
+            self.assertFalse(enrich_user_details('-Ktest_id', app=self.app))
+
+        self.assertEqual(stub.requests, ['users/-Ktest_id'])
+        user = User.query.get('-Ktest_id')
+        self.assertEqual(user.cohort.name, 'cohort-14')
+        self.assertEqual(user.center.name, 'Nairobi')
+        self.assertEqual(user.society.name, 'Phoenix')
+
+    @mock.patch('api.utils.auth.enrich_user_details')
+    def test_enrich_user_details_creates_new_cohort(self, _):
+        """Test that unknown cohorts are created in the user's center."""
+        self.client.get('api/v1/activity-types', headers=self.success_ops)
+        nairobi_id = self.nairobi.uuid
+        responses = self.user_response('-Knew_cohort', 'cohort-30',
+                                       nairobi_id)
+
+        with AndelaAPIStub(responses) as stub:
+            self.app.config['ANDELA_API_URL'] = stub.url
+            enrich_user_details('-Ktest_id', app=self.app)
+
+        cohort = Cohort.query.get('-Knew_cohort')
+        self.assertEqual(cohort.name, 'cohort-30')
+        self.assertEqual(cohort.center, Center.query.get(nairobi_id))
+        self.assertEqual(User.query.get('-Ktest_id').cohort, cohort)
+
+    @mock.patch('api.utils.auth.enrich_user_details')
+    def test_enrich_user_details_retries_when_api_fails(self, _):
+        """Test that server errors from the ANDELA API are retried."""
+        self.client.get('api/v1/activity-types', headers=self.success_ops)
+        responses = {'users/-Ktest_id': (502, {'error': 'bad gateway'})}
+
+        with AndelaAPIStub(responses) as stub:
+            self.app.config['ANDELA_API_URL'] = stub.url
+            with self.assertRaises(Retry):
+                enrich_user_details('-Ktest_id', app=self.app)
+
+        self.assertIsNone(User.query.get('-Ktest_id').cohort_id)
+
+    @mock.patch('api.utils.auth.enrich_user_details')
+    def test_enrich_user_details_needs_a_service_token(self, _):
+        """Test that a missing token skips the API and its breaker."""
+        self.client.get('api/v1/activity-types', headers=self.success_ops)
+        self.app.config['ANDELA_API_TOKEN'] = None
+
+        with mock.patch.object(andela_api, 'get') as get:
+            self.assertFalse(enrich_user_details('-Ktest_id', app=self.app))
+
+        get.assert_not_called()
+        self.assertEqual(andela_api.breaker.failures, 0)
+        self.assertIsNone(User.query.get('-Ktest_id').cohort_id)
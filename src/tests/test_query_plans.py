@@ -0,0 +1,72 @@
+"""Test that hot queries are served by indexes."""
+from .base_test import BaseTestCase, db
+
+
+class QueryPlanTestCase(BaseTestCase):
+    """Run EXPLAIN on the queries the endpoints issue most often."""
+
+    hot_queries = [
+        ("SELECT * FROM logged_activities WHERE user_id = 'x' "
+         "ORDER BY created_at DESC",
+         'ix_logged_activities_user_id_created_at'),
+        # on empty tables Postgres may pick either index for this one
+        ("SELECT sum(value) FROM logged_activities WHERE user_id = 'x' "
+         "AND status = 'approved'",
+         ('ix_logged_activities_user_id_status',
+          'ix_logged_activities_user_id_created_at')),
+        ("SELECT * FROM logged_activities WHERE society_id = 'x' "
+         "ORDER BY created_at DESC",
+         'ix_logged_activities_society_id_created_at'),
+        ("SELECT count(*) FROM logged_activities WHERE society_id = 'x' "
+         "AND status = 'approved'",
+         'ix_logged_activities_society_id_status'),
+        ("SELECT * FROM logged_activities WHERE status = 'pending' "
+         "ORDER BY created_at",
+         'ix_logged_activities_pending'),
+        ("SELECT * FROM logged_activities "
+         "ORDER BY created_at DESC, uuid DESC LIMIT 10",
+         'ix_logged_activities_created_at_uuid'),
+        ("SELECT * FROM redemptions WHERE society_id = 'x' "
+         "ORDER BY created_at DESC",
+         'ix_redemptions_society_id_created_at'),
+        ("SELECT * FROM redemptions WHERE status = 'pending'",
+         'ix_redemptions_status_created_at'),
+        ("SELECT * FROM redemptions WHERE center_id = 'x'",
+         'ix_redemptions_center_id_created_at'),
+        ("SELECT * FROM redemptions WHERE name = 'x'",
+         'ix_redemptions_name'),
+        ("SELECT * FROM redemptions "
+         "ORDER BY created_at, uuid LIMIT 10",
+         'ix_redemptions_created_at_uuid'),
+        ("SELECT * FROM roles WHERE name = 'x'", 'ix_roles_name'),
+        ("SELECT * FROM cohorts WHERE society_id = 'x'",
+         'ix_cohorts_society_id'),
+        ("SELECT role_uuid FROM user_role WHERE user_uuid = 'x'",
+         'ix_user_role_user_uuid_role_uuid'),
+        ("SELECT user_uuid FROM user_role WHERE role_uuid = 'x'",
+         'ix_user_role_role_uuid'),
+        ("SELECT activity_uuid FROM user_activity WHERE user_uuid = 'x'",
+         'ix_user_activity_user_uuid_activity_uuid'),
+        ("SELECT user_uuid FROM user_activity WHERE activity_uuid = 'x'",
+         'ix_user_activity_activity_uuid'),
+    ]
+
+    def explain(self, query):
+        """Return the query plan as a single string."""
+        if db.engine.dialect.name == 'postgresql':
+            # tables are tiny in tests, make the planner show its index
+            db.session.execute('SET enable_seqscan = off')
+            rows = db.session.execute('EXPLAIN ' + query)
+        else:
+            rows = db.session.execute('EXPLAIN QUERY PLAN ' + query)
+        return ' '.join(str(column) for row in rows for column in row)
+
+    def test_hot_queries_use_indexes(self):
+        """Test that each hot query is planned with its index."""
+        for query, indexes in self.hot_queries:
+            if isinstance(indexes, str):
+                indexes = (indexes,)
+            with self.subTest(query=query):
+                plan = self.explain(query)
+                self.assertTrue(any(index in plan for index in indexes),
+                                plan)
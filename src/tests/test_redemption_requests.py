@@ -1,8 +1,11 @@
 """Test suite for Point Redemption Module."""
+import csv
+import io
 import json
 import uuid
 
-from .base_test import BaseTestCase, User
+from api.utils.helpers import serialize_redemptions, serialize_redmp
+from .base_test import BaseTestCase, RedemptionRequest, User
 
 
 class PointRedemptionBaseTestCase(BaseTestCase):
@@ -136,6 +139,80 @@ class PointRedemptionBaseTestCase(BaseTestCase):
         self.assertIn(message, response_details["message"])
         self.assertEqual(response.status_code, 200)
 
+    def test_serialize_redemption_page_in_bulk(self):
+        """Test the page serializer against serialize_redmp."""
+        for number in range(3):
+            RedemptionRequest(name=f"request {number}", value=10,
+                              user=self.sparks_president,
+                              center=self.sparks_president.center,
+                              society=self.sparks).save()
+        redemptions = RedemptionRequest.query.all()
+
+        with self.count_queries() as statements:
+            page = serialize_redemptions(redemptions)
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(page, [serialize_redmp(redemption)
+                                for redemption in redemptions])
+
+    def test_get_redemption_requests_with_sparse_fieldset(self):
+        """Test that redemptions can be trimmed to some fields."""
+        response = self.client.get(
+            "api/v1/societies/redeem?fields=id,status,center",
+            headers=self.cio)
+        self.assertEqual(response.status_code, 200)
+
+        for redemption in json.loads(response.data)["data"]:
+            self.assertEqual(set(redemption), {"id", "status", "center"})
+            self.assertEqual(
+                redemption["center"]["name"],
+                RedemptionRequest.query.get(redemption["id"]).center.name)
+
+    def test_get_redemption_requests_by_cursor(self):
+        """Test that cursor pagination keeps the status filter."""
+        for number in range(3):
+            RedemptionRequest(name=f"request {number}", value=10,
+                              status="approved", user=self.test_user,
+                              center=self.test_user.center,
+                              society=self.phoenix).save()
+
+        seen = []
+        url = "api/v1/societies/redeem?status=approved&limit=2&cursor="
+        while url:
+            response = self.client.get(url, headers=self.cio)
+            self.assertEqual(response.status_code, 200)
+            response_details = json.loads(response.data)
+            self.assertNotIn("count", response_details)
+            seen.extend(item["id"] for item in response_details["data"])
+            url = response_details["nextUrl"]
+
+        self.assertEqual(len(seen), 3)
+        self.assertNotIn(self.redemp_req.uuid, seen)
+
+    def test_export_redemption_requests_csv(self):
+        """Test that the export takes the list filters."""
+        RedemptionRequest(name="=HYPERLINK(\"https://evil.com\")", value=10,
+                          status="approved", user=self.test_user,
+                          center=self.test_user.center,
+                          society=self.phoenix).save()
+
+        response = self.client.get(
+            "api/v1/societies/redeem/export.csv?status=approved",
+            headers=self.cio)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment", response.headers["Content-Disposition"])
+
+        rows = list(csv.DictReader(
+            io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["society"], "Phoenix")
+        self.assertEqual(rows[0]["requestedBy"], self.test_user.name)
+        self.assertEqual(rows[0]["reason"][0], "'")
+
+        response = self.client.get(
+            "api/v1/societies/redeem/export.csv?society=unknown",
+            headers=self.cio)
+        self.assertEqual(response.status_code, 400)
+
     def test_get_existing_redemption_requests_by_id(self):
         """Test retrieval of Redemption Requests."""
         response = self.client.get(
@@ -472,6 +549,24 @@ class PointRedemptionApprovalTestCase(BaseTestCase):
         self.assertIn(message, response_details["message"])
         self.assertEqual(response.status_code, 200)
 
+    def test_completed_redemption_is_not_approved_again(self):
+        """Test that only pending redemption requests can be approved."""
+        self.redemp_req.status = "completed"
+        self.redemp_req.save()
+
+        response = self.client.put(
+            f"api/v1/societies/redeem/verify/{self.redemp_req.uuid}",
+            data=json.dumps(dict(status="approved")),
+            headers=self.success_ops,
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertNotIn("status changed",
+                         json.loads(response.data)["message"])
+        self.assertEqual(RedemptionRequest.query.get(
+            self.redemp_req.uuid).status, "completed")
+
     def test_point_redemption_rejection_successful(self):
         """Test rejection of redemption request.
 
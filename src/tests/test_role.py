@@ -4,6 +4,7 @@ import json
 import uuid
 
 from .base_test import BaseTestCase, db
+from api.utils.role_registry import role_registry
 
 
 class RoleTestCase(BaseTestCase):
@@ -362,3 +363,42 @@ class SocietyRoleTestCase(BaseTestCase):
 
         self.assertEqual(message, response_details["message"])
         self.assertEqual(response.status_code, 404)
+
+    def test_roles_required_makes_no_extra_role_queries(self):
+        """Test that a protected request does not look roles up by name."""
+        # warm the registry and create the success ops user
+        self.client.post('api/v1/roles', headers=self.successops_token)
+
+        with self.count_queries() as statements:
+            response = self.client.post('api/v1/roles',
+                                        headers=self.successops_token)
+
+        self.assertEqual(response.status_code, 400)
+        role_queries = [statement for statement in statements
+                        if 'FROM roles' in statement or
+                        'FROM user_role' in statement]
+        self.assertEqual(role_queries, [])
+        # the user's roles come with the identity query
+        self.assertEqual(len(statements), 1)
+
+    def test_role_registry_invalidated_on_role_changes(self):
+        """Test that creating, renaming and deleting roles updates registry."""
+        self.assertEqual(role_registry.uuids_for(['blogger']), set())
+
+        response = self.client.post('api/v1/roles',
+                                    data=json.dumps(dict(name='blogger')),
+                                    headers=self.successops_token,
+                                    content_type='application/json')
+        role_id = json.loads(response.data)['data']['uuid']
+        self.assertEqual(role_registry.uuids_for(['blogger']), {role_id})
+
+        self.client.put(f'api/v1/roles/{role_id}',
+                        data=json.dumps(dict(name='vlogger')),
+                        headers=self.successops_token,
+                        content_type='application/json')
+        self.assertEqual(role_registry.uuids_for(['blogger']), set())
+        self.assertEqual(role_registry.uuids_for(['vlogger']), {role_id})
+
+        self.client.delete(f'api/v1/roles/{role_id}',
+                           headers=self.successops_token)
+        self.assertEqual(role_registry.uuids_for(['vlogger']), set())
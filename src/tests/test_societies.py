@@ -1,7 +1,7 @@
 """Test suite for Society Module."""
 import json
 import uuid
-from .base_test import BaseTestCase, Society, Role, db
+from .base_test import BaseTestCase, LoggedActivity, Society, Role, db
 
 
 class SocietyBaseTestCase(BaseTestCase):
@@ -89,6 +89,141 @@ class SocietyBaseTestCase(BaseTestCase):
         self.assertIn(message, response_details["message"])
         self.assertEqual(response.status_code, 200)
 
+    def test_get_society_conditionally(self):
+        """Test that an unchanged society is answered with 304."""
+        url = f"api/v1/societies/{self.sparks.uuid}"
+        response = self.client.get(url, headers=self.success_ops)
+        self.assertEqual(response.status_code, 200)
+
+        with self.count_queries() as statements:
+            response = self.client.get(url, headers=dict(
+                self.success_ops,
+                **{"If-Modified-Since": response.headers["Last-Modified"]}))
+        self.assertEqual(response.status_code, 304)
+        # the stats stand in for the society's history
+        self.assertFalse(any("FROM logged_activities" in statement and
+                             ("count(" in statement.lower() or
+                              "max(" in statement.lower())
+                             for statement in statements))
+
+        etag = response.headers["ETag"]
+        self.sparks.color_scheme = "#000000"
+        self.sparks.save()
+        response = self.client.get(url, headers=dict(
+            self.success_ops, **{"If-None-Match": etag}))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_get_society_queries_do_not_grow_with_activities(self):
+        """Test that a society's logged activities are loaded at once."""
+        def get_society():
+            db.session.expire_all()
+            with self.count_queries() as statements:
+                response = self.client.get(
+                    f"api/v1/societies/{self.phoenix.uuid}",
+                    headers=self.success_ops)
+            self.assertEqual(response.status_code, 200)
+            return len(statements)
+
+        self.test_user.save()
+        self.log_alibaba_challenge.save()
+        # the first request also stores the success ops user
+        get_society()
+        before = get_society()
+
+        for user, activity_type in [(self.test_user_2, self.tech_event),
+                                    (self.president, self.interview)]:
+            LoggedActivity(name="another logged activity", value=10,
+                           user=user, society=self.phoenix,
+                           activity=self.js_meet_up,
+                           activity_type=activity_type).save()
+
+        self.assertEqual(get_society(), before)
+
+    def log_activities(self, count, status='pending'):
+        """Log `count` activities worth 10 points in Phoenix."""
+        for number in range(count):
+            LoggedActivity(name=f"logged activity {number}", value=10,
+                           status=status, user=self.test_user,
+                           society=self.phoenix, activity=self.js_meet_up,
+                           activity_type=self.tech_event).save()
+
+    def test_get_society_aggregates(self):
+        """Test that a society's details hold its activity aggregates."""
+        self.log_alibaba_challenge.status = 'approved'
+        self.log_alibaba_challenge.save()
+        self.log_activities(3, status='approved')
+        self.log_activities(12)
+        LoggedActivity.query.filter_by(status='pending').first().delete()
+
+        response = self.client.get(f"api/v1/societies/{self.phoenix.uuid}",
+                                   headers=self.success_ops)
+
+        self.assertEqual(response.status_code, 200)
+        details = json.loads(response.data)["societyDetails"]
+        self.assertEqual(details["activitiesByStatus"],
+                         {"approved": 4, "pending": 11})
+        self.assertEqual(
+            sorted((item["name"], item["points"])
+                   for item in details["pointsByActivityType"]),
+            [("Hackathon", self.log_alibaba_challenge.value),
+             ("Tech Event", 30)])
+        self.assertEqual(len(details["recentActivities"]), 10)
+        self.assertNotIn("loggedActivities", details)
+        self.assertTrue(details["loggedActivitiesUrl"].endswith(
+            f"/api/v1/societies/{self.phoenix.uuid}/logged-activities"))
+
+    def test_get_society_logged_activities_by_page(self):
+        """Test that all of a society's activities are listed by page."""
+        self.log_activities(12)
+        url = f"api/v1/societies/{self.phoenix.uuid}/logged-activities"
+
+        response = self.client.get(f"{url}?limit=5&page=3",
+                                   headers=self.success_ops)
+        content = json.loads(response.data)
+        self.assertEqual(response.status_code, 200)
+        # with the activity logged in setUp
+        self.assertEqual((content["count"], content["pages"]), (13, 3))
+        self.assertEqual(len(content["data"]), 3)
+
+        seen = []
+        response = self.client.get(f"{url}?limit=5&cursor=",
+                                   headers=self.success_ops)
+        while True:
+            content = json.loads(response.data)
+            seen.extend(item["id"] for item in content["data"])
+            if not content["nextCursor"]:
+                break
+            response = self.client.get(content["nextUrl"],
+                                       headers=self.success_ops)
+        self.assertEqual(len(set(seen)), 13)
+
+        response = self.client.get(
+            f"api/v1/societies/{self.istelle.uuid}/logged-activities",
+            headers=self.success_ops)
+        self.assertEqual(json.loads(response.data)["data"], [])
+        response = self.client.get(
+            "api/v1/societies/-Kmissing/logged-activities",
+            headers=self.success_ops)
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_society_logged_activities_conditionally(self):
+        """Test that a page follows changes to the other pages."""
+        self.log_activities(6)
+        url = (f"api/v1/societies/{self.phoenix.uuid}/logged-activities"
+               "?limit=5")
+        etag = self.client.get(url, headers=self.success_ops).headers["ETag"]
+
+        response = self.client.get(url, headers=dict(
+            self.success_ops, **{"If-None-Match": etag}))
+        self.assertEqual(response.status_code, 304)
+
+        # the activity logged in setUp is on the last page
+        self.log_alibaba_challenge.delete()
+        response = self.client.get(url, headers=dict(
+            self.success_ops, **{"If-None-Match": etag}))
+        self.assertEqual(response.status_code, 200)
+
     def test_get_society_by_name(self):
         """Test a society can be retrieved by name."""
         response = self.client.get(f"api/v1/societies?q={self.istelle.name}",
@@ -113,6 +248,33 @@ class SocietyBaseTestCase(BaseTestCase):
         self.assertIn(message, response_details["message"])
         self.assertEqual(response.status_code, 200)
 
+    def test_get_societies_with_sparse_fieldset(self):
+        """Test that only the requested society fields are fetched."""
+        with self.count_queries() as statements:
+            response = self.client.get("api/v1/societies?fields=uuid,name",
+                                       headers=self.header)
+        self.assertEqual(response.status_code, 200)
+
+        societies = json.loads(response.data)["data"]
+        self.assertTrue(societies)
+        for society in societies:
+            self.assertEqual(set(society), {"uuid", "name"})
+        selects = [statement for statement in statements
+                   if "FROM societies" in statement and
+                   "count(" not in statement.lower()]
+        self.assertTrue(selects)
+        self.assertFalse(any("societies.logo" in statement
+                             for statement in selects))
+
+    def test_get_societies_with_unknown_field(self):
+        """Test that asking for a field societies lack fails."""
+        response = self.client.get("api/v1/societies?fields=uuid,secret",
+                                   headers=self.header)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data)["message"],
+                         "Unknown fields: secret.")
+
     def test_edit_society_details(self):
         """Test editing society details is successful."""
         society_details = dict(name="Stacked Deck",